@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import logging
 import shutil
 from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .daily_stats import DailyStatsTracker
 from .gating import CompositeGateEvaluator, AlwaysOpenGateEvaluator, FileBackedGateEvaluator
@@ -23,7 +24,11 @@ from .git_worktree import (
     persist_worktree_outputs,
 )
 from .polling import (
+    PollCache,
     PollConfigError,
+    PollSource,
+    PollSourceConfig,
+    TriggerEvent,
     TriggerExecutor,
     get_poll_source,
     load_poll_config,
@@ -460,6 +465,13 @@ def stats_from_args(args: argparse.Namespace) -> None:
             _LOG.error("Failed to send email: %s", e)
 
 
+async def _poll_sources(
+    sources: List[Tuple[PollSource, PollSourceConfig]],
+) -> List[List[TriggerEvent]]:
+    """Poll every source concurrently, returning events in source order."""
+    return list(await asyncio.gather(*(source.poll_async(config) for source, config in sources)))
+
+
 def poll_from_args(args: argparse.Namespace) -> None:
     """Handle the poll subcommand."""
     config_path = Path(args.config).expanduser().resolve()
@@ -472,34 +484,44 @@ def poll_from_args(args: argparse.Namespace) -> None:
 
     triggered_count = 0
     failed_count = 0
+    executor = TriggerExecutor(workdir=workdir)
+    # A dry run leaves nothing behind in the working directory.
+    cache = None if args.dry_run else PollCache(workdir / ".agents" / "poll_cache.db")
 
+    sources: List[Tuple[PollSource, PollSourceConfig]] = []
     for source_config in config.sources:
+        # Only the GitHub source keeps responses in the poll cache.
+        options = {"cache": cache} if source_config.type == "github_issues" else {}
         try:
-            source = get_poll_source(source_config.type)
+            source = get_poll_source(source_config.type, **options)
         except ValueError as exc:
             _LOG.error("Failed to get poll source: %s", exc)
             continue
 
         _LOG.info("Polling %s source...", source_config.type)
-        events = source.poll(source_config)
+        sources.append((source, source_config))
+
+    # Poll all sources at once: the wait is the slowest source, not the sum.
+    results = asyncio.run(_poll_sources(sources))
 
+    for (source, source_config), events in zip(sources, results):
         if not events:
             _LOG.info("No matching items found for %s", source_config.type)
             continue
 
         _LOG.info("Found %d matching items", len(events))
 
-        for event in events:
-            if args.dry_run:
+        if args.dry_run:
+            for event in events:
                 _LOG.info("[DRY RUN] Would trigger for %s #%s: %s",
                          event.source_type, event.item_id, event.item_url)
-                continue
+            continue
 
-            # Mark as processing BEFORE executing (prevents re-trigger on next poll)
-            source.mark_processed(event, source_config)
+        # Mark as processing BEFORE executing (prevents re-trigger on next poll)
+        source.mark_processed_batch(events, source_config)
 
+        for event in events:
             # Execute the trigger script
-            executor = TriggerExecutor(workdir=workdir)
             exit_code = executor.execute(event, source_config.on_match)
 
             if exit_code == 0:
@@ -0,0 +1,10 @@
+"""Helpers for features that depend on the running Python version."""
+
+from __future__ import annotations
+
+import sys
+from typing import Dict
+
+# ``@dataclass(slots=True)`` is only accepted on Python 3.10+; spread this into
+# dataclass() so hot-path records get __slots__ where the interpreter allows it.
+DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
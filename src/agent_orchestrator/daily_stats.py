@@ -303,6 +303,13 @@ class DailyStatsTracker:
         """Get full stats for a given date."""
         return self._load_stats(for_date)
 
+    def get_stats_mtime_ns(self, for_date: Optional[date] = None) -> Optional[int]:
+        """Get when a date's stats file last changed, or None if it does not exist."""
+        try:
+            return self._get_stats_file(for_date).stat().st_mtime_ns
+        except OSError:
+            return None
+
     def check_daily_limit(self, limit_usd: float) -> tuple[bool, float, float]:
         """
         Check if daily spending is within limit.
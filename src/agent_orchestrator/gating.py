@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Sequence, Tuple
 
 from .models import Step
 
@@ -13,11 +13,23 @@ class GateEvaluator:
     def evaluate(self, step: Step, gate: str) -> bool:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def evaluate_many(self, items: Sequence[Tuple[Step, str]]) -> List[bool]:
+        """Evaluate several ``(step, gate)`` pairs, preserving order.
+
+        Gates are checked one after another. Subclasses with cheaper batch
+        strategies, or I/O-bound checks that are safe to run concurrently on
+        a pool they own, should override this.
+        """
+        return [self.evaluate(step, gate) for step, gate in items]
+
 
 class AlwaysOpenGateEvaluator(GateEvaluator):
     def evaluate(self, step: Step, gate: str) -> bool:
         return True
 
+    def evaluate_many(self, items: Sequence[Tuple[Step, str]]) -> List[bool]:
+        return [True] * len(items)
+
 
 class FileBackedGateEvaluator(GateEvaluator):
     """Read gate states from a JSON file updated by external systems."""
@@ -29,6 +41,10 @@ class FileBackedGateEvaluator(GateEvaluator):
         states = self._load_states()
         return states.get(gate, False)
 
+    def evaluate_many(self, items: Sequence[Tuple[Step, str]]) -> List[bool]:
+        states = self._load_states()
+        return [states.get(gate, False) for _, gate in items]
+
     def _load_states(self) -> Dict[str, bool]:
         if not self._path.exists():
             return {}
@@ -52,3 +68,15 @@ class CompositeGateEvaluator(GateEvaluator):
                 return False
         return True
 
+    def evaluate_many(self, items: Sequence[Tuple[Step, str]]) -> List[bool]:
+        results = [True] * len(items)
+        for evaluator in self._evaluators:
+            # Only gates that every previous evaluator left open are re-checked.
+            pending = [index for index, is_open in enumerate(results) if is_open]
+            if not pending:
+                break
+            outcomes = evaluator.evaluate_many([items[index] for index in pending])
+            for index, is_open in zip(pending, outcomes):
+                results[index] = is_open
+        return results
+
@@ -0,0 +1,48 @@
+"""JSON parsing and serialization helpers that use orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only
+# need to catch this one type whichever parser is active.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document from ``bytes`` or ``str``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_path(path: Path) -> Any:
+    """Read and parse the JSON file at ``path``."""
+    return loads(path.read_bytes())
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize ``obj`` as compact UTF-8 JSON.
+
+    Raises TypeError for values that cannot be serialized.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_indented(obj: Any) -> bytes:
+    """Serialize ``obj`` as UTF-8 JSON indented by two spaces.
+
+    Raises TypeError for values that cannot be serialized.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
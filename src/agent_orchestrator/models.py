@@ -5,7 +5,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from .time_utils import ISO_FORMAT, utc_now
+from .compat import DATACLASS_SLOTS
+from .time_utils import ISO_FORMAT, utc_now, utc_now_fast
 
 
 class StepStatus(str, Enum):
@@ -63,7 +64,7 @@ class Workflow:
         return [step_id for step_id, step in self.steps.items() if not step.needs]
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MemoryUpdate:
     """A single memory update to be written to an AGENTS.md file."""
 
@@ -72,7 +73,7 @@ class MemoryUpdate:
     entry: str  # the content to add
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RunReport:
     schema: str
     run_id: str
@@ -90,7 +91,7 @@ class RunReport:
     raw: Dict[str, object] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class StepRuntime:
     status: StepStatus = StepStatus.PENDING
     attempts: int = 0
@@ -111,6 +112,26 @@ class StepRuntime:
     loop_items: Optional[List[Any]] = None  # Items being iterated over
     loop_completed: bool = False  # Whether loop has finished all iterations
 
+    def reset(self) -> None:
+        """Return this runtime to its initial PENDING state in place."""
+        self.status = StepStatus.PENDING
+        self.attempts = 0
+        self.iteration_count = 0
+        self.report_path = None
+        self.started_at = None
+        self.ended_at = None
+        self.last_error = None
+        self.artifacts = []
+        self.metrics = {}
+        self.logs = []
+        self.manual_input_path = None
+        self.blocked_by_loop = None
+        self.notified_failure = False
+        self.notified_human_input = False
+        self.loop_index = 0
+        self.loop_items = None
+        self.loop_completed = False
+
     def to_dict(self) -> Dict[str, object]:
         return {
             "status": self.status.value,
@@ -133,7 +154,7 @@ class StepRuntime:
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RunState:
     run_id: str
     workflow_name: str
@@ -143,7 +164,18 @@ class RunState:
     created_at: str = field(default_factory=utc_now)
     steps: Dict[str, StepRuntime] = field(default_factory=dict)
 
-    def to_dict(self) -> Dict[str, object]:
+    def to_dict(
+        self, serialized_steps: Optional[Dict[str, Dict[str, object]]] = None
+    ) -> Dict[str, object]:
+        """Serialise the run state.
+
+        ``serialized_steps`` lets callers that already hold up-to-date
+        ``StepRuntime.to_dict()`` output skip re-serialising every step.
+        """
+        if serialized_steps is None:
+            serialized_steps = {
+                step_id: runtime.to_dict() for step_id, runtime in self.steps.items()
+            }
         return {
             "run_id": self.run_id,
             "workflow_name": self.workflow_name,
@@ -151,6 +183,6 @@ class RunState:
             "reports_dir": str(self.reports_dir),
             "manual_inputs_dir": str(self.manual_inputs_dir),
             "created_at": self.created_at,
-            "updated_at": utc_now(),
-            "steps": {step_id: runtime.to_dict() for step_id, runtime in self.steps.items()},
+            "updated_at": utc_now_fast(),
+            "steps": serialized_steps,
         }
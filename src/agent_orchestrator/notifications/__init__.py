@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional, Sequence
 
 from ..models import StepStatus
 
@@ -28,7 +28,7 @@ class StepNotification:
     trigger: str
     manual_input_path: Optional[Path]
     report_path: Optional[Path]
-    logs: List[str]
+    logs: Sequence[str]  # Shared with the step runtime; treat as read-only
     last_error: Optional[str]
 
 
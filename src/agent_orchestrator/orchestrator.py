@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import sys
 import time
 import uuid
+from collections import Counter, deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from .daily_stats import DailyStatsTracker
 from .gating import AlwaysOpenGateEvaluator, CompositeGateEvaluator, GateEvaluator
@@ -21,6 +23,10 @@ from .notifications import (
 from .reporting import RunReportError, RunReportReader
 from .runner import ExecutionTemplate, StepLaunch, StepRunner
 from .state import RunStatePersister
+from .time_utils import utc_now_fast
+
+# Statuses that satisfy a dependency.
+_DONE_STATUSES = frozenset({StepStatus.COMPLETED, StepStatus.SKIPPED})
 
 
 class Orchestrator:
@@ -45,6 +51,14 @@ class Orchestrator:
         cost_limit_action: str = "warn",  # "warn", "pause", "fail"
     ) -> None:
         self._workflow = workflow
+        # The workflow's steps never change during a run; iterate a fixed
+        # tuple in the hot loops instead of walking the dict each time.
+        self._step_items = tuple(workflow.steps.items())
+        # Reverse dependency edges: step id -> steps that list it in `needs`.
+        self._children: Dict[str, List[str]] = {step_id: [] for step_id in workflow.steps}
+        for step_id, step in self._step_items:
+            for dep in step.needs:
+                self._children.setdefault(dep, []).append(step_id)
         self._workflow_root = workflow_root
         self._repo_dir = repo_dir
         self._report_reader = report_reader
@@ -113,9 +127,49 @@ class Orchestrator:
                 steps={step_id: StepRuntime() for step_id in workflow.steps},
             )
 
+        # StepRuntime objects are reset in place and never replaced, so the
+        # per-tick scans can bind them (and each step's dependency runtimes)
+        # once instead of looking them up by id on every pass.
+        self._step_entries = tuple(
+            (step_id, step, self._state.steps[step_id]) for step_id, step in self._step_items
+        )
+        self._dependency_runtimes: Dict[str, Tuple[StepRuntime, ...]] = {
+            step_id: tuple(self._state.steps[dep] for dep in step.needs)
+            for step_id, step in self._step_items
+        }
+
         self._active_processes: Dict[str, StepLaunch] = {}
         self._memory_manager = MemoryManager(repo_dir=repo_dir, logger=self._log)
         self._run_status: Optional[str] = None  # Set after run() completes
+        # Resolved prompt paths keyed by the prompt string in the workflow.
+        self._prompt_cache: Dict[str, Path] = {}
+        # Per-step loop environments, paired with the item list they encode.
+        self._loop_envs: Dict[str, Tuple[List[Any], List[Dict[str, str]]]] = {}
+
+        # Serialized step entries are cached between persists; only steps
+        # recorded in _dirty_steps are re-serialized on the next save.
+        self._serialized_steps: Dict[str, Dict[str, object]] = {
+            step_id: runtime.to_dict() for step_id, runtime in self._state.steps.items()
+        }
+        self._dirty_steps: Set[str] = set()
+
+        # Status tallies maintained by _set_status so the run loop's
+        # completion and failure checks do not rescan every step.
+        self._status_counts: Counter = Counter(
+            runtime.status for runtime in self._state.steps.values()
+        )
+        self._terminal_failures: Set[str] = {
+            step_id
+            for step_id, runtime in self._state.steps.items()
+            if runtime.status == StepStatus.FAILED and runtime.attempts >= self._max_attempts
+        }
+
+        # Steps paused for human input, keyed to the file that releases them.
+        self._waiting_on_human: Dict[str, Path] = {
+            step_id: runtime.manual_input_path
+            for step_id, runtime in self._state.steps.items()
+            if runtime.status == StepStatus.WAITING_ON_HUMAN and runtime.manual_input_path
+        }
 
     @property
     def run_id(self) -> str:
@@ -167,7 +221,9 @@ class Orchestrator:
                 progress |= self._collect_reports()
                 progress |= self._check_manual_steps()
 
-                self._persist_state()
+                # Idle ticks leave the state untouched; don't rewrite it.
+                if progress or self._dirty_steps:
+                    self._persist_state()
 
                 if self._all_steps_finished():
                     self._log.info("workflow complete run_id=%s", self._state.run_id)
@@ -194,26 +250,26 @@ class Orchestrator:
 
     def _launch_ready_steps(self) -> bool:
         launched = False
-        for step_id, step in self._workflow.steps.items():
-            runtime = self._state.steps[step_id]
+        candidates = []
+        for step_id, step, runtime in self._step_entries:
             if runtime.status != StepStatus.PENDING:
                 continue
             if step_id in self._active_processes:
                 continue
             if not self._dependencies_satisfied(step):
                 continue
-            if not self._gates_open(step):
-                continue
+            candidates.append((step_id, step, runtime))
 
+        for step_id, step, runtime in self._filter_open_gates(candidates):
             # Initialize loop items if this step has a loop
             if step.loop and not self._initialize_loop_items(step, runtime):
                 continue  # Loop items not ready yet
 
             # Check if loop is exhausted
             if step.loop and not self._should_continue_loop(step, runtime):
-                runtime.status = StepStatus.COMPLETED
+                self._set_status(step_id, runtime, StepStatus.COMPLETED)
                 runtime.loop_completed = True
-                runtime.ended_at = utc_now()
+                runtime.ended_at = utc_now_fast()
                 self._log.info(
                     "Loop completed for step=%s after %d iterations",
                     step_id,
@@ -228,7 +284,7 @@ class Orchestrator:
                 else None
             )
 
-            prompt_path = self._resolve_prompt_path(step.prompt)
+            prompt_path = self._cached_prompt_path(step.prompt)
 
             # Collect artifacts from dependency steps
             dep_artifacts_env = self._collect_dependency_artifacts(step)
@@ -239,9 +295,9 @@ class Orchestrator:
 
             runtime.notified_failure = False
             runtime.notified_human_input = False
-            runtime.status = StepStatus.RUNNING
+            self._set_status(step_id, runtime, StepStatus.RUNNING)
             runtime.attempts += 1
-            runtime.started_at = utc_now()
+            runtime.started_at = utc_now_fast()
             runtime.report_path = report_path
             runtime.manual_input_path = manual_input_path
 
@@ -258,9 +314,10 @@ class Orchestrator:
                     extra_env=dep_artifacts_env,
                 )
             except Exception as exc:  # pragma: no cover
-                runtime.status = StepStatus.FAILED
+                self._prompt_cache.pop(step.prompt, None)
+                self._set_status(step_id, runtime, StepStatus.FAILED)
                 runtime.last_error = str(exc)
-                runtime.ended_at = utc_now()
+                runtime.ended_at = utc_now_fast()
                 self._log.exception("failed to launch step=%s", step_id)
                 continue
 
@@ -277,24 +334,41 @@ class Orchestrator:
         to_remove = []
         for step_id, launch in list(self._active_processes.items()):
             runtime = self._state.steps[step_id]
-            process_finished = launch.process.poll() is not None
-
-            if launch.report_path.exists():
+            # Only ask the process whether it exited when the report alone
+            # cannot settle the step; a valid report needs no wait syscall.
+            process_finished = False
+            report_stat = _stat_or_none(launch.report_path)
+            if report_stat is None:
+                process_finished = launch.process.poll() is not None
+                if process_finished:
+                    # The agent may have written its report just before exiting.
+                    report_stat = _stat_or_none(launch.report_path)
+
+            if report_stat is not None:
+                # An empty file means the agent has not started writing yet.
+                if report_stat.st_size == 0 and launch.process.poll() is None:
+                    continue
                 try:
-                    report = self._report_reader.read(launch.report_path)
+                    report = self._report_reader.read(
+                        launch.report_path, prefetched_stat=report_stat
+                    )
                 except RunReportError as exc:
                     # If process is still running, the report may be incomplete - wait
-                    if not process_finished:
+                    if launch.process.poll() is None:
+                        continue
+                    try:
+                        # The agent exited after our read, so its report is final now.
+                        report = self._report_reader.read(launch.report_path)
+                    except RunReportError as exc:
+                        # Process finished but report is invalid - fail the step
+                        runtime.last_error = str(exc)
+                        self._set_status(step_id, runtime, StepStatus.FAILED)
+                        runtime.ended_at = utc_now_fast()
+                        self._log.error("invalid run report step=%s error=%s", step_id, exc)
+                        self._notify_failure(step_id, runtime)
+                        to_remove.append(step_id)
+                        progressed = True
                         continue
-                    # Process finished but report is invalid - fail the step
-                    runtime.last_error = str(exc)
-                    runtime.status = StepStatus.FAILED
-                    runtime.ended_at = utc_now()
-                    self._log.error("invalid run report step=%s error=%s", step_id, exc)
-                    self._notify_failure(step_id, runtime)
-                    to_remove.append(step_id)
-                    progressed = True
-                    continue
 
                 runtime.ended_at = report.ended_at
                 runtime.artifacts = report.artifacts
@@ -322,7 +396,7 @@ class Orchestrator:
                             step_id,
                             runtime.iteration_count,
                         )
-                        runtime.status = StepStatus.FAILED
+                        self._set_status(step_id, runtime, StepStatus.FAILED)
                         runtime.last_error = f"Gate failure after {runtime.iteration_count} iterations - max iterations reached"
                         self._notify_failure(step_id, runtime)
                         to_remove.append(step_id)
@@ -338,7 +412,7 @@ class Orchestrator:
                     if step.loop and self._should_continue_loop(step, runtime):
                         # Advance to next loop iteration
                         runtime.loop_index += 1
-                        runtime.status = StepStatus.PENDING
+                        self._set_status(step_id, runtime, StepStatus.PENDING)
                         runtime.attempts = 0  # Reset attempts for the new iteration
                         runtime.report_path = None
                         runtime.started_at = None
@@ -351,12 +425,13 @@ class Orchestrator:
                             len(runtime.loop_items),
                         )
                     elif runtime.manual_input_path and self._pause_for_human:
-                        runtime.status = StepStatus.WAITING_ON_HUMAN
+                        self._set_status(step_id, runtime, StepStatus.WAITING_ON_HUMAN)
                         runtime.notified_human_input = False
+                        self._waiting_on_human[step_id] = runtime.manual_input_path
                         self._log.info("awaiting human input step=%s", step_id)
                         self._notify_human_input(step_id, runtime)
                     else:
-                        runtime.status = StepStatus.COMPLETED
+                        self._set_status(step_id, runtime, StepStatus.COMPLETED)
                         runtime.notified_human_input = False
                         if step.loop:
                             runtime.loop_completed = True
@@ -368,7 +443,7 @@ class Orchestrator:
                         else:
                             self._log.info("step completed step=%s", step_id)
                 else:
-                    runtime.status = StepStatus.FAILED
+                    self._set_status(step_id, runtime, StepStatus.FAILED)
                     runtime.last_error = ", ".join(report.logs[-3:]) if report.logs else "Agent reported failure"
                     self._log.warning("step failed step=%s logs=%s", step_id, runtime.last_error)
                     self._notify_failure(step_id, runtime)
@@ -376,8 +451,8 @@ class Orchestrator:
                 to_remove.append(step_id)
                 progressed = True
             elif process_finished:
-                runtime.status = StepStatus.FAILED
-                runtime.ended_at = utc_now()
+                self._set_status(step_id, runtime, StepStatus.FAILED)
+                runtime.ended_at = utc_now_fast()
                 runtime.last_error = (
                     f"Agent process exited with code {launch.process.returncode} without writing a run report"
                 )
@@ -387,11 +462,14 @@ class Orchestrator:
                 progressed = True
 
         for step_id in to_remove:
+            self._mark_dirty(step_id)
             launch = self._active_processes.pop(step_id)
             launch.close_log()
             runtime = self._state.steps[step_id]
             if runtime.status == StepStatus.FAILED and runtime.attempts < self._max_attempts:
-                runtime.status = StepStatus.PENDING
+                # Re-resolve the prompt on retry in case the file moved.
+                self._prompt_cache.pop(self._workflow.steps[step_id].prompt, None)
+                self._set_status(step_id, runtime, StepStatus.PENDING)
                 runtime.last_error = runtime.last_error or "retry scheduled"
                 runtime.report_path = None
                 runtime.started_at = None
@@ -403,18 +481,20 @@ class Orchestrator:
         return progressed
 
     def _check_manual_steps(self) -> bool:
-        if not self._pause_for_human:
+        if not self._pause_for_human or not self._waiting_on_human:
             return False
 
         progressed = False
-        for step_id, runtime in self._state.steps.items():
+        for step_id, manual_input_path in list(self._waiting_on_human.items()):
+            runtime = self._state.steps[step_id]
             if runtime.status != StepStatus.WAITING_ON_HUMAN:
+                # Reset by a loop-back while paused; nothing left to wait for.
+                del self._waiting_on_human[step_id]
                 continue
-            if not runtime.manual_input_path:
-                continue
-            if runtime.manual_input_path.exists():
-                runtime.status = StepStatus.COMPLETED
-                runtime.ended_at = runtime.ended_at or utc_now()
+            if manual_input_path.exists():
+                del self._waiting_on_human[step_id]
+                self._set_status(step_id, runtime, StepStatus.COMPLETED)
+                runtime.ended_at = runtime.ended_at or utc_now_fast()
                 runtime.notified_human_input = False
                 progressed = True
                 self._log.info("manual input received step=%s", step_id)
@@ -422,28 +502,42 @@ class Orchestrator:
 
     def _dependencies_satisfied(self, step: Step) -> bool:
         if not all(
-            self._state.steps[dep].status in {StepStatus.COMPLETED, StepStatus.SKIPPED}
-            for dep in step.needs
+            dep_runtime.status in _DONE_STATUSES
+            for dep_runtime in self._dependency_runtimes[step.id]
         ):
             return False
 
         runtime = self._state.steps[step.id]
         if runtime.blocked_by_loop:
             target_runtime = self._state.steps.get(runtime.blocked_by_loop)
-            if not target_runtime or target_runtime.status not in {
-                StepStatus.COMPLETED,
-                StepStatus.SKIPPED,
-            }:
+            if not target_runtime or target_runtime.status not in _DONE_STATUSES:
                 return False
             runtime.blocked_by_loop = None
+            self._mark_dirty(step.id)
         return True
 
-    def _gates_open(self, step: Step) -> bool:
-        for gate in step.gates:
-            if not self._gate_evaluator.evaluate(step, gate):
-                self._log.info("gate blocked step=%s gate=%s", step.id, gate)
-                return False
-        return True
+    def _filter_open_gates(
+        self, candidates: List[Tuple[str, Step, StepRuntime]]
+    ) -> List[Tuple[str, Step, StepRuntime]]:
+        """Return the candidates whose gates are all open.
+
+        Gates for every ready step are evaluated as one batch so evaluators
+        backed by external checks can service them concurrently.
+        """
+        items = [(step, gate) for _, step, _ in candidates for gate in step.gates]
+        if not items:
+            return candidates
+        results = iter(self._gate_evaluator.evaluate_many(items))
+
+        ready = []
+        for candidate in candidates:
+            step = candidate[1]
+            blocked = [gate for gate in step.gates if not next(results)]
+            if blocked:
+                self._log.info("gate blocked step=%s gate=%s", step.id, blocked[0])
+                continue
+            ready.append(candidate)
+        return ready
 
     def _collect_dependency_artifacts(self, step: Step) -> Dict[str, str]:
         """Collect artifacts from dependency steps and return as environment variables."""
@@ -490,6 +584,13 @@ class Orchestrator:
 
         return env
 
+    def _cached_prompt_path(self, prompt: str) -> Path:
+        """Return the resolved prompt path, resolving it on first use only."""
+        path = self._prompt_cache.get(prompt)
+        if path is None:
+            path = self._prompt_cache[prompt] = self._resolve_prompt_path(prompt)
+        return path
+
     def _resolve_prompt_path(self, prompt: str) -> Path:
         candidate = Path(prompt)
         if candidate.is_absolute() and candidate.exists():
@@ -555,20 +656,25 @@ class Orchestrator:
             raise ValueError(f"Step '{start_step}' not found in workflow")
 
         # Find all steps that need to be reset (start_step + all downstream dependencies)
-        to_reset = {start_step}
-        changed = True
-        while changed:
-            changed = False
-            for step_id, step in workflow.steps.items():
-                if step_id not in to_reset and any(dep in to_reset for dep in step.needs):
-                    to_reset.add(step_id)
-                    changed = True
+        to_reset = self._downstream_closure(start_step)
 
         # Reset all identified steps to PENDING
         for step_id in to_reset:
-            self._state.steps[step_id] = StepRuntime()
+            self._state.steps[step_id].reset()
             self._log.info("Reset step=%s to PENDING", step_id)
 
+    def _downstream_closure(self, start_step: str) -> Set[str]:
+        """Return ``start_step`` plus every step that transitively needs it."""
+        closure: Set[str] = set()
+        queue = deque([start_step])
+        while queue:
+            step_id = queue.popleft()
+            if step_id in closure:
+                continue
+            closure.add(step_id)
+            queue.extend(self._children.get(step_id, ()))
+        return closure
+
     def _handle_loop_back(self, from_step: str, to_step: str) -> None:
         """Handle loop-back from one step to another by resetting target and downstream steps."""
         if to_step not in self._workflow.steps:
@@ -581,8 +687,7 @@ class Orchestrator:
         from_runtime.attempts = 0  # Reset attempts for the new loop iteration
 
         # Requeue the source step so it runs again after upstream steps rerun.
-        from_runtime.status = StepStatus.PENDING
-        from_runtime.attempts = 0  # Reset attempts for the next iteration run
+        self._set_status(from_step, from_runtime, StepStatus.PENDING)
         from_runtime.report_path = None
         from_runtime.started_at = None
         from_runtime.ended_at = None
@@ -603,28 +708,17 @@ class Orchestrator:
 
         # Find all steps between to_step and from_step (inclusive of to_step)
         # These are steps that need to be reset
-        to_reset = {to_step}
-        changed = True
-        while changed:
-            changed = False
-            for step_id, step in self._workflow.steps.items():
-                # Add steps that depend on steps we're resetting
-                if step_id not in to_reset and any(dep in to_reset for dep in step.needs):
-                    to_reset.add(step_id)
-                    changed = True
-                    # Stop if we reach the step that triggered the loop-back
-                    if step_id == from_step:
-                        break
+        to_reset = self._downstream_closure(to_step)
 
         # Reset all identified steps to PENDING (except from_step)
         for step_id in to_reset:
             if step_id != from_step:
                 # Preserve iteration count from original runtime if it was part of the loop
                 old_iteration = self._state.steps[step_id].iteration_count
-                self._state.steps[step_id] = StepRuntime()
+                runtime = self._reset_runtime(step_id)
                 # If this is the target step, increment its iteration count
                 if step_id == to_step:
-                    self._state.steps[step_id].iteration_count = old_iteration
+                    runtime.iteration_count = old_iteration
                 self._log.info("Reset step=%s to PENDING for loop-back", step_id)
 
     def _initialize_loop_items(self, step: Step, runtime: StepRuntime) -> bool:
@@ -760,13 +854,19 @@ class Orchestrator:
         if runtime.loop_index >= len(runtime.loop_items):
             return {}
 
-        current_item = runtime.loop_items[runtime.loop_index]
-        env = {
-            f"LOOP_{step.loop.index_var.upper()}": str(runtime.loop_index),
-            f"LOOP_{step.loop.item_var.upper()}": json.dumps(current_item),
-        }
+        cached = self._loop_envs.get(step.id)
+        if cached is None or cached[0] is not runtime.loop_items:
+            # Encode every item once when the loop starts (or its items are
+            # replaced) rather than on every iteration and retry.
+            index_key = f"LOOP_{step.loop.index_var.upper()}"
+            item_key = f"LOOP_{step.loop.item_var.upper()}"
+            envs = [
+                {index_key: str(index), item_key: json.dumps(item)}
+                for index, item in enumerate(runtime.loop_items)
+            ]
+            cached = self._loop_envs[step.id] = (runtime.loop_items, envs)
 
-        return env
+        return cached[1][runtime.loop_index]
 
     def _apply_memory_updates(
         self, step_id: str, memory_updates: list
@@ -794,25 +894,45 @@ class Orchestrator:
                 step_id,
             )
 
+    def _set_status(self, step_id: str, runtime: StepRuntime, status: StepStatus) -> None:
+        """Transition a step, keeping the status tallies and dirty set current."""
+        self._status_counts[runtime.status] -= 1
+        self._status_counts[status] += 1
+        runtime.status = status
+        if status == StepStatus.FAILED and runtime.attempts >= self._max_attempts:
+            self._terminal_failures.add(step_id)
+        else:
+            self._terminal_failures.discard(step_id)
+        self._mark_dirty(step_id)
+
+    def _reset_runtime(self, step_id: str) -> StepRuntime:
+        """Reset a step's runtime in place to a fresh PENDING state."""
+        runtime = self._state.steps[step_id]
+        self._set_status(step_id, runtime, StepStatus.PENDING)
+        runtime.reset()
+        return runtime
+
+    def _mark_dirty(self, step_id: str) -> None:
+        """Record that a step's runtime changed since the last persist."""
+        self._dirty_steps.add(step_id)
+
     def _persist_state(self) -> None:
-        self._state_persister.save(self._state)
+        for step_id in self._dirty_steps:
+            self._serialized_steps[step_id] = self._state.steps[step_id].to_dict()
+        self._state_persister.save(self._state, self._serialized_steps)
+        self._dirty_steps.clear()
 
     def _all_steps_finished(self) -> bool:
-        return all(
-            runtime.status in {StepStatus.COMPLETED, StepStatus.SKIPPED}
-            for runtime in self._state.steps.values()
-        )
+        finished = self._status_counts[StepStatus.COMPLETED] + self._status_counts[StepStatus.SKIPPED]
+        return finished == len(self._state.steps)
 
     def _has_terminal_failure(self) -> bool:
-        return any(
-            runtime.status == StepStatus.FAILED and runtime.attempts >= self._max_attempts
-            for runtime in self._state.steps.values()
-        )
+        return bool(self._terminal_failures)
 
     def _cleanup_processes(self) -> None:
         for launch in self._active_processes.values():
             if launch.process.poll() is None:
-                launch.process.terminate()
+                launch.terminate()
             launch.close_log()
         self._active_processes.clear()
 
@@ -852,7 +972,8 @@ class Orchestrator:
             trigger=trigger,
             manual_input_path=runtime.manual_input_path,
             report_path=runtime.report_path,
-            logs=list(runtime.logs),
+            # Runtime log lists are replaced, never mutated, so share it.
+            logs=runtime.logs,
             last_error=runtime.last_error,
         )
 
@@ -898,7 +1019,7 @@ class Orchestrator:
                 # Mark all pending steps as failed
                 for step_id, runtime in self._state.steps.items():
                     if runtime.status == StepStatus.PENDING:
-                        runtime.status = StepStatus.FAILED
+                        self._set_status(step_id, runtime, StepStatus.FAILED)
                         runtime.last_error = f"Daily cost limit exceeded: ${current_cost:.2f}"
                 return True
 
@@ -942,6 +1063,14 @@ class Orchestrator:
             self._log.exception("failed to log daily summary")
 
 
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    """Return ``os.stat(path)``, or ``None`` when the file does not exist."""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
 def build_default_runner(
     repo_dir: Path,
     wrapper: Path,
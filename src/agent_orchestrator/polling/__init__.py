@@ -1,5 +1,6 @@
 """Polling service for watching external sources and triggering workflows."""
 
+from .cache import PollCache
 from .executor import TriggerExecutor
 from .models import (
     FilterConfig,
@@ -19,11 +20,12 @@ POLL_SOURCES = {
 }
 
 
-def get_poll_source(source_type: str) -> PollSource:
+def get_poll_source(source_type: str, **options) -> PollSource:
     """Get a poll source instance by type.
 
     Args:
         source_type: The type of poll source (e.g., "github_issues").
+        **options: Keyword arguments passed to the source constructor.
 
     Returns:
         An instance of the appropriate PollSource subclass.
@@ -34,13 +36,14 @@ def get_poll_source(source_type: str) -> PollSource:
     if source_type not in POLL_SOURCES:
         available = ", ".join(POLL_SOURCES.keys())
         raise ValueError(f"Unknown poll source: {source_type}. Available: {available}")
-    return POLL_SOURCES[source_type]()
+    return POLL_SOURCES[source_type](**options)
 
 
 __all__ = [
     "FilterConfig",
     "GitHubIssuePollSource",
     "OnMatchConfig",
+    "PollCache",
     "PollConfig",
     "PollConfigError",
     "PollSource",
@@ -0,0 +1,119 @@
+"""
+Persistent cache of poll responses.
+
+Stores the ETag and body of the last response per poll filter in a small
+SQLite database at .agents/poll_cache.db, so a restarted poller can
+revalidate with If-None-Match instead of refetching the full list.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from ..compat import DATACLASS_SLOTS
+from ..time_utils import ISO_FORMAT
+
+_LOG = logging.getLogger(__name__)
+
+
+@dataclass(**DATACLASS_SLOTS)
+class PollCacheEntry:
+    """A cached poll response."""
+
+    etag: Optional[str]
+    body: bytes
+    stored_at: float  # Unix timestamp
+
+
+def _format_timestamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(ISO_FORMAT)
+
+
+def _parse_timestamp(value: str) -> float:
+    return datetime.strptime(value, ISO_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+
+
+class PollCache:
+    """
+    SQLite-backed store of poll responses keyed by cache key.
+
+    The database runs in WAL mode so concurrent pollers can read while
+    another one writes. If the database cannot be opened the cache is
+    disabled: lookups miss and writes are dropped.
+    """
+
+    def __init__(self, db_path: Path, logger: Optional[logging.Logger] = None):
+        self._db_path = db_path
+        self._log = logger or _LOG
+        self._enabled = self._ensure_db()
+
+    def _ensure_db(self) -> bool:
+        """Create the database and table if they don't exist; False on failure."""
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with sqlite3.connect(self._db_path) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS poll_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        etag TEXT,
+                        body BLOB NOT NULL,
+                        stored_at TEXT NOT NULL
+                    )
+                """)
+        except (OSError, sqlite3.Error) as e:
+            self._log.warning("Poll cache disabled, cannot open %s: %s", self._db_path, e)
+            return False
+        return True
+
+    def get(self, cache_key: str) -> Optional[PollCacheEntry]:
+        """Return the cached response for ``cache_key``, if any."""
+        if not self._enabled:
+            return None
+        try:
+            with sqlite3.connect(self._db_path) as conn:
+                row = conn.execute(
+                    "SELECT etag, body, stored_at FROM poll_cache WHERE cache_key = ?",
+                    (cache_key,),
+                ).fetchone()
+            if row is None:
+                return None
+            return PollCacheEntry(etag=row[0], body=bytes(row[1]), stored_at=_parse_timestamp(row[2]))
+        except (sqlite3.Error, ValueError) as e:
+            self._log.warning("Failed to read poll cache entry %s: %s", cache_key, e)
+            return None
+
+    def put(self, cache_key: str, etag: Optional[str], body: bytes, stored_at: float) -> None:
+        """Store a response fetched at ``stored_at``."""
+        if not self._enabled:
+            return
+        try:
+            with sqlite3.connect(self._db_path) as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO poll_cache (cache_key, etag, body, stored_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (cache_key, etag, sqlite3.Binary(body), _format_timestamp(stored_at)),
+                )
+        except sqlite3.Error as e:
+            self._log.warning("Failed to write poll cache entry %s: %s", cache_key, e)
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Delete every entry whose key starts with ``prefix``."""
+        if not self._enabled:
+            return
+        try:
+            with sqlite3.connect(self._db_path) as conn:
+                conn.execute(
+                    "DELETE FROM poll_cache WHERE substr(cache_key, 1, ?) = ?",
+                    (len(prefix), prefix),
+                )
+        except sqlite3.Error as e:
+            self._log.warning("Failed to invalidate poll cache entries %s*: %s", prefix, e)
@@ -12,7 +12,11 @@ _LOG = logging.getLogger(__name__)
 
 
 class TriggerExecutor:
-    """Executes bash scripts when triggers fire."""
+    """Executes bash scripts when triggers fire.
+
+    Scripts inherit the process environment as it was when the executor
+    was created; build a new executor to pick up later changes.
+    """
 
     def __init__(self, workdir: Optional[Path] = None):
         """Initialize the executor.
@@ -22,6 +26,8 @@ class TriggerExecutor:
                      Defaults to current directory.
         """
         self._workdir = workdir or Path.cwd()
+        # Snapshot of the parent environment shared by every trigger run.
+        self._base_env = dict(os.environ)
 
     def execute(self, event: TriggerEvent, config: OnMatchConfig) -> int:
         """Execute the trigger script with environment variables.
@@ -51,24 +57,23 @@ class TriggerExecutor:
             _LOG.error(f"Script not found: {script_path}")
             return 1
 
-        # Build environment
-        env = os.environ.copy()
-
         # Add standard poll variables
-        env["POLL_SOURCE_TYPE"] = event.source_type
-        env["POLL_ITEM_ID"] = event.item_id
-        env["POLL_ITEM_URL"] = event.item_url
+        poll_env = {
+            "POLL_SOURCE_TYPE": event.source_type,
+            "POLL_ITEM_ID": event.item_id,
+            "POLL_ITEM_URL": event.item_url,
+        }
 
         # Add source-specific variables
         if event.source_type == "github_issues":
-            env["ISSUE_NUMBER"] = event.item_id
+            poll_env["ISSUE_NUMBER"] = event.item_id
             if "repo" in event.metadata:
-                env["POLL_REPO"] = event.metadata["repo"]
+                poll_env["POLL_REPO"] = event.metadata["repo"]
             if "title" in event.metadata:
-                env["POLL_ISSUE_TITLE"] = event.metadata["title"]
+                poll_env["POLL_ISSUE_TITLE"] = event.metadata["title"]
 
-        # Add user-configured variables
-        env.update(config.env)
+        # Build environment in one pass; user-configured variables win
+        env = {**self._base_env, **poll_env, **config.env}
 
         _LOG.info(f"Executing trigger script: {script_path}")
         _LOG.debug(f"Environment: POLL_SOURCE_TYPE={event.source_type}, POLL_ITEM_ID={event.item_id}")
@@ -6,8 +6,10 @@ from typing import Any, Dict, List, Optional
 
 import yaml
 
+from ..compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class TriggerEvent:
     """Represents an item that matched polling criteria."""
 
@@ -17,7 +19,7 @@ class TriggerEvent:
     metadata: Dict[str, Any] = field(default_factory=dict)  # Source-specific data
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class OnMatchConfig:
     """What to execute when a match is found."""
 
@@ -25,7 +27,7 @@ class OnMatchConfig:
     env: Dict[str, str] = field(default_factory=dict)  # Additional env vars to pass
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class FilterConfig:
     """Filter configuration for poll sources."""
 
@@ -34,7 +36,7 @@ class FilterConfig:
     state: str = "open"  # "open" or "closed"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PollSourceConfig:
     """Configuration for a single poll source."""
 
@@ -45,7 +47,7 @@ class PollSourceConfig:
     processed_label: str = "agent-processing"  # Label to add after processing
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PollConfig:
     """Top-level poll configuration."""
 
@@ -1,7 +1,8 @@
 """Abstract base class for poll sources."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Sequence
 
 from ..models import PollSourceConfig, TriggerEvent
 
@@ -26,6 +27,20 @@ class PollSource(ABC):
         """
         pass
 
+    async def poll_async(self, config: PollSourceConfig) -> List[TriggerEvent]:
+        """Poll without blocking the event loop, so sources can be gathered.
+
+        The default runs :meth:`poll` in a worker thread; sources with a
+        native async client can override it.
+
+        Args:
+            config: Configuration for this poll source.
+
+        Returns:
+            Same as :meth:`poll`.
+        """
+        return await asyncio.to_thread(self.poll, config)
+
     @abstractmethod
     def mark_processed(self, event: TriggerEvent, config: PollSourceConfig) -> None:
         """Mark an item as processed to prevent re-triggering.
@@ -35,3 +50,16 @@ class PollSource(ABC):
             config: Configuration for this poll source.
         """
         pass
+
+    def mark_processed_batch(self, events: Sequence[TriggerEvent], config: PollSourceConfig) -> None:
+        """Mark several items as processed.
+
+        Sources that can update many items in one request should override
+        this; the default marks each event individually.
+
+        Args:
+            events: The trigger events to mark as processed.
+            config: Configuration for this poll source.
+        """
+        for event in events:
+            self.mark_processed(event, config)
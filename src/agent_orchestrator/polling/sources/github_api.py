@@ -0,0 +1,152 @@
+"""Minimal keep-alive client for the GitHub REST API."""
+
+import http.client
+import json
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import yaml
+
+_LOG = logging.getLogger(__name__)
+
+API_HOST = "api.github.com"
+# The only host whose REST API lives at API_HOST.
+DEFAULT_HOST = "github.com"
+# Errors raised before any response arrives when the server has already
+# closed an idle keep-alive connection.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+def github_token_from_env() -> Optional[str]:
+    """Return the API token from GITHUB_TOKEN or GH_TOKEN, if either is set."""
+    return os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN") or None
+
+
+def github_host() -> str:
+    """Return the GitHub host gh talks to.
+
+    Uses GH_HOST when set; otherwise, if gh is authenticated only against
+    other hosts (GitHub Enterprise), the first of those. Defaults to
+    github.com.
+    """
+    host = os.environ.get("GH_HOST")
+    if host:
+        return host
+    hosts_path = _gh_config_dir() / "hosts.yml"
+    try:
+        with hosts_path.open("r", encoding="utf-8") as handle:
+            hosts = yaml.safe_load(handle)
+    except (OSError, yaml.YAMLError):
+        return DEFAULT_HOST
+    if isinstance(hosts, dict) and hosts and DEFAULT_HOST not in hosts:
+        return str(next(iter(hosts)))
+    return DEFAULT_HOST
+
+
+def _gh_config_dir() -> Path:
+    """Return the directory gh reads its configuration from."""
+    configured = os.environ.get("GH_CONFIG_DIR")
+    if configured:
+        return Path(configured)
+    xdg = os.environ.get("XDG_CONFIG_HOME")
+    if xdg:
+        return Path(xdg) / "gh"
+    if sys.platform == "win32" and os.environ.get("APPDATA"):
+        return Path(os.environ["APPDATA"]) / "GitHub CLI"
+    return Path.home() / ".config" / "gh"
+
+
+class GitHubApiError(Exception):
+    """Raised when a GitHub API request fails."""
+
+
+class GitHubApiClient:
+    """Issue GitHub API requests over a single persistent HTTPS connection.
+
+    Reusing the connection avoids a TCP and TLS handshake per request, which
+    dominates the cost of the small requests the poller makes.
+    """
+
+    def __init__(self, token: str, host: str = API_HOST, timeout: float = 30.0) -> None:
+        self._host = host
+        self._timeout = timeout
+        self._headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": "agent-orchestrator",
+        }
+        self._conn: Optional[http.client.HTTPSConnection] = None
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Any] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Send a request and return ``(status, headers, body)``.
+
+        A request that fails because the server dropped the idle keep-alive
+        connection is retried once on a fresh connection. Any other failure,
+        such as a timeout after the request was sent, is not retried, so
+        mutations are never sent twice.
+        """
+        request_headers = dict(self._headers)
+        if headers:
+            request_headers.update(headers)
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            request_headers["Content-Type"] = "application/json"
+
+        with self._lock:
+            while True:
+                reused = self._conn is not None
+                conn = self._connection()
+                try:
+                    conn.request(method, path, body=payload, headers=request_headers)
+                    response = conn.getresponse()
+                except _STALE_CONNECTION_ERRORS as exc:
+                    self.close()
+                    if reused:
+                        continue
+                    raise GitHubApiError(f"{method} {path} failed: {exc}") from exc
+                except (http.client.HTTPException, OSError) as exc:
+                    self.close()
+                    raise GitHubApiError(f"{method} {path} failed: {exc}") from exc
+                try:
+                    data = response.read()
+                except (http.client.HTTPException, OSError) as exc:
+                    self.close()
+                    raise GitHubApiError(f"{method} {path} failed: {exc}") from exc
+                response_headers = {key.lower(): value for key, value in response.getheaders()}
+                if response.will_close:
+                    self.close()
+                break
+
+        remaining = response_headers.get("x-ratelimit-remaining")
+        if remaining is not None:
+            _LOG.debug("GitHub API %s %s -> %s (rate limit remaining: %s)",
+                       method, path, response.status, remaining)
+        return response.status, response_headers, data
+
+    def close(self) -> None:
+        """Close the underlying connection; the next request reopens it."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connection(self) -> http.client.HTTPSConnection:
+        if self._conn is None:
+            self._conn = http.client.HTTPSConnection(self._host, timeout=self._timeout)
+        return self._conn
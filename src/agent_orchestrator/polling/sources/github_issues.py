@@ -1,25 +1,85 @@
 """GitHub Issues poll source implementation."""
 
+import hashlib
 import json
 import logging
 import os
+import re
 import subprocess
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode, urlsplit
 
+from ... import json_utils
 from .base import PollSource
+from ..cache import PollCache
+from .github_api import (
+    DEFAULT_HOST,
+    GitHubApiClient,
+    GitHubApiError,
+    github_host,
+    github_token_from_env,
+)
 from ..models import PollSourceConfig, TriggerEvent
 
 _LOG = logging.getLogger(__name__)
 
+# Concurrent ``gh issue edit`` calls when labels are added one issue at a time.
+MAX_LABEL_WORKERS = 8
+# Seconds to wait before each retry of a rate-limited label edit.
+RATE_LIMIT_BACKOFF = (1.0, 2.0, 4.0)
+# Minimum seconds between issue-list requests for the same filter.
+ISSUE_LIST_TTL = 10.0
+# Most issues listed per poll, across all pages of the listing.
+MAX_LISTED_ISSUES = 1000
+
+_NEXT_LINK = re.compile(r'<([^>]+)>\s*;\s*rel="next"')
+
 
 class GitHubIssuePollSource(PollSource):
-    """Polls GitHub issues using the gh CLI."""
+    """Polls GitHub issues via the REST API, or the gh CLI without a token."""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        client: Optional[GitHubApiClient] = None,
+        cache: Optional[PollCache] = None,
+    ) -> None:
+        """Initialize the source.
+
+        Args:
+            token: GitHub API token. Defaults to GITHUB_TOKEN / GH_TOKEN; when
+                   no token is available, or gh targets a host other than
+                   github.com, the gh CLI is used instead.
+            client: Pre-built API client (mainly for tests).
+            cache: Persistent store for issue lists, so ETags survive restarts.
+        """
+        token = token or github_token_from_env()
+        if client is None and token:
+            host = github_host()
+            if host == DEFAULT_HOST:
+                client = GitHubApiClient(token)
+            else:
+                _LOG.debug("Using the gh CLI for GitHub host %s", host)
+        self._client = client
+        self._cache = cache
+        # Cached responses are scoped to the token that fetched them.
+        self._cache_scope = hashlib.sha256(token.encode()).hexdigest()[:16] if token else "gh"
+        # (repo, label name) -> label node id, resolved once per process.
+        self._label_ids: Dict[Tuple[str, str], str] = {}
+        # cache key -> (etag, issues, fetch time); mirrors self._cache. For
+        # the gh path the "etag" is an updatedAt fingerprint of the listing.
+        self._issue_cache: Dict[str, Tuple[Optional[str], List[Dict[str, Any]], float]] = {}
+        self._issue_cache_lock = threading.Lock()
 
     def poll(self, config: PollSourceConfig) -> List[TriggerEvent]:
         """Poll GitHub for issues matching the filter criteria.
 
-        Uses gh CLI to list issues with specified labels, then filters out
-        any issues that already have the processed_label.
+        Lists issues with the specified labels (through the REST API when a
+        token is available, otherwise the gh CLI), then filters out any issues
+        that already have the processed_label.
 
         Args:
             config: Poll source configuration.
@@ -32,50 +92,24 @@ class GitHubIssuePollSource(PollSource):
             _LOG.error("No repository specified and GITHUB_REPOSITORY not set")
             return []
 
-        # Build gh command to list issues
-        cmd = [
-            "gh", "issue", "list",
-            "--repo", repo,
-            "--state", config.filter.state,
-            "--json", "number,title,url,labels",
-        ]
-
-        # Add label filters (gh CLI does AND logic for multiple --label flags)
-        for label in config.filter.labels:
-            cmd.extend(["--label", label])
-
-        _LOG.debug(f"Running command: {' '.join(cmd)}")
-
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-        except subprocess.CalledProcessError as e:
-            _LOG.error(f"Failed to list GitHub issues: {e.stderr}")
+        issues = self._list_issues(repo, config)
+        if issues is None:
             return []
 
-        try:
-            issues = json.loads(result.stdout)
-        except json.JSONDecodeError as e:
-            _LOG.error(f"Failed to parse gh output: {e}")
-            return []
+        # Labels that disqualify an issue, built once per poll.
+        skip_labels = frozenset(config.filter.exclude_labels) | {config.processed_label}
 
         events = []
         for issue in issues:
             issue_labels = {label["name"] for label in issue.get("labels", [])}
 
-            # Skip if already processed
-            if config.processed_label in issue_labels:
-                _LOG.debug(f"Skipping issue #{issue['number']}: already has {config.processed_label}")
-                continue
-
-            # Skip if has any excluded labels
-            excluded = issue_labels & set(config.filter.exclude_labels)
-            if excluded:
-                _LOG.debug(f"Skipping issue #{issue['number']}: has excluded labels {excluded}")
+            blocking = skip_labels & issue_labels
+            if blocking:
+                if config.processed_label in blocking:
+                    # Already processed
+                    _LOG.debug("Skipping issue #%s: already has %s", issue["number"], config.processed_label)
+                else:
+                    _LOG.debug("Skipping issue #%s: has excluded labels %s", issue["number"], set(blocking))
                 continue
 
             event = TriggerEvent(
@@ -86,6 +120,7 @@ class GitHubIssuePollSource(PollSource):
                     "title": issue["title"],
                     "labels": [label["name"] for label in issue.get("labels", [])],
                     "repo": repo,
+                    "node_id": issue.get("id"),
                 },
             )
             events.append(event)
@@ -104,6 +139,7 @@ class GitHubIssuePollSource(PollSource):
         if not repo:
             _LOG.error("Cannot mark processed: no repository specified")
             return
+        self._forget_issues(repo)
 
         cmd = [
             "gh", "issue", "edit",
@@ -112,16 +148,336 @@ class GitHubIssuePollSource(PollSource):
             "--add-label", config.processed_label,
         ]
 
-        _LOG.debug(f"Running command: {' '.join(cmd)}")
-
         try:
-            subprocess.run(cmd, capture_output=True, text=True, check=True)
+            self._run_label_edit(cmd, event)
             _LOG.info(f"Marked issue #{event.item_id} with label '{config.processed_label}'")
         except subprocess.CalledProcessError as e:
             _LOG.error(f"Failed to add label to issue #{event.item_id}: {e.stderr}")
 
+    def mark_processed_batch(self, events: Sequence[TriggerEvent], config: PollSourceConfig) -> None:
+        """Add the processed_label to many issues with one GraphQL mutation.
+
+        The mutation aliases one ``addLabelsToLabelable`` call per issue, using
+        the node ids captured during poll. Events without a node id, or any
+        batch whose mutation fails, fall back to :meth:`mark_processed`
+        (adding a label that is already present is a no-op).
+
+        Args:
+            events: The trigger events to mark.
+            config: Poll source configuration.
+        """
+        by_repo: Dict[str, List[TriggerEvent]] = {}
+        unbatched: List[TriggerEvent] = []
+        for event in events:
+            repo = event.metadata.get("repo") or self._get_repo(config)
+            if not repo or not event.metadata.get("node_id"):
+                unbatched.append(event)
+                continue
+            by_repo.setdefault(repo, []).append(event)
+
+        for repo, repo_events in by_repo.items():
+            self._forget_issues(repo)
+            label_id = self._label_id(repo, config.processed_label)
+            if label_id is None or not self._add_label_batch(label_id, repo_events):
+                unbatched.extend(repo_events)
+                continue
+            for event in repo_events:
+                _LOG.info(f"Marked issue #{event.item_id} with label '{config.processed_label}'")
+
+        self._mark_each(unbatched, config)
+
+    def _mark_each(self, events: Sequence[TriggerEvent], config: PollSourceConfig) -> None:
+        """Run :meth:`mark_processed` for each event on a bounded thread pool."""
+        if len(events) <= 1:
+            for event in events:
+                self.mark_processed(event, config)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(MAX_LABEL_WORKERS, len(events))) as pool:
+            futures = [pool.submit(self.mark_processed, event, config) for event in events]
+            for future in as_completed(futures):
+                future.result()
+
+    def _run_label_edit(self, cmd: List[str], event: TriggerEvent) -> None:
+        """Run a label edit, backing off and retrying when rate limited.
+
+        Raises:
+            subprocess.CalledProcessError: If the edit fails for another
+                reason or is still rate limited after the last retry.
+        """
+        _log_command(cmd)
+        for delay in (*RATE_LIMIT_BACKOFF, None):
+            try:
+                subprocess.run(cmd, capture_output=True, text=True, check=True)
+                return
+            except subprocess.CalledProcessError as e:
+                if delay is None or not _is_rate_limited(e.stderr):
+                    raise
+                _LOG.warning(f"Rate limited labelling issue #{event.item_id}; retrying in {delay:g}s")
+                time.sleep(delay)
+
+    def _label_id(self, repo: str, label: str) -> Optional[str]:
+        """Return the node id of ``label`` in ``repo``, or None if unknown."""
+        key = (repo, label)
+        if key in self._label_ids:
+            return self._label_ids[key]
+
+        owner, _, name = repo.partition("/")
+        query = (
+            f"query {{ repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+            f"{{ label(name: {json.dumps(label)}) {{ id }} }} }}"
+        )
+        data = self._graphql(query)
+        label_node = ((data or {}).get("repository") or {}).get("label")
+        if not label_node:
+            _LOG.debug("Label '%s' not found in %s", label, repo)
+            return None
+        self._label_ids[key] = label_node["id"]
+        return label_node["id"]
+
+    def _add_label_batch(self, label_id: str, events: Sequence[TriggerEvent]) -> bool:
+        """Run one aliased mutation labelling every event; True on success."""
+        mutations = " ".join(
+            f"m{index}: addLabelsToLabelable(input: {{labelableId: "
+            f"{json.dumps(event.metadata['node_id'])}, labelIds: [{json.dumps(label_id)}]}}) "
+            f"{{ clientMutationId }}"
+            for index, event in enumerate(events)
+        )
+        return self._graphql(f"mutation {{ {mutations} }}") is not None
+
+    def _graphql(self, query: str) -> Optional[Dict[str, Any]]:
+        """Run a GraphQL document and return its ``data``, or None on error."""
+        if self._client is not None:
+            try:
+                status, _, body = self._client.request("POST", "/graphql", body={"query": query})
+            except GitHubApiError as e:
+                _LOG.error(f"GitHub GraphQL request failed: {e}")
+                return None
+            if status != 200:
+                _LOG.error(f"GitHub GraphQL request failed: HTTP {status}: {body[:200]!r}")
+                return None
+            raw = body
+        else:
+            cmd = ["gh", "api", "graphql", "-f", f"query={query}"]
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            except subprocess.CalledProcessError as e:
+                _LOG.error(f"GitHub GraphQL request failed: {e.stderr}")
+                return None
+            raw = result.stdout
+
+        try:
+            payload = json_utils.loads(raw)
+        except json.JSONDecodeError as e:
+            _LOG.error(f"Failed to parse GraphQL response: {e}")
+            return None
+        if payload.get("errors"):
+            _LOG.error(f"GitHub GraphQL errors: {payload['errors']}")
+            return None
+        return payload.get("data")
+
+    def _list_issues(self, repo: str, config: PollSourceConfig) -> Optional[List[Dict[str, Any]]]:
+        """Return issues as ``{number, title, url, labels: [{name}]}`` dicts.
+
+        Returns None when the listing failed (the error has been logged).
+        """
+        if self._client is not None:
+            return self._list_issues_api(repo, config)
+        return self._list_issues_gh(repo, config)
+
+    def _list_issues_api(self, repo: str, config: PollSourceConfig) -> Optional[List[Dict[str, Any]]]:
+        """List issues with direct REST calls on the persistent connection.
+
+        Follows ``rel="next"`` links until MAX_LISTED_ISSUES issues are listed.
+        """
+        params = {"state": config.filter.state, "per_page": "100"}
+        if config.filter.labels:
+            # The API matches issues carrying all of the listed labels.
+            params["labels"] = ",".join(config.filter.labels)
+        path: Optional[str] = f"/repos/{repo}/issues?{urlencode(params)}"
+
+        key = self._issue_list_key(repo, config)
+        cached = self._cached_issues(key)
+        now = time.time()
+        if cached is not None and 0 <= now - cached[2] < ISSUE_LIST_TTL:
+            return cached[1]
+
+        # A conditional request answered with 304 does not count against
+        # the rate limit.
+        headers = {"If-None-Match": cached[0]} if cached is not None and cached[0] else None
+        issues: List[Dict[str, Any]] = []
+        etag: Optional[str] = None
+        pages = 0
+        while path is not None and len(issues) < MAX_LISTED_ISSUES:
+            try:
+                status, response_headers, body = self._client.request("GET", path, headers=headers)
+            except GitHubApiError as e:
+                _LOG.error(f"Failed to list GitHub issues: {e}")
+                return None
+            if status == 304 and cached is not None and pages == 0:
+                _LOG.debug("Issue list for %s unchanged", repo)
+                self._store_issues(key, cached[0], cached[1], now)
+                return cached[1]
+            if status != 200:
+                _LOG.error(f"Failed to list GitHub issues: HTTP {status}: {body[:200]!r}")
+                return None
+
+            try:
+                payload = json_utils.loads(body)
+            except json.JSONDecodeError as e:
+                _LOG.error(f"Failed to parse GitHub API response: {e}")
+                return None
+
+            issues.extend(
+                {
+                    "number": issue["number"],
+                    "title": issue["title"],
+                    "url": issue["html_url"],
+                    "id": issue.get("node_id"),
+                    "labels": [{"name": label["name"]} for label in issue.get("labels", [])],
+                }
+                for issue in payload
+                # The issues endpoint also returns pull requests.
+                if "pull_request" not in issue
+            )
+            if pages == 0:
+                etag = response_headers.get("etag")
+            pages += 1
+            headers = None
+            path = _next_page_path(response_headers.get("link"))
+
+        # The ETag only covers the first page, so a listing spanning several
+        # pages is always fetched in full once the TTL expires.
+        self._store_issues(key, etag if pages == 1 else None, issues[:MAX_LISTED_ISSUES], now)
+        return issues[:MAX_LISTED_ISSUES]
+
+    def _issue_list_key(self, repo: str, config: PollSourceConfig) -> str:
+        labels = ",".join(config.filter.labels)
+        return f"{self._cache_scope}:{repo}:{labels}:{config.filter.state}"
+
+    def _cached_issues(self, key: str) -> Optional[Tuple[Optional[str], List[Dict[str, Any]], float]]:
+        """Return ``(etag, issues, fetch time)`` from memory or the persistent cache."""
+        with self._issue_cache_lock:
+            cached = self._issue_cache.get(key)
+        if cached is not None or self._cache is None:
+            return cached
+
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        try:
+            issues = json_utils.loads(entry.body)
+        except json.JSONDecodeError:
+            return None
+        cached = (entry.etag, issues, entry.stored_at)
+        with self._issue_cache_lock:
+            self._issue_cache[key] = cached
+        return cached
+
+    def _store_issues(
+        self, key: str, etag: Optional[str], issues: List[Dict[str, Any]], fetched_at: float
+    ) -> None:
+        with self._issue_cache_lock:
+            self._issue_cache[key] = (etag, issues, fetched_at)
+        if self._cache is not None:
+            body = json.dumps(issues).encode("utf-8")
+            self._cache.put(key, etag, body, fetched_at)
+
+    def _forget_issues(self, repo: str) -> None:
+        """Drop cached issue lists for ``repo`` once its labels change."""
+        prefix = f"{self._cache_scope}:{repo}:"
+        with self._issue_cache_lock:
+            for key in [key for key in self._issue_cache if key.startswith(prefix)]:
+                del self._issue_cache[key]
+        if self._cache is not None:
+            self._cache.delete_prefix(prefix)
+
+    def _list_issues_gh(self, repo: str, config: PollSourceConfig) -> Optional[List[Dict[str, Any]]]:
+        """List issues through the gh CLI.
+
+        Once a listing is cached, a probe fetching only ``number,updatedAt``
+        decides whether anything changed; if not, the cached listing is
+        reused instead of downloading and parsing the full one.
+        """
+        key = self._issue_list_key(repo, config)
+        cached = self._cached_issues(key)
+        if cached is not None and cached[0] is not None:
+            probe = self._run_gh_list(repo, config, "number,updatedAt")
+            if probe is not None and _issue_fingerprint(probe) == cached[0]:
+                _LOG.debug("Issue list for %s unchanged", repo)
+                return cached[1]
+
+        issues = self._run_gh_list(repo, config, "number,title,url,labels,id,updatedAt")
+        if issues is not None:
+            self._store_issues(key, _issue_fingerprint(issues), issues, time.time())
+        return issues
+
+    def _run_gh_list(
+        self, repo: str, config: PollSourceConfig, fields: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Run ``gh issue list`` for the filter, returning the parsed ``fields``."""
+        cmd = [
+            "gh", "issue", "list",
+            "--repo", repo,
+            "--state", config.filter.state,
+            "--json", fields,
+            "--limit", str(MAX_LISTED_ISSUES),
+        ]
+
+        # Add label filters (gh CLI does AND logic for multiple --label flags)
+        for label in config.filter.labels:
+            cmd.extend(["--label", label])
+
+        _log_command(cmd)
+
+        try:
+            # Keep stdout as bytes: the JSON parser decodes UTF-8 itself,
+            # which avoids holding a second, decoded copy of the listing.
+            result = subprocess.run(cmd, capture_output=True, check=True)
+        except subprocess.CalledProcessError as e:
+            _LOG.error(f"Failed to list GitHub issues: {_decode(e.stderr)}")
+            return None
+
+        try:
+            return json_utils.loads(result.stdout)
+        except json.JSONDecodeError as e:
+            _LOG.error(f"Failed to parse gh output: {e}")
+            return None
+
     def _get_repo(self, config: PollSourceConfig) -> str:
         """Get the repository from config or environment."""
         if config.repo:
             return config.repo
         return os.environ.get("GITHUB_REPOSITORY", "")
+
+
+def _next_page_path(link_header: Optional[str]) -> Optional[str]:
+    """Return the path and query of the ``rel="next"`` link, if any."""
+    match = _NEXT_LINK.search(link_header or "")
+    if match is None:
+        return None
+    url = urlsplit(match.group(1))
+    return f"{url.path}?{url.query}" if url.query else url.path
+
+
+def _issue_fingerprint(issues: List[Dict[str, Any]]) -> str:
+    """Summarize which issues are listed and when each was last updated."""
+    entries = sorted(f"{issue['number']}@{issue.get('updatedAt', '')}" for issue in issues)
+    return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+
+
+def _log_command(cmd: List[str]) -> None:
+    """Debug-log a command line, joining it only when debug logging is on."""
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("Running command: %s", " ".join(cmd))
+
+
+def _decode(output: Optional[bytes]) -> str:
+    """Decode captured subprocess output for logging."""
+    return (output or b"").decode("utf-8", errors="replace")
+
+
+def _is_rate_limited(stderr: Optional[str]) -> bool:
+    """Return True if gh reported a primary or secondary rate limit."""
+    text = (stderr or "").lower()
+    return "rate limit" in text or "429" in text
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import json
+import os
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
+from . import json_utils
 from .models import MemoryUpdate, RunReport
 
 
@@ -34,10 +37,38 @@ except ModuleNotFoundError:  # pragma: no cover - optional dependency
     Draft202012Validator = None
 
 
+_REQUIRED_FIELDS = ("schema", "run_id", "step_id", "agent", "status", "started_at", "ended_at")
+_REQUIRED_FIELD_SET = frozenset(_REQUIRED_FIELDS)
+# Required fields copied as strings; "status" is normalized separately.
+_STRING_FIELDS = ("schema", "run_id", "step_id", "agent", "started_at", "ended_at")
+# Optional fields as (name, coercer, default when absent).
+_OPTIONAL_FIELDS = (
+    ("artifacts", list, ()),
+    ("metrics", dict, {}),
+    ("logs", list, ()),
+    ("next_suggested_steps", list, ()),
+    ("gate_failure", bool, False),
+)
+
+# How often to re-stat a partially written report while waiting for the
+# writer to finish.
+_CHANGE_POLL_INTERVAL = 0.005
+# (size, mtime_ns, inode) of a report file.
+_FileSignature = Tuple[int, int, int]
+
+
 class RunReportError(Exception):
     """Raised when a run report cannot be loaded or validated."""
 
 
+@lru_cache(maxsize=None)
+def _load_validator(schema_path: Path, mtime_ns: int):
+    """Compile the schema at ``schema_path``; cached per path and mtime."""
+    with schema_path.open("r", encoding="utf-8") as f:
+        schema = json.load(f)
+    return Draft202012Validator(schema)
+
+
 class RunReportReader:
     def __init__(
         self,
@@ -52,21 +83,29 @@ class RunReportReader:
         if schema_path:
             if Draft202012Validator is None:
                 raise RunReportError("jsonschema must be installed to validate run reports")
-            if not schema_path.exists():
-                raise RunReportError(f"Run report schema not found: {schema_path}")
-            with schema_path.open("r", encoding="utf-8") as f:
-                schema = json.load(f)
-            self._validator = Draft202012Validator(schema)
-
-    def read(self, path: Path) -> RunReport:
-        if not path.exists():
+            try:
+                mtime_ns = schema_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                raise RunReportError(f"Run report schema not found: {schema_path}") from None
+            self._validator = _load_validator(schema_path.resolve(), mtime_ns)
+
+    def read(self, path: Path, prefetched_stat: Optional[os.stat_result] = None) -> RunReport:
+        """Load and validate the run report at ``path``.
+
+        Callers that have just stat'ed the file can pass the result as
+        ``prefetched_stat`` to skip the existence check.
+        """
+        if prefetched_stat is None and not path.exists():
             raise RunReportError(f"Run report not found: {path}")
         payload = None
         last_error: Optional[json.JSONDecodeError] = None
+        signature = None
         for attempt in range(1, self._retry_attempts + 1):
             try:
-                with path.open("r", encoding="utf-8") as f:
-                    payload = json.load(f)
+                with path.open("rb") as f:
+                    signature = _file_signature(os.fstat(f.fileno()))
+                    data = f.read()
+                payload = json_utils.loads(data)
                 break
             except json.JSONDecodeError as exc:
                 last_error = exc
@@ -76,7 +115,7 @@ class RunReportReader:
                     )
                     raise RunReportError(message) from exc
                 if self._retry_delay:
-                    time.sleep(self._retry_delay)
+                    self._wait_for_change(path, signature)
             except ValueError as exc:
                 raise RunReportError(f"Run report {path} could not be parsed: {exc}") from exc
             except OSError as exc:
@@ -96,9 +135,8 @@ class RunReportReader:
             except Exception as exc:  # pragma: no cover - depends on optional jsonschema
                 raise RunReportError(f"Run report {path} failed schema validation: {exc}") from exc
 
-        required = ["schema", "run_id", "step_id", "agent", "status", "started_at", "ended_at"]
-        missing = [field for field in required if field not in payload]
-        if missing:
+        if not _REQUIRED_FIELD_SET.issubset(payload):
+            missing = [field for field in _REQUIRED_FIELDS if field not in payload]
             raise RunReportError(f"Run report {path} missing fields: {', '.join(missing)}")
 
         # Parse memory_updates if present
@@ -113,19 +151,40 @@ class RunReportReader:
                     )
                 )
 
+        fields = {name: str(payload[name]) for name in _STRING_FIELDS}
+        for name, coerce, default in _OPTIONAL_FIELDS:
+            fields[name] = coerce(payload.get(name, default))
         return RunReport(
-            schema=str(payload["schema"]),
-            run_id=str(payload["run_id"]),
-            step_id=str(payload["step_id"]),
-            agent=str(payload["agent"]),
             status=normalize_status(payload["status"]),
-            started_at=str(payload["started_at"]),
-            ended_at=str(payload["ended_at"]),
-            artifacts=list(payload.get("artifacts", [])),
-            metrics=dict(payload.get("metrics", {})),
-            logs=list(payload.get("logs", [])),
-            next_suggested_steps=list(payload.get("next_suggested_steps", [])),
-            gate_failure=bool(payload.get("gate_failure", False)),
             memory_updates=memory_updates,
             raw=payload,
+            **fields,
         )
+
+    def _wait_for_change(self, path: Path, signature: Optional[_FileSignature]) -> None:
+        """Wait up to ``retry_delay`` for ``path`` to change and settle.
+
+        A partially written report is usually finished within milliseconds,
+        so polling the file's size and mtime lets the retry happen as soon
+        as the writer is done instead of after a fixed sleep. The file must
+        look the same on two consecutive polls so a retry is not spent on a
+        write that is still in progress.
+        """
+        deadline = time.monotonic() + self._retry_delay
+        previous = signature
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(_CHANGE_POLL_INTERVAL, remaining))
+            try:
+                current = _file_signature(os.stat(path))
+            except OSError:
+                return
+            if current != signature and current == previous:
+                return
+            previous = current
+
+
+def _file_signature(stat: os.stat_result) -> _FileSignature:
+    return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
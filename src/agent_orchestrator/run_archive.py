@@ -10,20 +10,51 @@ from __future__ import annotations
 import json
 import logging
 import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from . import json_utils
+from .compat import DATACLASS_SLOTS
 from .time_utils import utc_now
 
 _LOG = logging.getLogger(__name__)
 
 # Database schema version for future migrations
-SCHEMA_VERSION = 1
-
-
-@dataclass
+SCHEMA_VERSION = 3
+
+# Rows fetched per batch by RunArchive.iter_archived_runs.
+ITER_BATCH_SIZE = 500
+
+# (column, default) for the values taken from an archive record; archived_at
+# is filled in at insert time.
+_RECORD_DEFAULTS = (
+    ("run_id", None),
+    ("workflow_name", None),
+    ("status", None),
+    ("created_at", None),
+    ("ended_at", None),
+    ("total_cost_usd", 0.0),
+    ("total_input_tokens", 0),
+    ("total_output_tokens", 0),
+    ("steps_completed", 0),
+    ("steps_failed", 0),
+    ("work_summary", ""),
+)
+_ARCHIVE_COLUMNS = tuple(column for column, _ in _RECORD_DEFAULTS) + ("archived_at",)
+# Column list in ArchivedRun field order, so rows build it positionally.
+_SELECT_COLUMNS = ", ".join(_ARCHIVE_COLUMNS)
+_INSERT_SQL = (
+    f"INSERT OR IGNORE INTO archived_runs ({', '.join(_ARCHIVE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _ARCHIVE_COLUMNS)})"
+)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ArchivedRun:
     """Represents an archived run's metadata."""
 
@@ -63,19 +94,41 @@ class RunArchive:
 
     Stores run summaries that survive cleanup, allowing historical
     tracking of costs, runs, and work completed.
+
+    A single connection is opened up front and shared by all methods;
+    access is serialized with a lock so the archive can be used from
+    several threads (e.g. the web server's worker pool).
     """
 
     def __init__(self, repo_dir: Path, logger: Optional[logging.Logger] = None):
         self._repo_dir = repo_dir
         self._db_path = repo_dir / ".agents" / "run_archive.db"
         self._log = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        # WAL lets readers proceed during writes and is persistent. In WAL
+        # mode synchronous=NORMAL is still durable across application crashes
+        # and avoids an fsync on every commit.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA cache_size=-20000")
         self._ensure_db()
 
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Hold the lock and run the block in a transaction on the shared connection."""
+        with self._lock, self._conn:
+            yield self._conn
+
     def _ensure_db(self) -> None:
         """Create the database and tables if they don't exist."""
-        self._db_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with sqlite3.connect(self._db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
 
             # Create schema version table
@@ -122,17 +175,72 @@ class RunArchive:
                 ON archived_runs(created_at DESC)
             """)
 
+        if from_version < 2:
+            # Serve "workflow = ? ORDER BY created_at DESC LIMIT ?" straight
+            # from the index; it also covers plain workflow_name lookups.
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_archived_runs_workflow
-                ON archived_runs(workflow_name)
+                CREATE INDEX IF NOT EXISTS idx_archived_runs_wf_created
+                ON archived_runs(workflow_name, created_at DESC)
             """)
+            cursor.execute("DROP INDEX IF EXISTS idx_archived_runs_workflow")
 
-            # Update schema version
-            cursor.execute("DELETE FROM schema_version")
-            cursor.execute("INSERT INTO schema_version (version) VALUES (?)", (SCHEMA_VERSION,))
+        if from_version < 3:
+            # Running totals kept in step with archived_runs by triggers, so
+            # get_archive_stats reads one row instead of scanning the table.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS archive_stats_totals (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    total_runs INTEGER NOT NULL DEFAULT 0,
+                    completed_runs INTEGER NOT NULL DEFAULT 0,
+                    failed_runs INTEGER NOT NULL DEFAULT 0,
+                    total_cost_usd REAL NOT NULL DEFAULT 0.0,
+                    total_input_tokens INTEGER NOT NULL DEFAULT 0,
+                    total_output_tokens INTEGER NOT NULL DEFAULT 0,
+                    total_steps_completed INTEGER NOT NULL DEFAULT 0,
+                    total_steps_failed INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            cursor.execute("DELETE FROM archive_stats_totals")
+            cursor.execute("""
+                INSERT INTO archive_stats_totals
+                SELECT
+                    1,
+                    COUNT(*),
+                    COALESCE(SUM(status = 'COMPLETED'), 0),
+                    COALESCE(SUM(status = 'FAILED'), 0),
+                    COALESCE(SUM(total_cost_usd), 0.0),
+                    COALESCE(SUM(total_input_tokens), 0),
+                    COALESCE(SUM(total_output_tokens), 0),
+                    COALESCE(SUM(steps_completed), 0),
+                    COALESCE(SUM(steps_failed), 0)
+                FROM archived_runs
+            """)
+            for event, row, sign in (("INSERT", "NEW", "+"), ("DELETE", "OLD", "-")):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS archived_runs_totals_{event.lower()}
+                    AFTER {event} ON archived_runs
+                    BEGIN
+                        UPDATE archive_stats_totals SET
+                            total_runs = total_runs {sign} 1,
+                            completed_runs = completed_runs {sign} ({row}.status = 'COMPLETED'),
+                            failed_runs = failed_runs {sign} ({row}.status = 'FAILED'),
+                            total_cost_usd = total_cost_usd {sign} COALESCE({row}.total_cost_usd, 0.0),
+                            total_input_tokens = total_input_tokens {sign} COALESCE({row}.total_input_tokens, 0),
+                            total_output_tokens = total_output_tokens {sign} COALESCE({row}.total_output_tokens, 0),
+                            total_steps_completed = total_steps_completed {sign} COALESCE({row}.steps_completed, 0),
+                            total_steps_failed = total_steps_failed {sign} COALESCE({row}.steps_failed, 0)
+                        WHERE id = 1;
+                    END
+                """)
 
-            conn.commit()
-            self._log.info("Initialized run archive database (schema v%d)", SCHEMA_VERSION)
+        # Update schema version
+        cursor.execute("DELETE FROM schema_version")
+        cursor.execute("INSERT INTO schema_version (version) VALUES (?)", (SCHEMA_VERSION,))
+
+        conn.commit()
+        self._log.info(
+            "Migrated run archive database from schema v%d to v%d", from_version, SCHEMA_VERSION
+        )
 
     def archive_run(
         self,
@@ -154,16 +262,10 @@ class RunArchive:
         Returns True if the run was archived, False if it already exists.
         """
         try:
-            with sqlite3.connect(self._db_path) as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    """
-                    INSERT OR IGNORE INTO archived_runs (
-                        run_id, workflow_name, status, created_at, ended_at,
-                        total_cost_usd, total_input_tokens, total_output_tokens,
-                        steps_completed, steps_failed, work_summary, archived_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+                    _INSERT_SQL,
                     (
                         run_id,
                         workflow_name,
@@ -196,16 +298,47 @@ class RunArchive:
             self._log.error("Failed to archive run %s: %s", run_id, e)
             return False
 
+    def archive_runs(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Archive many runs in a single transaction.
+
+        Each record holds the keyword arguments accepted by :meth:`archive_run`
+        (as produced by :func:`extract_run_metadata`). Runs that are already
+        archived are skipped.
+
+        Returns the number of runs newly archived.
+        """
+        archived_at = utc_now()
+        rows = [
+            tuple(record.get(column, default) for column, default in _RECORD_DEFAULTS) + (archived_at,)
+            for record in records
+        ]
+        if not rows:
+            return 0
+        try:
+            with self._transaction() as conn:
+                # rowcount sums the rows inserted by each statement; unlike
+                # total_changes it ignores rows written by triggers.
+                inserted = conn.executemany(_INSERT_SQL, rows).rowcount
+        except sqlite3.Error as e:
+            self._log.error("Failed to archive %d run(s): %s", len(rows), e)
+            return 0
+
+        if inserted:
+            self._log.info("Archived %d run(s)", inserted)
+        return inserted
+
     def get_archived_run(self, run_id: str) -> Optional[ArchivedRun]:
         """Get a single archived run by ID."""
         try:
-            with sqlite3.connect(self._db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT * FROM archived_runs WHERE run_id = ?", (run_id,))
+                cursor.execute(
+                    f"SELECT {_SELECT_COLUMNS} FROM archived_runs WHERE run_id = ?", (run_id,)
+                )
                 row = cursor.fetchone()
                 if row:
-                    return ArchivedRun(**dict(row))
+                    return ArchivedRun(*row)
                 return None
         except sqlite3.Error as e:
             self._log.error("Failed to get archived run %s: %s", run_id, e)
@@ -216,6 +349,7 @@ class RunArchive:
         limit: Optional[int] = None,
         offset: int = 0,
         workflow_name: Optional[str] = None,
+        before: Optional[str] = None,
     ) -> List[ArchivedRun]:
         """
         Get archived runs with optional filtering.
@@ -224,54 +358,92 @@ class RunArchive:
             limit: Maximum number of runs to return
             offset: Number of runs to skip (for pagination)
             workflow_name: Filter by workflow name
+            before: Only return runs created before this timestamp. Passing
+                the created_at of the last run on a page fetches the next
+                page without the O(offset) scan of OFFSET pagination.
         """
-        try:
-            with sqlite3.connect(self._db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
+        return list(
+            self.iter_archived_runs(
+                limit=limit, offset=offset, workflow_name=workflow_name, before=before
+            )
+        )
 
-                query = "SELECT * FROM archived_runs"
-                params: List[Any] = []
-
-                if workflow_name:
-                    query += " WHERE workflow_name = ?"
-                    params.append(workflow_name)
-
-                query += " ORDER BY created_at DESC"
-
-                if limit:
-                    query += " LIMIT ?"
-                    params.append(limit)
-                    if offset:
-                        query += " OFFSET ?"
-                        params.append(offset)
-
-                cursor.execute(query, params)
-                return [ArchivedRun(**dict(row)) for row in cursor.fetchall()]
+    def iter_archived_runs(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        workflow_name: Optional[str] = None,
+        before: Optional[str] = None,
+        batch_size: int = ITER_BATCH_SIZE,
+    ) -> Iterator[ArchivedRun]:
+        """
+        Yield archived runs newest first without materializing the result.
 
+        Takes the same filters as :meth:`get_all_archived_runs`. Rows are
+        fetched ``batch_size`` at a time and the lock is only held while a
+        batch is fetched, so other archive methods can be called while
+        iterating.
+        """
+        query = f"SELECT {_SELECT_COLUMNS} FROM archived_runs"
+        conditions: List[str] = []
+        params: List[Any] = []
+
+        if workflow_name:
+            conditions.append("workflow_name = ?")
+            params.append(workflow_name)
+        if before:
+            conditions.append("created_at < ?")
+            params.append(before)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        query += " ORDER BY created_at DESC"
+
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+            if offset:
+                query += " OFFSET ?"
+                params.append(offset)
+
+        cursor = None
+        try:
+            with self._lock:
+                cursor = self._conn.execute(query, params)
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield ArchivedRun(*row)
         except sqlite3.Error as e:
             self._log.error("Failed to get archived runs: %s", e)
-            return []
+        finally:
+            if cursor is not None:
+                with self._lock:
+                    cursor.close()
 
     def get_archive_stats(self) -> Dict[str, Any]:
         """Get aggregate statistics from the archive."""
         try:
-            with sqlite3.connect(self._db_path) as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute("""
                     SELECT
-                        COUNT(*) as total_runs,
-                        SUM(CASE WHEN status = 'COMPLETED' THEN 1 ELSE 0 END) as completed_runs,
-                        SUM(CASE WHEN status = 'FAILED' THEN 1 ELSE 0 END) as failed_runs,
-                        SUM(total_cost_usd) as total_cost_usd,
-                        SUM(total_input_tokens) as total_input_tokens,
-                        SUM(total_output_tokens) as total_output_tokens,
-                        SUM(steps_completed) as total_steps_completed,
-                        SUM(steps_failed) as total_steps_failed
-                    FROM archived_runs
+                        total_runs,
+                        completed_runs,
+                        failed_runs,
+                        total_cost_usd,
+                        total_input_tokens,
+                        total_output_tokens,
+                        total_steps_completed,
+                        total_steps_failed
+                    FROM archive_stats_totals
+                    WHERE id = 1
                 """)
-                row = cursor.fetchone()
+                row = cursor.fetchone() or (0,) * 8
 
                 return {
                     "total_runs": row[0] or 0,
@@ -300,7 +472,7 @@ class RunArchive:
     def is_archived(self, run_id: str) -> bool:
         """Check if a run is already archived."""
         try:
-            with sqlite3.connect(self._db_path) as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT 1 FROM archived_runs WHERE run_id = ?", (run_id,))
                 return cursor.fetchone() is not None
@@ -308,6 +480,37 @@ class RunArchive:
             return False
 
 
+def _stats_signature(daily_stats_dir: Path) -> Tuple[Tuple[str, int], ...]:
+    """Return ``(file name, mtime_ns)`` for each daily stats file, newest first."""
+    signature = []
+    for stats_file in sorted(daily_stats_dir.glob("*.json"), reverse=True):
+        try:
+            signature.append((stats_file.name, stats_file.stat().st_mtime_ns))
+        except OSError:
+            continue
+    return tuple(signature)
+
+
+@lru_cache(maxsize=1)
+def _load_stats_index(
+    daily_stats_dir: Path, signature: Tuple[Tuple[str, int], ...]
+) -> Dict[str, Dict[str, Any]]:
+    """Map run_id to its record in the newest daily stats file that has it.
+
+    ``signature`` (from :func:`_stats_signature`) is part of the cache key, so
+    the index is rebuilt only when a stats file is added, removed or changed.
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    for name, _ in signature:
+        try:
+            stats_data = json_utils.load_path(daily_stats_dir / name)
+        except (json.JSONDecodeError, OSError):
+            continue
+        for run_id, run_info in stats_data.get("runs", {}).items():
+            index.setdefault(run_id, run_info)
+    return index
+
+
 def extract_run_metadata(run_dir: Path, daily_stats_dir: Optional[Path] = None) -> Dict[str, Any]:
     """
     Extract metadata from a run directory for archiving.
@@ -338,38 +541,44 @@ def extract_run_metadata(run_dir: Path, daily_stats_dir: Optional[Path] = None)
     state_file = run_dir / "run_state.json"
     if state_file.exists():
         try:
-            with state_file.open("r", encoding="utf-8") as f:
-                state_data = json.load(f)
+            state_data = json_utils.load_path(state_file)
 
             metadata["workflow_name"] = state_data.get("workflow_name", "unknown")
             metadata["created_at"] = state_data.get("created_at", metadata["created_at"])
             metadata["ended_at"] = state_data.get("updated_at")
 
-            # Count steps and determine status
+            # Count steps and aggregate metrics in one pass over local totals
             steps = state_data.get("steps", {})
             completed_steps = []
             failed_steps = []
+            input_tokens = output_tokens = 0
+            cost_usd = 0.0
 
             for step_id, step_runtime in steps.items():
                 step_status = step_runtime.get("status", "")
                 if step_status == "COMPLETED":
-                    metadata["steps_completed"] += 1
                     completed_steps.append(step_id)
                 elif step_status == "FAILED":
-                    metadata["steps_failed"] += 1
                     failed_steps.append(step_id)
 
                 # Aggregate metrics if available
-                metrics = step_runtime.get("metrics", {})
+                metrics = step_runtime.get("metrics")
                 if metrics:
-                    metadata["total_input_tokens"] += metrics.get("input_tokens", 0)
-                    metadata["total_output_tokens"] += metrics.get("output_tokens", 0)
-                    metadata["total_cost_usd"] += metrics.get("cost_usd", 0.0)
+                    get = metrics.get
+                    input_tokens += get("input_tokens", 0)
+                    output_tokens += get("output_tokens", 0)
+                    cost_usd += get("cost_usd", 0.0)
+
+            metadata["steps_completed"] = len(completed_steps)
+            metadata["steps_failed"] = len(failed_steps)
+            metadata["total_input_tokens"] = input_tokens
+            metadata["total_output_tokens"] = output_tokens
+            metadata["total_cost_usd"] = cost_usd
 
             # Determine overall status
-            if metadata["steps_failed"] > 0:
+            if failed_steps:
                 metadata["status"] = "FAILED"
-            elif metadata["steps_completed"] > 0:
+            elif completed_steps:
                 metadata["status"] = "COMPLETED"
             else:
                 metadata["status"] = "UNKNOWN"
@@ -389,25 +598,18 @@ def extract_run_metadata(run_dir: Path, daily_stats_dir: Optional[Path] = None)
 
     # Try to get cost from daily stats if not in run_state
     if daily_stats_dir and metadata["total_cost_usd"] == 0:
-        # Look for run in daily stats files
+        # Look for run in daily stats files (indexed once across calls)
         try:
-            for stats_file in sorted(daily_stats_dir.glob("*.json"), reverse=True):
-                try:
-                    with stats_file.open("r", encoding="utf-8") as f:
-                        stats_data = json.load(f)
-                    runs = stats_data.get("runs", {})
-                    if run_id in runs:
-                        run_info = runs[run_id]
-                        metadata["total_cost_usd"] = run_info.get("total_cost_usd", 0.0)
-                        # Also get step counts if we don't have them
-                        if metadata["steps_completed"] == 0:
-                            metadata["steps_completed"] = run_info.get("steps_completed", 0)
-                        if metadata["steps_failed"] == 0:
-                            metadata["steps_failed"] = run_info.get("steps_failed", 0)
-                        break
-                except (json.JSONDecodeError, OSError):
-                    continue
+            index = _load_stats_index(daily_stats_dir, _stats_signature(daily_stats_dir))
         except OSError:
-            pass
+            index = {}
+        run_info = index.get(run_id)
+        if run_info is not None:
+            metadata["total_cost_usd"] = run_info.get("total_cost_usd", 0.0)
+            # Also get step counts if we don't have them
+            if metadata["steps_completed"] == 0:
+                metadata["steps_completed"] = run_info.get("steps_completed", 0)
+            if metadata["steps_failed"] == 0:
+                metadata["steps_failed"] = run_info.get("steps_failed", 0)
 
     return metadata
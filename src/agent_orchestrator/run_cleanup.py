@@ -2,147 +2,256 @@
 
 from __future__ import annotations
 
-import json
 import logging
-import shutil
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from .run_archive import RunArchive, extract_run_metadata
+from . import json_utils
+from .compat import DATACLASS_SLOTS
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime so loading this module stays cheap when no
+    # cleanup runs.
+    from .run_archive import RunArchive
 
 _LOG = logging.getLogger(__name__)
 
+# Step statuses that mark a run as still in progress
+_ACTIVE_STATUSES = frozenset({"RUNNING", "WAITING_ON_HUMAN"})
+# Raw bytes that must appear in a state file for any step to be failed or active
+_STATUS_MARKERS = (b"FAILED", b"RUNNING", b"WAITING_ON_HUMAN")
+
 # Default retention settings
 DEFAULT_MAX_AGE_HOURS = 48
 DEFAULT_MAX_RUNS = 10
 
+# Threads used to read run_state.json files when enumerating many runs
+MAX_STATE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Below this many runs, state files are read serially
+PARALLEL_STATE_THRESHOLD = 8
+
+# Paths per ``rm -rf`` invocation when ARG_MAX cannot be determined
+DEFAULT_RM_BATCH_SIZE = 256
+# Concurrent ``rm -rf`` invocations when there is more than one batch
+MAX_DELETE_WORKERS = 4
+
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RunInfo:
     """Information about a single run directory."""
 
     run_id: str
     path: Path
-    created_at: datetime
+    created_at_ts: float  # Unix timestamp
     has_failed_step: bool
+    is_active: bool = False
+
+    @property
+    def created_at(self) -> datetime:
+        """Return the creation time as an aware UTC datetime."""
+        return datetime.fromtimestamp(self.created_at_ts, tz=timezone.utc)
+
+    @property
+    def age_seconds(self) -> float:
+        """Return the age of the run in seconds from the current time."""
+        return time.time() - self.created_at_ts
 
     @property
     def age(self) -> timedelta:
         """Return the age of the run from the current time."""
-        return datetime.now(timezone.utc) - self.created_at
+        return timedelta(seconds=self.age_seconds)
 
 
-def parse_run_state(run_dir: Path) -> tuple[Optional[datetime], bool]:
-    """Parse run_state.json to extract creation time and failure status.
+def parse_run_state(
+    run_dir: Path, dir_entry: Optional[os.DirEntry] = None
+) -> tuple[float, bool, bool]:
+    """Parse run_state.json to extract creation time, failure and activity status.
 
     Args:
         run_dir: Path to the run directory
+        dir_entry: Optional scandir entry for ``run_dir``; its cached stat
+            result is used for the mtime fallback
 
     Returns:
-        Tuple of (created_at datetime, has_failed_step bool).
+        Tuple of (created_at Unix timestamp, has_failed_step bool, is_active bool).
         If state file is missing or invalid, falls back to directory mtime.
     """
     state_file = run_dir / "run_state.json"
     has_failed_step = False
-    created_at = None
+    is_active = False
+    created_at: Optional[float] = None
 
-    if state_file.exists():
-        try:
-            with state_file.open("r", encoding="utf-8") as f:
-                state_data = json.load(f)
-
-            # Extract created_at timestamp
-            created_at_str = state_data.get("created_at")
-            if created_at_str:
-                # Parse ISO format timestamp (e.g., "2024-01-15T10:00:00.000000Z")
-                try:
-                    created_at = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
-                except ValueError:
-                    pass
-
-            # Check if any step has FAILED status
-            steps = state_data.get("steps", {})
-            for step_runtime in steps.values():
-                if step_runtime.get("status") == "FAILED":
+    # A full parse through json_utils (orjson when installed) is faster than
+    # streaming out only created_at and the step statuses in Python, even
+    # though the result includes fields that are not needed here.
+    try:
+        with state_file.open("rb") as f:
+            data = f.read()
+        state_data = json_utils.loads(data)
+
+        # Extract created_at timestamp
+        created_at_str = state_data.get("created_at")
+        if created_at_str:
+            # Parse ISO format timestamp (e.g., "2024-01-15T10:00:00.000000Z")
+            try:
+                created_at = datetime.fromisoformat(created_at_str.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                pass
+
+        # Check for FAILED and in-progress steps in a single pass, stopping
+        # as soon as both flags are known. Most old runs completed cleanly,
+        # so skip the scan when no status that matters appears in the file.
+        if any(marker in data for marker in _STATUS_MARKERS):
+            for step_runtime in state_data.get("steps", {}).values():
+                status = step_runtime.get("status")
+                if status == "FAILED":
                     has_failed_step = True
-                    break
-
-        except (json.JSONDecodeError, OSError) as exc:
-            _LOG.debug("Failed to parse run state at %s: %s", state_file, exc)
+                    if is_active:
+                        break
+                elif status in _ACTIVE_STATUSES:
+                    is_active = True
+                    if has_failed_step:
+                        break
+
+    except FileNotFoundError:
+        pass
+    except (json_utils.JSONDecodeError, OSError) as exc:
+        _LOG.debug("Failed to parse run state at %s: %s", state_file, exc)
 
     # Fall back to directory mtime if created_at not found
     if created_at is None:
         try:
-            mtime = run_dir.stat().st_mtime
-            created_at = datetime.fromtimestamp(mtime, tz=timezone.utc)
+            stat = dir_entry.stat() if dir_entry is not None else run_dir.stat()
+            created_at = stat.st_mtime
         except OSError:
-            created_at = datetime.now(timezone.utc)
+            created_at = time.time()
 
-    return created_at, has_failed_step
+    return created_at, has_failed_step, is_active
 
 
 def enumerate_runs(runs_dir: Path) -> List[RunInfo]:
     """Enumerate all run directories and return their info.
 
+    State files are read on a thread pool once there are enough runs for
+    the overlapping I/O to pay for the pool.
+
     Args:
         runs_dir: Path to the .agents/runs directory
 
     Returns:
         List of RunInfo objects for all valid run directories
     """
-    runs: List[RunInfo] = []
-
-    if not runs_dir.exists():
-        return runs
+    try:
+        scanner = os.scandir(runs_dir)
+    except FileNotFoundError:
+        return []
 
-    for entry in runs_dir.iterdir():
-        if not entry.is_dir():
-            continue
+    with scanner:
+        # Skip hidden entries and anything that is not a real directory
+        entries = [
+            entry
+            for entry in scanner
+            if not entry.name.startswith(".") and entry.is_dir(follow_symlinks=False)
+        ]
+
+    if len(entries) < PARALLEL_STATE_THRESHOLD:
+        return [_read_run_info(entry) for entry in entries]
+
+    with ThreadPoolExecutor(max_workers=min(MAX_STATE_WORKERS, len(entries))) as pool:
+        return list(pool.map(_read_run_info, entries))
+
+
+def _read_run_info(entry: os.DirEntry) -> RunInfo:
+    """Build the RunInfo for one scandir entry."""
+    run_path = Path(entry.path)
+    created_at, has_failed_step, is_active = parse_run_state(run_path, entry)
+    return RunInfo(
+        run_id=entry.name,
+        path=run_path,
+        created_at_ts=created_at,
+        has_failed_step=has_failed_step,
+        is_active=is_active,
+    )
 
-        # Skip any hidden directories or special entries
-        if entry.name.startswith("."):
-            continue
 
-        run_id = entry.name
-        created_at, has_failed_step = parse_run_state(entry)
+def _fast_rmtree(path: Path) -> None:
+    """Recursively delete ``path``.
 
-        runs.append(
-            RunInfo(
-                run_id=run_id,
-                path=entry,
-                created_at=created_at,
-                has_failed_step=has_failed_step,
-            )
-        )
+    On POSIX this shells out to ``rm -rf``, which removes large trees much
+    faster than ``shutil.rmtree``. Raises OSError if the removal fails.
+    """
+    if os.name == "nt":
+        import shutil
 
-    return runs
+        shutil.rmtree(path)
+        return
+    _rm_rf([path])
 
 
-def _is_run_active(run_dir: Path) -> bool:
-    """Check if a run appears to be currently active.
+def _rm_rf(paths: List[Path]) -> None:
+    """Run a single ``rm -rf`` over ``paths``; raises OSError on failure."""
+    result = subprocess.run(
+        ["rm", "-rf", "--", *(str(path) for path in paths)],
+        check=False,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        raise OSError(f"rm exited with code {result.returncode}: {stderr}")
 
-    Detects active runs by checking for running status in run_state.json.
-    """
-    state_file = run_dir / "run_state.json"
-    if not state_file.exists():
-        return False
 
+def _rm_batch_size() -> int:
+    """Return how many paths to pass to one ``rm`` so the command fits in ARG_MAX."""
     try:
-        with state_file.open("r", encoding="utf-8") as f:
-            state_data = json.load(f)
+        arg_max = os.sysconf("SC_ARG_MAX")
+    except (AttributeError, ValueError, OSError):
+        return DEFAULT_RM_BATCH_SIZE
+    if arg_max <= 0:
+        return DEFAULT_RM_BATCH_SIZE
+    return max(1, arg_max // 4096)
 
-        steps = state_data.get("steps", {})
-        for step_runtime in steps.values():
-            status = step_runtime.get("status")
-            if status in ("RUNNING", "WAITING_ON_HUMAN"):
-                return True
 
-    except (json.JSONDecodeError, OSError):
-        pass
+def _remove_run_dirs(runs: List[RunInfo]) -> List[RunInfo]:
+    """Delete the directories of ``runs`` and return the runs that were removed.
 
-    return False
+    On POSIX the paths are handed to ``rm -rf`` in as few invocations as
+    ARG_MAX allows, with up to MAX_DELETE_WORKERS invocations running at
+    once. If a batch fails, its runs are retried one at a time so a single
+    undeletable directory is reported on its own.
+    """
+    batch_size = 1 if os.name == "nt" else _rm_batch_size()
+    batches = [runs[start:start + batch_size] for start in range(0, len(runs), batch_size)]
+    if len(batches) <= 1 or os.name == "nt":
+        results = [_remove_batch(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=min(MAX_DELETE_WORKERS, len(batches))) as pool:
+            results = list(pool.map(_remove_batch, batches))
+    return [run for removed in results for run in removed]
+
+
+def _remove_batch(batch: List[RunInfo]) -> List[RunInfo]:
+    """Delete one batch of run directories, falling back to one run at a time."""
+    if len(batch) > 1:
+        try:
+            _rm_rf([run.path for run in batch])
+            return batch
+        except OSError as exc:
+            _LOG.debug("Batched removal failed, retrying per run: %s", exc)
+    removed: List[RunInfo] = []
+    for run in batch:
+        try:
+            _fast_rmtree(run.path)
+        except OSError as exc:
+            _LOG.warning("Failed to delete run %s: %s", run.run_id, exc)
+            continue
+        removed.append(run)
+    return removed
 
 
 def cleanup_old_runs(
@@ -150,6 +259,7 @@ def cleanup_old_runs(
     max_age_hours: int = DEFAULT_MAX_AGE_HOURS,
     archive: Optional[RunArchive] = None,
     daily_stats_dir: Optional[Path] = None,
+    runs: Optional[List[RunInfo]] = None,
 ) -> List[str]:
     """Remove runs older than the specified age, excluding failed runs.
 
@@ -158,14 +268,17 @@ def cleanup_old_runs(
         max_age_hours: Maximum age in hours before a run is eligible for deletion
         archive: Optional RunArchive instance to save run metadata before deletion
         daily_stats_dir: Optional path to daily stats for cost lookup
+        runs: Runs already enumerated from runs_dir; scanned when omitted
 
     Returns:
         List of deleted run_ids
     """
     deleted: List[str] = []
-    runs = enumerate_runs(runs_dir)
-    max_age = timedelta(hours=max_age_hours)
+    if runs is None:
+        runs = enumerate_runs(runs_dir)
+    max_age_seconds = max_age_hours * 3600
 
+    expired: List[RunInfo] = []
     for run in runs:
         # Skip failed runs - preserve for debugging
         if run.has_failed_step:
@@ -173,27 +286,25 @@ def cleanup_old_runs(
             continue
 
         # Skip active runs
-        if _is_run_active(run.path):
+        if run.is_active:
             _LOG.debug("Skipping active run: %s", run.run_id)
             continue
 
         # Check age
-        if run.age > max_age:
-            try:
-                # Archive run metadata before deletion
-                if archive:
-                    metadata = extract_run_metadata(run.path, daily_stats_dir)
-                    archive.archive_run(**metadata)
-
-                shutil.rmtree(run.path)
-                deleted.append(run.run_id)
-                _LOG.info(
-                    "Deleted old run %s (age: %.1f hours)",
-                    run.run_id,
-                    run.age.total_seconds() / 3600,
-                )
-            except OSError as exc:
-                _LOG.warning("Failed to delete run %s: %s", run.run_id, exc)
+        if run.age_seconds > max_age_seconds:
+            expired.append(run)
+
+    # Archive run metadata before deletion, in one transaction
+    if archive:
+        _archive_runs(archive, expired, daily_stats_dir)
+
+    for run in _remove_run_dirs(expired):
+        deleted.append(run.run_id)
+        _LOG.info(
+            "Deleted old run %s (age: %.1f hours)",
+            run.run_id,
+            run.age_seconds / 3600,
+        )
 
     if deleted:
         _LOG.info("Time-based cleanup removed %d run(s)", len(deleted))
@@ -201,11 +312,33 @@ def cleanup_old_runs(
     return deleted
 
 
+def _archive_runs(
+    archive: RunArchive, runs: List[RunInfo], daily_stats_dir: Optional[Path]
+) -> None:
+    """Archive metadata for ``runs`` with a single batched insert.
+
+    Metadata is read from disk on a thread pool for larger batches; the
+    insert itself stays a single transaction on the calling thread.
+    """
+    from .run_archive import extract_run_metadata
+
+    def extract(run: RunInfo) -> Dict[str, Any]:
+        return extract_run_metadata(run.path, daily_stats_dir)
+
+    if len(runs) < PARALLEL_STATE_THRESHOLD:
+        records = [extract(run) for run in runs]
+    else:
+        with ThreadPoolExecutor(max_workers=min(MAX_STATE_WORKERS, len(runs))) as pool:
+            records = list(pool.map(extract, runs))
+    archive.archive_runs(records)
+
+
 def enforce_run_limit(
     runs_dir: Path,
     max_runs: int = DEFAULT_MAX_RUNS,
     archive: Optional[RunArchive] = None,
     daily_stats_dir: Optional[Path] = None,
+    runs: Optional[List[RunInfo]] = None,
 ) -> List[str]:
     """Enforce maximum run count by removing oldest runs.
 
@@ -217,18 +350,20 @@ def enforce_run_limit(
         max_runs: Maximum number of run directories to keep
         archive: Optional RunArchive instance to save run metadata before deletion
         daily_stats_dir: Optional path to daily stats for cost lookup
+        runs: Runs already enumerated from runs_dir; scanned when omitted
 
     Returns:
         List of deleted run_ids
     """
     deleted: List[str] = []
-    runs = enumerate_runs(runs_dir)
+    if runs is None:
+        runs = enumerate_runs(runs_dir)
 
     # Filter out active runs - never delete those
-    deletable_runs = [r for r in runs if not _is_run_active(r.path)]
+    deletable_runs = [r for r in runs if not r.is_active]
 
-    # Sort by created_at (oldest first)
-    deletable_runs.sort(key=lambda r: r.created_at)
+    # Sort by creation time (oldest first)
+    deletable_runs.sort(key=lambda r: r.created_at_ts)
 
     # Calculate how many to delete
     total_count = len(runs)
@@ -244,23 +379,20 @@ def enforce_run_limit(
         delete_count,
     )
 
-    for run in deletable_runs[:delete_count]:
-        try:
-            # Archive run metadata before deletion
-            if archive:
-                metadata = extract_run_metadata(run.path, daily_stats_dir)
-                archive.archive_run(**metadata)
-
-            shutil.rmtree(run.path)
-            deleted.append(run.run_id)
-            _LOG.info(
-                "Deleted run %s to enforce limit (created: %s%s)",
-                run.run_id,
-                run.created_at.isoformat(),
-                ", was failed" if run.has_failed_step else "",
-            )
-        except OSError as exc:
-            _LOG.warning("Failed to delete run %s: %s", run.run_id, exc)
+    doomed = deletable_runs[:delete_count]
+
+    # Archive run metadata before deletion, in one transaction
+    if archive:
+        _archive_runs(archive, doomed, daily_stats_dir)
+
+    for run in _remove_run_dirs(doomed):
+        deleted.append(run.run_id)
+        _LOG.info(
+            "Deleted run %s to enforce limit (created: %s%s)",
+            run.run_id,
+            run.created_at.isoformat(),
+            ", was failed" if run.has_failed_step else "",
+        )
 
     if deleted:
         _LOG.info("Count-based cleanup removed %d run(s)", len(deleted))
@@ -295,20 +427,36 @@ def cleanup_runs(
     runs_dir = repo_path / ".agents" / "runs"
     daily_stats_dir = repo_path / ".agents" / "daily_stats"
 
-    if not runs_dir.exists():
-        _LOG.debug("No runs directory at %s, skipping cleanup", runs_dir)
+    # Scan the runs directory once and share the result between both phases
+    runs = enumerate_runs(runs_dir)
+    if not runs:
+        _LOG.debug("No runs under %s, skipping cleanup", runs_dir)
         return []
 
     # Create archive for preserving run metadata
-    archive = RunArchive(repo_path) if enable_archive else None
+    archive: Optional[RunArchive] = None
+    if enable_archive:
+        from .run_archive import RunArchive
+
+        archive = RunArchive(repo_path)
 
     deleted: List[str] = []
 
-    # Phase 1: Time-based cleanup
-    deleted.extend(cleanup_old_runs(runs_dir, max_age_hours, archive, daily_stats_dir))
+    try:
+        # Phase 1: Time-based cleanup
+        deleted.extend(
+            cleanup_old_runs(runs_dir, max_age_hours, archive, daily_stats_dir, runs=runs)
+        )
 
-    # Phase 2: Count-based cleanup
-    deleted.extend(enforce_run_limit(runs_dir, max_runs, archive, daily_stats_dir))
+        # Phase 2: Count-based cleanup over the runs that are left
+        removed = set(deleted)
+        remaining = [run for run in runs if run.run_id not in removed]
+        deleted.extend(
+            enforce_run_limit(runs_dir, max_runs, archive, daily_stats_dir, runs=remaining)
+        )
+    finally:
+        if archive:
+            archive.close()
 
     if deleted:
         _LOG.info("Run cleanup complete: removed %d run(s)", len(deleted))
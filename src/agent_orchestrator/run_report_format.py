@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import re
 from textwrap import dedent
-from typing import Any, Iterable, List
+from typing import Any, Iterable, List, Pattern
 
 RUN_REPORT_START = "<<<RUN_REPORT_JSON"
 RUN_REPORT_END = "RUN_REPORT_JSON>>>"
@@ -32,19 +33,24 @@ _PLACEHOLDER_ENDED_AT_PHRASES = (
 )
 
 
-def build_run_report_instructions(
-    run_id: str,
-    step_id: str,
-    agent: str,
-    started_at: str,
-) -> str:
-    """Return the guidance block embedded into wrapper prompts."""
+def _compile_phrases(phrases: Iterable[str]) -> Pattern[str]:
+    """Compile *phrases* into a single alternation matched against lowercase text."""
+
+    return re.compile("|".join(re.escape(phrase.strip().lower()) for phrase in phrases if phrase.strip()))
+
 
-    return dedent(
-        f"""IMPORTANT: When you complete your task, emit a run report with real artifact details and log lines. Replace any placeholders with concrete values. Use the
+_PLACEHOLDER_ARTIFACT_RE = _compile_phrases(_PLACEHOLDER_ARTIFACT_PHRASES)
+_PLACEHOLDER_LOG_RE = _compile_phrases(_PLACEHOLDER_LOG_PHRASES)
+_PLACEHOLDER_ENDED_AT_RE = _compile_phrases(_PLACEHOLDER_ENDED_AT_PHRASES)
+
+
+# Both guidance blocks are constant apart from a few fields, so they are
+# dedented once here rather than on every prompt build.
+_RUN_REPORT_INSTRUCTIONS_TEMPLATE = dedent(
+    """IMPORTANT: When you complete your task, emit a run report with real artifact details and log lines. Replace any placeholders with concrete values. Use the
 following format:
 
-{RUN_REPORT_START}
+{run_report_start}
 {{
   "schema": "run_report@v0",
   "run_id": "{run_id}",
@@ -63,7 +69,7 @@ following format:
   "next_suggested_steps": [],
   "memory_updates": []
 }}
-{RUN_REPORT_END}
+{run_report_end}
 
 Guidelines:
 - Provide relative repository paths for every artifact you created or updated. If
@@ -77,14 +83,10 @@ Guidelines:
 - The orchestrator will reject run reports that retain placeholder content in
   the artifacts, logs, or ended_at fields, or that omit log entries entirely.
 """
-    )
-
-
-def build_memory_update_instructions() -> str:
-    """Return guidance for agents on how to emit memory updates."""
+)
 
-    return dedent(
-        """
+_MEMORY_UPDATE_INSTRUCTIONS = dedent(
+    """
 ## Memory Updates (Use Sparingly)
 
 Only record knowledge that would take significant time to rediscover. Memory updates
@@ -120,27 +122,49 @@ Format:
 
 When in doubt, leave it out. Less is more.
 """
+)
+
+
+def build_run_report_instructions(
+    run_id: str,
+    step_id: str,
+    agent: str,
+    started_at: str,
+) -> str:
+    """Return the guidance block embedded into wrapper prompts."""
+
+    return _RUN_REPORT_INSTRUCTIONS_TEMPLATE.format(
+        run_report_start=RUN_REPORT_START,
+        run_report_end=RUN_REPORT_END,
+        run_id=run_id,
+        step_id=step_id,
+        agent=agent,
+        started_at=started_at,
     )
 
 
+def build_memory_update_instructions() -> str:
+    """Return guidance for agents on how to emit memory updates."""
+
+    return _MEMORY_UPDATE_INSTRUCTIONS
+
+
 def contains_placeholder_artifacts(values: Iterable[str]) -> bool:
     """Return True when the artifacts list still contains placeholder text."""
 
-    normalised = [value.strip().lower() for value in values if value.strip()]
-    return _matches_placeholder(normalised, _PLACEHOLDER_ARTIFACT_PHRASES)
+    return _matches_placeholder(values, _PLACEHOLDER_ARTIFACT_RE)
 
 
 def contains_placeholder_logs(values: Iterable[str]) -> bool:
     """Return True when the logs list still contains placeholder text."""
 
-    normalised = [value.strip().lower() for value in values if value.strip()]
-    return _matches_placeholder(normalised, _PLACEHOLDER_LOG_PHRASES)
+    return _matches_placeholder(values, _PLACEHOLDER_LOG_RE)
 
 
 def ended_at_looks_placeholder(value: str) -> bool:
     """Return True when the ended_at field still contains placeholder text."""
 
-    return _matches_placeholder([value.strip().lower()], _PLACEHOLDER_ENDED_AT_PHRASES)
+    return _PLACEHOLDER_ENDED_AT_RE.search(value.lower()) is not None
 
 
 class PlaceholderContentError(ValueError):
@@ -184,22 +208,11 @@ def normalize_run_report_payload(payload: dict[str, Any]) -> dict[str, Any]:
     return normalised
 
 
-def _matches_placeholder(values: Iterable[str], phrases: Iterable[str]) -> bool:
+def _matches_placeholder(values: Iterable[str], pattern: Pattern[str]) -> bool:
     """Helper that checks whether any placeholder phrase is present."""
 
-    if not values:
-        return False
-
-    joined = " ".join(values)
-    for phrase in phrases:
-        phrase = phrase.strip().lower()
-        if not phrase:
-            continue
-        if any(value == phrase for value in values):
-            return True
-        if phrase in joined:
-            return True
-    return False
+    joined = " ".join(value.strip().lower() for value in values if value.strip())
+    return pattern.search(joined) is not None
 
 
 def _normalise_string_list(value: Any) -> List[str]:
@@ -2,40 +2,167 @@ from __future__ import annotations
 
 import os
 import shlex
+import shutil
+import signal
+import string
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, IO, List, Optional, Sequence
+from typing import Dict, IO, List, Optional, Sequence, Set, Tuple
 
+from .compat import DATACLASS_SLOTS
 from .models import Step
 
 
+# Agent output goes straight from the child to the log file; the parent never
+# reads or buffers it.
+_LOG_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND
+
+
+# A command-line argument built from several pieces: its index in the
+# skeleton, its ``(is_field, text)`` pieces, and whether it is dropped when
+# it renders empty (it consists only of fields and none of it is quoted).
+_MixedArg = Tuple[int, List[Tuple[bool, str]], bool]
+
+_QUOTES = ("'", '"')
+
+
+def _split_with_quoting(template: str) -> List[Tuple[str, bool]]:
+    """Split ``template`` like ``shlex.split``, noting which tokens used quotes.
+
+    Raises:
+        ValueError: If the template has unbalanced quotes.
+    """
+    lexer = shlex.shlex(template, posix=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    tokens: List[Tuple[str, bool]] = []
+    while True:
+        start = lexer.instream.tell()
+        token = lexer.get_token()
+        if token is None:
+            return tokens
+        raw = template[start:lexer.instream.tell()]
+        tokens.append((token, any(quote in raw for quote in _QUOTES)))
+
+
 class ExecutionTemplate:
     """Build a subprocess command from a format string."""
 
     def __init__(self, template: str):
         self.template = template
+        # Tokenized command with ``None`` in every slot that needs a value
+        self._skeleton: Optional[List[Optional[str]]] = None
+        # Slots holding exactly one field: ``(index, field_name, droppable)``
+        self._substitutions: List[Tuple[int, str, bool]] = []
+        # Slots mixing literal text and fields, or holding several fields
+        self._mixed: List[_MixedArg] = []
+        self._compile(template)
+
+    def _compile(self, template: str) -> None:
+        """Tokenize the template with ``shlex`` and record where values go.
+
+        Each substituted value becomes part of exactly one argument, so values
+        containing spaces or quotes are passed through unchanged. As with
+        ``str.format`` followed by ``shlex.split``, an unquoted argument made
+        only of fields is dropped when it renders empty, while a quoted one
+        is kept as an empty argument. Leaves
+        ``_skeleton`` as ``None`` when the template cannot be tokenized or uses
+        format features beyond plain named fields (conversions, format specs,
+        attribute or index access, positional fields); those templates keep
+        rendering with ``str.format`` and splitting the result.
+        """
+        try:
+            tokens = _split_with_quoting(template)
+        except ValueError:
+            return
+        skeleton: List[Optional[str]] = []
+        substitutions: List[Tuple[int, str, bool]] = []
+        mixed: List[_MixedArg] = []
+        formatter = string.Formatter()
+        for index, (token, quoted) in enumerate(tokens):
+            pieces: List[Tuple[bool, str]] = []
+            for literal, field_name, format_spec, conversion in formatter.parse(token):
+                if literal:
+                    pieces.append((False, literal))
+                if field_name is None:
+                    continue
+                if format_spec or conversion or not field_name.isidentifier():
+                    return
+                pieces.append((True, field_name))
+            if not any(is_field for is_field, _ in pieces):
+                # Escaped braces are already unescaped in the literal pieces.
+                skeleton.append("".join(text for _, text in pieces))
+                continue
+            skeleton.append(None)
+            if len(pieces) == 1:
+                substitutions.append((index, pieces[0][1], not quoted))
+            else:
+                fields_only = all(is_field for is_field, _ in pieces)
+                mixed.append((index, pieces, fields_only and not quoted))
+        self._skeleton = skeleton
+        self._substitutions = substitutions
+        self._mixed = mixed
 
     def build(self, context: Dict[str, object]) -> List[str]:
-        rendered = self.template.format(**{k: str(v) for k, v in context.items()})
-        return shlex.split(rendered)
+        if self._skeleton is None:
+            rendered = self.template.format(**{k: str(v) for k, v in context.items()})
+            return shlex.split(rendered)
+        command = self._skeleton.copy()
+        empty: List[int] = []
+        for index, field_name, droppable in self._substitutions:
+            value = str(context[field_name])
+            command[index] = value
+            if not value and droppable:
+                empty.append(index)
+        for index, pieces, droppable in self._mixed:
+            arg = "".join(str(context[text]) if is_field else text for is_field, text in pieces)
+            command[index] = arg
+            if not arg and droppable:
+                empty.append(index)
+        if empty:
+            for index in sorted(empty, reverse=True):
+                del command[index]
+        return command  # type: ignore[return-value]
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class StepLaunch:
     step_id: str
     attempt: int
     process: subprocess.Popen
     report_path: Path
     log_path: Path
-    log_handle: IO[str]
+    # The child writes straight to the log file; the runner closes its own
+    # descriptor after spawning, so there is usually no handle to hold.
+    log_handle: Optional[IO[str]] = None
+
+    def terminate(self) -> None:
+        """Ask the agent and everything it spawned to stop."""
+        if os.name == "posix":
+            try:
+                # Agents run in their own session, so the pid is also the pgid.
+                os.killpg(self.process.pid, signal.SIGTERM)
+                return
+            except ProcessLookupError:
+                return
+            except PermissionError:
+                pass
+        self.process.terminate()
 
     def close_log(self) -> None:
-        if not self.log_handle.closed:
+        if self.log_handle is not None and not self.log_handle.closed:
             self.log_handle.close()
 
 
 class StepRunner:
+    """Launch workflow steps as agent subprocesses.
+
+    Steps inherit the process environment as it was when the runner was
+    created, merged with ``default_env``. Later changes to ``os.environ``
+    do not reach launched steps until :meth:`invalidate_env` is called.
+    """
+
     def __init__(
         self,
         execution_template: ExecutionTemplate,
@@ -51,9 +178,94 @@ class StepRunner:
         self._logs_dir = logs_dir
         self._workdir = workdir or repo_dir
         self._base_context = template_context or {}
+        # Template fields that are the same for every launch, as strings
+        self._context_template: Dict[str, object] = {
+            **{key: str(value) for key, value in self._base_context.items()},
+            "repo": os.fspath(repo_dir),
+        }
         self._default_env = default_env or {}
-        self._default_args = list(default_args) if default_args else []
+        # Process environment merged with default_env; see invalidate_env()
+        self._base_env = self._build_base_env()
+        # Absolute paths of bare command names, keyed by (name, PATH)
+        self._executables: Dict[Tuple[str, str], Optional[str]] = {}
+        self._default_args = [str(arg) for arg in default_args] if default_args else []
         self._logs_dir.mkdir(parents=True, exist_ok=True)
+        # Log directories already created by this runner
+        self._ensured_dirs: Set[Path] = {self._logs_dir}
+        # String forms of paths that are the same for every launch
+        self._repo_dir_str = os.fspath(repo_dir)
+        self._default_artifacts_str = os.fspath(repo_dir / ".agents" / "artifacts")
+        self._workdir_str = os.fspath(self._workdir)
+        # Per-step context and environment, keyed by (id, agent, model)
+        self._step_templates: Dict[
+            Tuple[str, str, Optional[str]], Tuple[Dict[str, object], Dict[str, str]]
+        ] = {}
+
+    def _build_base_env(self) -> Dict[str, str]:
+        return {**os.environ, **self._default_env}
+
+    def invalidate_env(self) -> None:
+        """Re-read ``os.environ`` for subsequent launches.
+
+        The process environment is captured when the runner is created;
+        call this after changing ``os.environ`` so new steps see the change.
+        """
+        self._base_env = self._build_base_env()
+        self._executables.clear()
+        self._step_templates.clear()
+
+    def _step_template(self, step: Step) -> Tuple[Dict[str, object], Dict[str, str]]:
+        """Return the template context and environment shared by every launch of ``step``.
+
+        Retries and loop iterations relaunch the same step many times; only
+        the run, attempt and path values differ between those launches.
+        Callers must copy the returned dictionaries before adding to them.
+        """
+        key = (step.id, step.agent, step.model)
+        cached = self._step_templates.get(key)
+        if cached is None:
+            context = self._context_template.copy()
+            context.update(step_id=step.id, agent=step.agent)
+            env = self._base_env.copy()
+            env.update(STEP_ID=step.id, AGENT_ID=step.agent, REPO_DIR=self._repo_dir_str)
+            # Add model to environment if specified in the step
+            if step.model:
+                env["STEP_MODEL"] = step.model
+            cached = self._step_templates[key] = (context, env)
+        return cached
+
+    def _resolve_executable(self, name: str, env: Dict[str, str]) -> Optional[str]:
+        """Return the absolute path of a bare command name on the child's PATH.
+
+        Resolving once in the parent spares the freshly spawned child from
+        trying ``execve`` on every PATH entry at each launch.
+        """
+        if os.name != "posix" or not name or os.sep in name:
+            return None
+        key = (name, env.get("PATH", os.defpath))
+        if key not in self._executables:
+            resolved = shutil.which(name, path=key[1])
+            # A relative PATH entry yields a relative path, which the child
+            # would look up from its own working directory instead.
+            self._executables[key] = resolved if resolved and os.path.isabs(resolved) else None
+        return self._executables[key]
+
+    def _spawn(
+        self, command: List[str], executable: Optional[str], env: Dict[str, str], log_fd: int
+    ) -> subprocess.Popen:
+        return subprocess.Popen(
+            command,
+            executable=executable,
+            cwd=self._workdir_str,
+            env=env,
+            stdout=log_fd,
+            stderr=subprocess.STDOUT,
+            # Descriptors Python opens are non-inheritable already, so
+            # skip the close-all-fds sweep; a new session lets the whole
+            # agent process tree be signalled together.
+            close_fds=False,
+            start_new_session=True,
+        )
 
     def launch(
         self,
@@ -67,43 +279,45 @@ class StepRunner:
         artifacts_dir: Optional[Path] = None,
         logs_dir: Optional[Path] = None,
     ) -> StepLaunch:
-        context = {
-            **self._base_context,
-            "repo": self._repo_dir,
-            "step_id": step.id,
-            "agent": step.agent,
-            "prompt": prompt_path,
-            "report": report_path,
-            "run_id": run_id,
-            "attempt": attempt,
-            "manual_input": manual_input_path or "",
-        }
+        # Stringify per-launch values once; they feed both argv and env.
+        prompt_str = str(prompt_path)
+        report_str = str(report_path)
+        attempt_str = str(attempt)
+        manual_input_str = str(manual_input_path) if manual_input_path else ""
+        step_context, step_env = self._step_template(step)
+        context = step_context.copy()
+        context.update(
+            prompt=prompt_str,
+            report=report_str,
+            run_id=run_id,
+            attempt=attempt_str,
+            manual_input=manual_input_str,
+        )
         command = self._template.build(context)
         if self._default_args:
-            command.extend(str(arg) for arg in self._default_args)
+            command.extend(self._default_args)
 
         effective_logs_dir = logs_dir or self._logs_dir
-        effective_logs_dir.mkdir(parents=True, exist_ok=True)
+        if effective_logs_dir not in self._ensured_dirs:
+            effective_logs_dir.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(effective_logs_dir)
         log_path = effective_logs_dir / f"{run_id}__{step.id}__attempt{attempt}.log"
-        log_file = log_path.open("w", encoding="utf-8")
-
-        env = os.environ.copy()
-        env.update(self._default_env)
-        step_env = {
-            "RUN_ID": run_id,
-            "STEP_ID": step.id,
-            "AGENT_ID": step.agent,
-            "REPO_DIR": str(self._repo_dir),
-            "PROMPT_PATH": str(prompt_path),
-            "REPORT_PATH": str(report_path),
-            "MANUAL_RESULT_PATH": str(manual_input_path) if manual_input_path else "",
-            "STEP_ATTEMPT": str(attempt),
-            "ARTIFACTS_DIR": str(artifacts_dir) if artifacts_dir else str(self._repo_dir / ".agents" / "artifacts"),
-        }
-        # Add model to environment if specified in the step
-        if step.model:
-            step_env["STEP_MODEL"] = step.model
-        env.update(step_env)
+        try:
+            log_fd = os.open(log_path, _LOG_FLAGS, 0o644)
+        except FileNotFoundError:
+            # The directory was removed since it was first created.
+            effective_logs_dir.mkdir(parents=True, exist_ok=True)
+            log_fd = os.open(log_path, _LOG_FLAGS, 0o644)
+
+        env = step_env.copy()
+        env.update(
+            RUN_ID=run_id,
+            PROMPT_PATH=prompt_str,
+            REPORT_PATH=report_str,
+            MANUAL_RESULT_PATH=manual_input_str,
+            STEP_ATTEMPT=attempt_str,
+            ARTIFACTS_DIR=str(artifacts_dir) if artifacts_dir else self._default_artifacts_str,
+        )
         if extra_env:
             env.update(extra_env)
 
@@ -111,19 +325,35 @@ class StepRunner:
         artifacts_dir_value = env.get("ARTIFACTS_DIR")
         if issue_number and artifacts_dir_value:
             issue_filename = f"gh_issue_{issue_number}.md"
-            issue_path = Path(artifacts_dir_value) / issue_filename
-            env.setdefault("ISSUE_MARKDOWN_FILENAME", issue_filename)
-            env.setdefault("ISSUE_MARKDOWN_DIR", str(issue_path.parent))
-            env.setdefault("ISSUE_MARKDOWN_PATH", str(issue_path))
+            # Only fill in what the caller did not set, and build the paths
+            # from strings rather than Path objects. normpath matches Path's
+            # clean-up of repeated separators and "." parts, but it also folds
+            # ".." (which Path keeps), so such values still go through Path.
+            if ".." in artifacts_dir_value:
+                issue_dir = str(Path(artifacts_dir_value))
+            else:
+                issue_dir = os.path.normpath(artifacts_dir_value)
+            if "ISSUE_MARKDOWN_FILENAME" not in env:
+                env["ISSUE_MARKDOWN_FILENAME"] = issue_filename
+            if "ISSUE_MARKDOWN_DIR" not in env:
+                env["ISSUE_MARKDOWN_DIR"] = issue_dir
+            if "ISSUE_MARKDOWN_PATH" not in env:
+                env["ISSUE_MARKDOWN_PATH"] = os.path.join(issue_dir, issue_filename)
 
-        process = subprocess.Popen(
-            command,
-            cwd=str(self._workdir),
-            env=env,
-            stdout=log_file,
-            stderr=subprocess.STDOUT,
-            text=True,
-        )
+        executable = self._resolve_executable(command[0], env) if command else None
+        try:
+            try:
+                process = self._spawn(command, executable, env, log_fd)
+            except FileNotFoundError:
+                if executable is None:
+                    raise
+                # The resolved program was moved or removed since it was
+                # cached; let this launch search PATH and re-resolve later.
+                self._executables.pop((command[0], env.get("PATH", os.defpath)), None)
+                process = self._spawn(command, None, env, log_fd)
+        finally:
+            # The child holds its own copy of the descriptor.
+            os.close(log_fd)
 
         return StepLaunch(
             step_id=step.id,
@@ -131,5 +361,4 @@ class StepRunner:
             process=process,
             report_path=report_path,
             log_path=log_path,
-            log_handle=log_file,
         )
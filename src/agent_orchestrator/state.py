@@ -1,26 +1,92 @@
 from __future__ import annotations
 
-import json
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Set
 
+from . import json_utils
 from .models import RunState
 
 
+# Flags for the temporary file a state save writes into
+_TMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# State directories already created in this process
+_ENSURED_DIRS: Set[Path] = set()
+
+
+def _ensure_dir(directory: Path) -> None:
+    if directory not in _ENSURED_DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(directory)
+
+
+# Start of the top-level ``updated_at`` line in two-space indented output;
+# nested keys are indented further, so this only matches the top level.
+_UPDATED_AT_LINE = b'\n  "updated_at": '
+
+
+def _without_updated_at(data: bytes) -> bytes:
+    """Return serialized state minus its ``updated_at`` line.
+
+    ``RunState.to_dict`` stamps a new ``updated_at`` on every call, so two
+    saves of an unchanged state only differ in that line.
+    """
+    start = data.find(_UPDATED_AT_LINE)
+    if start == -1:
+        return data
+    end = data.find(b"\n", start + 1)
+    return data[:start] + (data[end:] if end != -1 else b"")
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write ``data`` to ``fd`` straight from the bytes, usually in one syscall."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
 class RunStatePersister:
     def __init__(self, path: Path) -> None:
         self._path = path
-        self._path.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(self._path.parent)
+        # Bytes last written to ``_path`` without ``updated_at``; saves
+        # that would only change the timestamp are skipped
+        self._last_written: Optional[bytes] = None
 
-    def save(self, state: RunState) -> None:
-        with self._path.open("w", encoding="utf-8") as f:
-            json.dump(state.to_dict(), f, indent=2)
+    def save(
+        self,
+        state: RunState,
+        serialized_steps: Optional[Dict[str, Dict[str, object]]] = None,
+    ) -> None:
+        data = json_utils.dumps_indented(state.to_dict(serialized_steps))
+        content = _without_updated_at(data)
+        if content == self._last_written:
+            return
+        # Write a sibling file and rename it over the target so a crash
+        # mid-write never leaves a truncated state file behind.
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        try:
+            try:
+                fd = os.open(tmp_path, _TMP_FLAGS, 0o644)
+            except FileNotFoundError:
+                # The directory was removed after it was first created.
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(tmp_path, _TMP_FLAGS, 0o644)
+            try:
+                _write_all(fd, data)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._last_written = content
 
     def load(self) -> Optional[dict]:
         if not self._path.exists():
             return None
-        with self._path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return json_utils.load_path(self._path)
 
     @property
     def path(self) -> Path:
@@ -29,4 +95,5 @@ class RunStatePersister:
     def set_path(self, path: Path) -> None:
         """Update the path where state will be saved."""
         self._path = path
-        self._path.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(self._path.parent)
+        self._last_written = None
@@ -2,11 +2,42 @@
 
 from __future__ import annotations
 
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 
 ISO_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 
 
+# Calls to utc_now_fast() within the same window share one timestamp
+FAST_CLOCK_RESOLUTION = 0.01  # seconds
+
+_UTC = timezone.utc
+# Length of the "+00:00" offset that isoformat() appends for UTC
+_UTC_OFFSET_LEN = len("+00:00")
+
+
 def utc_now() -> str:
     """Return the current UTC time formatted using ISO 8601 with a trailing Z."""
-    return datetime.now(timezone.utc).strftime(ISO_FORMAT)
+    # isoformat() is implemented in C and skips the libc strftime path;
+    # with fixed microsecond precision it matches ISO_FORMAT exactly.
+    return datetime.now(_UTC).isoformat(timespec="microseconds")[:-_UTC_OFFSET_LEN] + "Z"
+
+
+@lru_cache(maxsize=1)
+def _utc_now_for_window(window: int) -> str:
+    return utc_now()
+
+
+def utc_now_fast() -> str:
+    """Return ``utc_now()``, reusing one value for calls in the same 10 ms window.
+
+    Meant for code that stamps many records in one pass; call
+    ``reset_utc_now_fast()`` when the next call must be fresh.
+    """
+    return _utc_now_for_window(int(time.monotonic() / FAST_CLOCK_RESOLUTION))
+
+
+def reset_utc_now_fast() -> None:
+    """Make the next ``utc_now_fast()`` call read the clock again."""
+    _utc_now_for_window.cache_clear()
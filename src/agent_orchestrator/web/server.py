@@ -3,25 +3,29 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import heapq
 import logging
 import os
-import subprocess
 import sys
 import uuid
+from collections import defaultdict
 from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, DefaultDict, Dict, IO, Iterable, List, Optional, Set, Tuple
 
 import yaml
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
+from .. import json_utils
 from ..daily_stats import DailyStats, DailyStatsTracker
 from ..run_archive import ArchivedRun, RunArchive
+from ..models import Workflow
 from ..workflow import load_workflow, WorkflowLoadError
 
 _LOG = logging.getLogger(__name__)
@@ -45,7 +49,7 @@ class StartRunRequest(BaseModel):
 
 class ActiveRun:
     """Tracks an active run launched from the web UI."""
-    def __init__(self, run_id: str, process: subprocess.Popen, log_path: Path):
+    def __init__(self, run_id: str, process: asyncio.subprocess.Process, log_path: Path):
         self.run_id = run_id
         self.process = process
         self.log_path = log_path
@@ -55,6 +59,193 @@ class ActiveRun:
 # Track active runs launched from web UI
 _active_runs: Dict[str, ActiveRun] = {}
 
+# Log streams check for new output quickly while a run is writing and back
+# off towards the slower interval while it is quiet.
+STREAM_POLL_MIN_SECONDS = 0.05
+STREAM_POLL_MAX_SECONDS = 1.0
+# Frames a viewer may fall behind by before it is disconnected.
+STREAM_QUEUE_SIZE = 256
+
+
+class LogBroadcaster:
+    """Tail one run's log file and fan its output out to every viewer.
+
+    The file is read once no matter how many clients are streaming it.
+    Viewers that subscribe later read the output they missed from the file
+    itself, viewers that fall too far behind are disconnected, and the tail
+    stops when the run completes or the last viewer leaves.
+    """
+
+    def __init__(self, run_id: str, log_path: Path):
+        self.run_id = run_id
+        self.log_path = log_path
+        self._subscribers: Set[asyncio.Queue] = set()
+        # Characters of the log already sent to subscribers
+        self._published_chars = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> Tuple[asyncio.Queue, int]:
+        """Register a viewer.
+
+        Returns its queue and how many characters of the log were published
+        before it joined; pass that count to :meth:`read_backlog`.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        if self._task is None:
+            self._task = asyncio.create_task(self._tail())
+        return queue, self._published_chars
+
+    async def read_backlog(self, length: int) -> str:
+        """Return the first ``length`` characters of the log."""
+        if not length:
+            return ""
+
+        def read() -> str:
+            with open(self.log_path, "r") as log_file:
+                return log_file.read(length)
+
+        return await asyncio.to_thread(read)
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            if _broadcasters.get(self.run_id) is self:
+                del _broadcasters[self.run_id]
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Replace the backlog with a final error so the viewer's
+                # stream ends; reconnecting replays the log from the file.
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"type": "error", "message": "Viewer fell behind; reconnect"})
+
+    def _publish_lines(self, content: str) -> None:
+        # Everything read in one tick goes out as a single frame.
+        self._published_chars += len(content)
+        self._publish({"type": "output", "lines": content.splitlines()})
+
+    async def _tail(self) -> None:
+        # Resolves when the run's process exits, waking the tail at once
+        exit_waiter: Optional[asyncio.Future] = None
+        log_file: Optional[IO[str]] = None
+        try:
+            # File access runs in a worker thread so a slow disk never
+            # stalls the event loop. The log stays open for the whole tail
+            # and each read continues from where the previous one stopped.
+            try:
+                log_file = await asyncio.to_thread(open, self.log_path, "r")
+            except OSError as e:
+                self._publish({"type": "error", "message": str(e)})
+                return
+            poll_interval = STREAM_POLL_MIN_SECONDS
+            while True:
+                try:
+                    new_content = await asyncio.to_thread(log_file.read)
+                    if new_content:
+                        poll_interval = STREAM_POLL_MIN_SECONDS
+                        self._publish_lines(new_content)
+
+                    # Check if run is still active
+                    active = _active_runs.get(self.run_id)
+                    if active is not None:
+                        exit_code = active.process.returncode
+                        if exit_code is not None:
+                            self._publish({"type": "complete", "exit_code": exit_code})
+                            # Clean up
+                            _active_runs.pop(self.run_id, None)
+                            return
+                        if exit_waiter is None:
+                            exit_waiter = asyncio.ensure_future(active.process.wait())
+                    else:
+                        # Run not active - send any remaining content and exit
+                        await asyncio.sleep(0.5)
+                        remaining = await asyncio.to_thread(log_file.read)
+                        if remaining:
+                            self._publish_lines(remaining)
+                        self._publish({"type": "complete", "exit_code": 0})
+                        return
+
+                    if not new_content:
+                        poll_interval = min(poll_interval * 2, STREAM_POLL_MAX_SECONDS)
+                    await asyncio.wait({exit_waiter}, timeout=poll_interval)
+                except Exception as e:
+                    self._publish({"type": "error", "message": str(e)})
+                    return
+        finally:
+            if exit_waiter is not None:
+                exit_waiter.cancel()
+            if log_file is not None:
+                log_file.close()
+            # Later viewers start a fresh tail once this one has finished.
+            if _broadcasters.get(self.run_id) is self:
+                del _broadcasters[self.run_id]
+
+
+def _open_log(log_path: Path) -> IO[str]:
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    return open(log_path, "w")
+
+
+async def _spawn_logged(
+    cmd: List[str], log_path: Path, cwd: Path
+) -> asyncio.subprocess.Process:
+    """Start ``cmd`` with its output written to ``log_path``.
+
+    Creating the log runs in a worker thread and the process is started
+    through asyncio, so neither blocks the event loop; the returned
+    process can be awaited for its exit.
+    """
+    log_file = await asyncio.to_thread(_open_log, log_path)
+    try:
+        return await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=log_file,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=str(cwd),
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},
+        )
+    finally:
+        # The child holds its own copy of the descriptor.
+        log_file.close()
+
+
+# Log tails shared by the viewers of each run
+_broadcasters: Dict[str, LogBroadcaster] = {}
+
+
+def _sse_event(event: Dict[str, Any]) -> bytes:
+    return b"data: " + json_utils.dumps(event) + b"\n\n"
+
+
+def _json_array_response(items: Iterable[Any]) -> StreamingResponse:
+    """Stream ``items`` as a JSON array, serializing one element at a time.
+
+    The client starts receiving bytes at once and the encoded array is
+    never held in memory as a whole.
+    """
+    async def generate():
+        separator = b"["
+        for item in items:
+            yield separator + json_utils.dumps(item)
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response serialized with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        return json_utils.dumps(content)
+
 
 def create_app(repo_dir: Path) -> FastAPI:
     """Create and configure the FastAPI application."""
@@ -62,6 +253,7 @@ def create_app(repo_dir: Path) -> FastAPI:
         title="Agent Orchestrator Dashboard",
         description="Monitor agent runs and cost analytics",
         version="1.0.0",
+        default_response_class=FastJSONResponse,
     )
 
     # Store repo_dir in app state
@@ -81,6 +273,13 @@ def create_app(repo_dir: Path) -> FastAPI:
     templates.env.filters["status_emoji"] = status_emoji
     templates.env.filters["status_class"] = status_class
 
+    # Templates ship with the package, so compile them all now (after the
+    # filters they use are registered) rather than on each first request,
+    # and skip the per-render mtime check.
+    templates.env.auto_reload = False
+    for template_name in templates.env.list_templates(extensions=["html"]):
+        templates.env.get_template(template_name)
+
     # Dashboard home page
     @app.get("/", response_class=HTMLResponse)
     async def dashboard(request: Request):
@@ -127,7 +326,7 @@ def create_app(repo_dir: Path) -> FastAPI:
             {
                 "request": request,
                 "stats_list": stats_list,
-                "chart_data": json.dumps(chart_data),
+                "chart_data": json_utils.dumps(chart_data).decode("utf-8"),
                 "today_stats": today_stats,
                 "cost_by_step": cost_by_step,
                 "selected_days": days,
@@ -147,27 +346,26 @@ def create_app(repo_dir: Path) -> FastAPI:
         tracker: DailyStatsTracker = app.state.stats_tracker
         archive: RunArchive = app.state.run_archive
 
-        all_runs = []
+        live_runs = []
+        archived_runs = []
 
         # Get set of archived run IDs to exclude from "live" list
         # (archived means the run was cleaned up, so it's not really live)
-        archived_run_ids = {r.run_id for r in archive.get_all_archived_runs()}
+        archived_run_ids = {r.run_id for r in archive.iter_archived_runs()}
 
         # Get live runs from daily stats
         if source in ("all", "live"):
-            live_runs = get_all_runs(tracker, days)
-            for run in live_runs:
+            for run in get_all_runs(tracker, days):
                 # Skip if this run was archived (cleaned up)
                 if run["run_id"] in archived_run_ids:
                     continue
                 run["source"] = "live"
-                all_runs.append(run)
+                live_runs.append(run)
 
         # Get archived runs
         if source in ("all", "archived"):
-            archived_runs = archive.get_all_archived_runs()
-            for run in archived_runs:
-                all_runs.append({
+            for run in archive.iter_archived_runs():
+                archived_runs.append({
                     "run_id": run.run_id,
                     "date": run.created_at[:10] if run.created_at else "",
                     "workflow_name": run.workflow_name,
@@ -183,7 +381,7 @@ def create_app(repo_dir: Path) -> FastAPI:
                 })
 
         # Sort by started_at descending
-        all_runs.sort(key=lambda x: x.get("started_at", ""), reverse=True)
+        all_runs = _newest_first(live_runs, archived_runs, lambda x: x.get("started_at", ""))
 
         # Get archive stats for the header
         archive_stats = archive.get_archive_stats()
@@ -330,7 +528,7 @@ def create_app(repo_dir: Path) -> FastAPI:
         """Get stats for a date range."""
         tracker: DailyStatsTracker = app.state.stats_tracker
         stats_list = get_stats_range(tracker, days)
-        return [s.to_dict() for s in stats_list]
+        return _json_array_response(s.to_dict() for s in stats_list)
 
     @app.get("/api/runs")
     async def api_runs(days: int = 7, source: str = "all"):
@@ -338,30 +536,34 @@ def create_app(repo_dir: Path) -> FastAPI:
         tracker: DailyStatsTracker = app.state.stats_tracker
         archive: RunArchive = app.state.run_archive
 
-        all_runs = []
+        live_runs = []
+        archived_runs = []
 
         # Get set of archived run IDs to exclude from "live" list
-        archived_run_ids = {r.run_id for r in archive.get_all_archived_runs()}
+        archived_run_ids = {r.run_id for r in archive.iter_archived_runs()}
 
         if source in ("all", "live"):
-            live_runs = get_all_runs(tracker, days)
-            for run in live_runs:
+            for run in get_all_runs(tracker, days):
                 # Skip if this run was archived (cleaned up)
                 if run["run_id"] in archived_run_ids:
                     continue
                 run["source"] = "live"
-                all_runs.append(run)
+                live_runs.append(run)
 
         if source in ("all", "archived"):
-            archived_runs = archive.get_all_archived_runs()
-            for run in archived_runs:
-                all_runs.append({
+            for run in archive.iter_archived_runs():
+                archived_runs.append({
                     **run.to_dict(),
                     "source": "archived",
                 })
 
-        all_runs.sort(key=lambda x: x.get("started_at", x.get("created_at", "")), reverse=True)
-        return all_runs
+        return _json_array_response(
+            _newest_first(
+                live_runs,
+                archived_runs,
+                lambda x: x.get("started_at", x.get("created_at", "")),
+            )
+        )
 
     @app.get("/api/archive/stats")
     async def api_archive_stats():
@@ -400,7 +602,7 @@ def create_app(repo_dir: Path) -> FastAPI:
         if not full_path.exists():
             return {"error": f"Workflow not found: {workflow_path}"}
         try:
-            workflow = load_workflow(full_path)
+            workflow = _load_workflow_cached(full_path, full_path.stat().st_mtime_ns)
             return {
                 "name": workflow.name,
                 "description": workflow.description,
@@ -457,22 +659,13 @@ def create_app(repo_dir: Path) -> FastAPI:
 
         # Setup logging
         logs_dir = repo_dir / ".agents" / "web_runs"
-        logs_dir.mkdir(parents=True, exist_ok=True)
         log_path = logs_dir / f"{run_id}.log"
 
         _LOG.info("Starting workflow run %s: %s", run_id, " ".join(cmd))
 
         # Launch subprocess
         try:
-            with open(log_path, "w") as log_file:
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=log_file,
-                    stderr=subprocess.STDOUT,
-                    cwd=str(repo_dir),
-                    env={**os.environ, "PYTHONUNBUFFERED": "1"},
-                )
-
+            process = await _spawn_logged(cmd, log_path, repo_dir)
             _active_runs[run_id] = ActiveRun(run_id, process, log_path)
 
             return {
@@ -501,11 +694,11 @@ def create_app(repo_dir: Path) -> FastAPI:
 
         if run_id in _active_runs:
             active = _active_runs[run_id]
-            poll = active.process.poll()
+            exit_code = active.process.returncode
             return {
                 "active": True,
-                "running": poll is None,
-                "exit_code": poll,
+                "running": exit_code is None,
+                "exit_code": exit_code,
                 "started_at": active.started_at,
                 "actual_run_id": actual_run_id,
             }
@@ -537,45 +730,24 @@ def create_app(repo_dir: Path) -> FastAPI:
                 log_path = app.state.repo_dir / ".agents" / "web_runs" / f"{run_id}.log"
 
             if not log_path.exists():
-                yield f"data: {json.dumps({'type': 'error', 'message': 'Log file not found'})}\n\n"
+                yield _sse_event({"type": "error", "message": "Log file not found"})
                 return
 
-            last_pos = 0
-            while True:
-                try:
-                    with open(log_path, "r") as f:
-                        f.seek(last_pos)
-                        new_content = f.read()
-                        if new_content:
-                            last_pos = f.tell()
-                            # Send each line as a separate event
-                            for line in new_content.splitlines():
-                                yield f"data: {json.dumps({'type': 'output', 'line': line})}\n\n"
-
-                    # Check if run is still active
-                    if run_id in _active_runs:
-                        poll = _active_runs[run_id].process.poll()
-                        if poll is not None:
-                            yield f"data: {json.dumps({'type': 'complete', 'exit_code': poll})}\n\n"
-                            # Clean up
-                            del _active_runs[run_id]
-                            return
-                    else:
-                        # Run not active - send any remaining content and exit
-                        await asyncio.sleep(0.5)
-                        with open(log_path, "r") as f:
-                            f.seek(last_pos)
-                            remaining = f.read()
-                            if remaining:
-                                for line in remaining.splitlines():
-                                    yield f"data: {json.dumps({'type': 'output', 'line': line})}\n\n"
-                        yield f"data: {json.dumps({'type': 'complete', 'exit_code': 0})}\n\n"
+            broadcaster = _broadcasters.get(run_id)
+            if broadcaster is None:
+                broadcaster = _broadcasters[run_id] = LogBroadcaster(run_id, log_path)
+            queue, missed = broadcaster.subscribe()
+            try:
+                backlog = await broadcaster.read_backlog(missed)
+                if backlog:
+                    yield _sse_event({"type": "output", "lines": backlog.splitlines()})
+                while True:
+                    event = await queue.get()
+                    yield _sse_event(event)
+                    if event["type"] != "output":
                         return
-
-                    await asyncio.sleep(0.3)  # Poll interval
-                except Exception as e:
-                    yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
-                    return
+            finally:
+                broadcaster.unsubscribe(queue)
 
         return StreamingResponse(
             generate(),
@@ -594,14 +766,15 @@ def create_app(repo_dir: Path) -> FastAPI:
 
         active = _active_runs[run_id]
         try:
-            active.process.terminate()
-            # Wait a bit for graceful shutdown
-            try:
-                active.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                active.process.kill()
+            if active.process.returncode is None:
+                active.process.terminate()
+                # Wait a bit for graceful shutdown
+                try:
+                    await asyncio.wait_for(active.process.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    active.process.kill()
 
-            del _active_runs[run_id]
+            _active_runs.pop(run_id, None)
             return {"success": True, "message": "Run stopped"}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -624,16 +797,40 @@ def extract_run_id_from_log(log_path: Path) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=64)
+def _load_workflow_cached(path: Path, mtime_ns: int) -> Workflow:
+    """Load a workflow, reusing the parse while the file is unchanged.
+
+    ``mtime_ns`` is only part of the cache key. Callers must not mutate
+    the returned workflow.
+    """
+    return load_workflow(path)
+
+
+# Discovery results with the directory signature they were built from
+_workflow_cache: Dict[Path, Tuple[Tuple[Tuple[str, int], ...], List[Dict[str, Any]]]] = {}
+_wrapper_cache: Dict[Path, Tuple[int, List[Dict[str, Any]]]] = {}
+
+
 def discover_workflows(repo_dir: Path) -> List[Dict[str, Any]]:
-    """Discover available workflow files."""
+    """Discover available workflow files.
+
+    Parsed results are reused until a workflow file is added, removed or
+    modified.
+    """
     workflows = []
     orchestrator_src = Path(__file__).parent.parent
     workflows_dir = orchestrator_src / "workflows"
 
     if workflows_dir.exists():
-        for yaml_file in sorted(workflows_dir.glob("*.yaml")):
+        yaml_files = sorted(workflows_dir.glob("*.yaml"))
+        signature = tuple((f.name, f.stat().st_mtime_ns) for f in yaml_files)
+        cached = _workflow_cache.get(workflows_dir)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        for yaml_file, (_, mtime_ns) in zip(yaml_files, signature):
             try:
-                workflow = load_workflow(yaml_file)
+                workflow = _load_workflow_cached(yaml_file, mtime_ns)
                 workflows.append({
                     "path": str(yaml_file.relative_to(orchestrator_src)),
                     "name": workflow.name,
@@ -650,6 +847,7 @@ def discover_workflows(repo_dir: Path) -> List[Dict[str, Any]]:
                     "filename": yaml_file.name,
                     "step_count": 0,
                 })
+        _workflow_cache[workflows_dir] = (signature, workflows)
 
     return workflows
 
@@ -661,12 +859,18 @@ def discover_wrappers(repo_dir: Path) -> List[Dict[str, Any]]:
     wrappers_dir = orchestrator_src / "wrappers"
 
     if wrappers_dir.exists():
+        # Only file names are listed, so the directory mtime covers changes.
+        mtime = wrappers_dir.stat().st_mtime_ns
+        cached = _wrapper_cache.get(wrappers_dir)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
         for py_file in sorted(wrappers_dir.glob("*_wrapper.py")):
             wrappers.append({
                 "path": str(py_file.relative_to(orchestrator_src)),
                 "name": py_file.stem.replace("_wrapper", "").replace("_", " ").title(),
                 "filename": py_file.name,
             })
+        _wrapper_cache[wrappers_dir] = (mtime, wrappers)
 
     return wrappers
 
@@ -746,9 +950,33 @@ def get_recent_runs(stats: DailyStats, limit: int = 10) -> List[Dict[str, Any]]:
                 "ended_at": run_info.get("ended_at", ""),
             }
         )
-    # Sort by started_at descending
-    runs.sort(key=lambda x: x.get("started_at", ""), reverse=True)
-    return runs[:limit]
+    # Most recently started first; only the top ``limit`` need ordering
+    return heapq.nlargest(limit, runs, key=itemgetter("started_at"))
+
+
+@lru_cache(maxsize=256)
+def _cached_past_daily_stats(
+    tracker: DailyStatsTracker, for_date: date, mtime_ns: Optional[int]
+) -> DailyStats:
+    # mtime_ns is only part of the cache key.
+    return tracker.get_daily_stats(for_date)
+
+
+def _past_daily_stats(tracker: DailyStatsTracker, for_date: date) -> DailyStats:
+    return _cached_past_daily_stats(tracker, for_date, tracker.get_stats_mtime_ns(for_date))
+
+
+def _daily_stats(tracker: DailyStatsTracker, for_date: date, today: date) -> DailyStats:
+    """Load stats for one day, reusing earlier reads of past days.
+
+    A past day's stats are served from memory until its file changes; a run
+    that started before midnight can still record into yesterday's file,
+    and a read that raced a write is redone once the write lands. Today's
+    stats are always read from disk.
+    """
+    if for_date < today:
+        return _past_daily_stats(tracker, for_date)
+    return tracker.get_daily_stats(for_date)
 
 
 def get_stats_range(tracker: DailyStatsTracker, days: int) -> List[DailyStats]:
@@ -757,7 +985,7 @@ def get_stats_range(tracker: DailyStatsTracker, days: int) -> List[DailyStats]:
     today = datetime.now(timezone.utc).date()
     for i in range(days):
         target_date = today - timedelta(days=i)
-        stats = tracker.get_daily_stats(target_date)
+        stats = _daily_stats(tracker, target_date, today)
         stats_list.append(stats)
     # Reverse to get chronological order
     stats_list.reverse()
@@ -766,18 +994,20 @@ def get_stats_range(tracker: DailyStatsTracker, days: int) -> List[DailyStats]:
 
 def prepare_chart_data(stats_list: List[DailyStats]) -> Dict[str, Any]:
     """Prepare data for charts."""
-    dates = []
-    costs = []
-    runs = []
-    tokens_input = []
-    tokens_output = []
-
-    for stats in stats_list:
-        dates.append(stats.date)
-        costs.append(round(stats.total_cost_usd, 4))
-        runs.append(stats.total_runs)
-        tokens_input.append(stats.total_input_tokens)
-        tokens_output.append(stats.total_output_tokens)
+    columns = [
+        (
+            stats.date,
+            round(stats.total_cost_usd, 4),
+            stats.total_runs,
+            stats.total_input_tokens,
+            stats.total_output_tokens,
+        )
+        for stats in stats_list
+    ]
+    # Transpose the per-day rows into one list per series.
+    dates, costs, runs, tokens_input, tokens_output = (
+        [list(series) for series in zip(*columns)] if columns else ([], [], [], [], [])
+    )
 
     return {
         "dates": dates,
@@ -790,31 +1020,29 @@ def prepare_chart_data(stats_list: List[DailyStats]) -> Dict[str, Any]:
 
 def get_cost_by_step(stats_list: List[DailyStats]) -> Dict[str, float]:
     """Aggregate cost by step ID across all stats."""
-    cost_by_step: Dict[str, float] = {}
+    cost_by_step: DefaultDict[str, float] = defaultdict(float)
 
     for stats in stats_list:
         for step in stats.steps:
-            step_id = step.get("step_id", "unknown")
-            cost = step.get("cost_usd", 0.0)
-            cost_by_step[step_id] = cost_by_step.get(step_id, 0.0) + cost
+            cost_by_step[step.get("step_id", "unknown")] += step.get("cost_usd", 0.0)
 
     # Sort by cost descending
-    sorted_steps = dict(
-        sorted(cost_by_step.items(), key=lambda x: x[1], reverse=True)
-    )
-    return sorted_steps
+    return dict(sorted(cost_by_step.items(), key=itemgetter(1), reverse=True))
 
 
 def get_all_runs(tracker: DailyStatsTracker, days: int) -> List[Dict[str, Any]]:
-    """Get all runs for the last N days."""
+    """Get all runs for the last N days, most recently started first."""
     all_runs = []
     today = datetime.now(timezone.utc).date()
 
+    # Days are visited newest first and every run started on the day whose
+    # stats record it, so sorting each day's runs orders the whole list.
     for i in range(days):
         target_date = today - timedelta(days=i)
-        stats = tracker.get_daily_stats(target_date)
+        stats = _daily_stats(tracker, target_date, today)
+        day_runs = []
         for run_id, run_info in stats.runs.items():
-            all_runs.append(
+            day_runs.append(
                 {
                     "run_id": run_id,
                     "date": stats.date,
@@ -827,21 +1055,73 @@ def get_all_runs(tracker: DailyStatsTracker, days: int) -> List[Dict[str, Any]]:
                     "ended_at": run_info.get("ended_at", ""),
                 }
             )
+        day_runs.sort(key=itemgetter("started_at"), reverse=True)
+        all_runs.extend(day_runs)
 
-    # Sort by started_at descending
-    all_runs.sort(key=lambda x: x.get("started_at", ""), reverse=True)
     return all_runs
 
 
+def _newest_first(
+    live_runs: List[Dict[str, Any]],
+    archived_runs: List[Dict[str, Any]],
+    key: Callable[[Dict[str, Any]], str],
+) -> List[Dict[str, Any]]:
+    """Merge live and archived runs, most recently started first.
+
+    ``live_runs`` comes from :func:`get_all_runs` and is already in that
+    order, so only the archived runs need sorting.
+    """
+    if not archived_runs:
+        return live_runs
+    archived_runs.sort(key=key, reverse=True)
+    if not live_runs:
+        return archived_runs
+    return list(heapq.merge(live_runs, archived_runs, key=key, reverse=True))
+
+
+@lru_cache(maxsize=8)
+def _past_run_dates(
+    tracker: DailyStatsTracker, today: date, mtimes: Tuple[Optional[int], ...]
+) -> Dict[str, List[date]]:
+    """Map each run_id to the past days (newest first) whose stats mention it.
+
+    ``mtimes`` holds the stats file modification times of the days before
+    ``today``, newest first, so the index is rebuilt only when one of those
+    files changes; lookups then touch only the days that actually hold the
+    run.
+    """
+    index: Dict[str, List[date]] = {}
+    for i, mtime_ns in enumerate(mtimes, 1):
+        target_date = today - timedelta(days=i)
+        stats = _cached_past_daily_stats(tracker, target_date, mtime_ns)
+        run_ids = set(stats.runs)
+        run_ids.update(step.get("run_id") for step in stats.steps)
+        for run_id in run_ids:
+            index.setdefault(run_id, []).append(target_date)
+    return index
+
+
+def _run_stats_days(
+    tracker: DailyStatsTracker, run_id: str, days: int
+) -> List[DailyStats]:
+    """Return the stats of the recent days that mention ``run_id``, newest first."""
+    today = datetime.now(timezone.utc).date()
+    stats_days = []
+    if days > 0:
+        stats_days.append(tracker.get_daily_stats(today))
+    mtimes = tuple(
+        tracker.get_stats_mtime_ns(today - timedelta(days=i)) for i in range(1, days)
+    )
+    for target_date in _past_run_dates(tracker, today, mtimes).get(run_id, ()):
+        stats_days.append(_past_daily_stats(tracker, target_date))
+    return stats_days
+
+
 def get_run_info(
     tracker: DailyStatsTracker, run_id: str, days: int = 30
 ) -> Optional[Dict[str, Any]]:
     """Find run info across recent days."""
-    today = datetime.now(timezone.utc).date()
-
-    for i in range(days):
-        target_date = today - timedelta(days=i)
-        stats = tracker.get_daily_stats(target_date)
+    for stats in _run_stats_days(tracker, run_id, days):
         if run_id in stats.runs:
             run_info = stats.runs[run_id].copy()
             run_info["date"] = stats.date
@@ -855,11 +1135,8 @@ def get_run_steps(
 ) -> List[Dict[str, Any]]:
     """Get steps for a run from daily stats."""
     steps = []
-    today = datetime.now(timezone.utc).date()
 
-    for i in range(days):
-        target_date = today - timedelta(days=i)
-        stats = tracker.get_daily_stats(target_date)
+    for stats in _run_stats_days(tracker, run_id, days):
         for step in stats.steps:
             if step.get("run_id") == run_id:
                 steps.append(step)
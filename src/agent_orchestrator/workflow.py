@@ -7,6 +7,9 @@ import yaml
 
 from .models import LoopConfig, Step, Workflow
 
+# libyaml's C parser when PyYAML was built with it, else the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class WorkflowLoadError(Exception):
     """Raised when a workflow file is invalid."""
@@ -50,7 +53,7 @@ def load_workflow(path: Path) -> Workflow:
         raise WorkflowLoadError(f"Workflow file not found: {path}")
 
     with path.open("r", encoding="utf-8") as f:
-        payload = yaml.safe_load(f) or {}
+        payload = yaml.load(f, Loader=_YAML_LOADER) or {}
 
     if "steps" not in payload or not isinstance(payload["steps"], Iterable):
         raise WorkflowLoadError("Workflow file must declare a 'steps' list")
@@ -225,6 +225,15 @@ class TestDailyStatsTracker:
         data = json.loads(stats_file.read_text())
         assert data["date"] == today
 
+    def test_stats_mtime_tracks_file_changes(self, tmp_path):
+        tracker = DailyStatsTracker(tmp_path)
+        assert tracker.get_stats_mtime_ns() is None
+
+        tracker.record_run_start("run-123", "test")
+        today = datetime.now(timezone.utc).date().isoformat()
+        stats_file = tmp_path / ".agents" / "daily_stats" / f"{today}.json"
+        assert tracker.get_stats_mtime_ns() == stats_file.stat().st_mtime_ns
+
 
 class TestDailyStatsTrackerActualCost:
     """Tests for actual cost tracking from Claude CLI."""
@@ -0,0 +1,62 @@
+"""Tests for gate evaluators."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import List
+
+from agent_orchestrator.gating import (
+    AlwaysOpenGateEvaluator,
+    CompositeGateEvaluator,
+    FileBackedGateEvaluator,
+    GateEvaluator,
+)
+from agent_orchestrator.models import Step
+
+
+def _step(step_id: str) -> Step:
+    return Step(id=step_id, agent="coder", prompt="prompts/step.md", needs=[])
+
+
+class RecordingEvaluator(GateEvaluator):
+    def __init__(self, closed: set) -> None:
+        self.closed = closed
+        self.seen: List[str] = []
+
+    def evaluate(self, step: Step, gate: str) -> bool:
+        self.seen.append(gate)
+        return gate not in self.closed
+
+
+def test_evaluate_many_preserves_order() -> None:
+    evaluator = RecordingEvaluator(closed={"g2"})
+    items = [(_step("a"), "g1"), (_step("b"), "g2"), (_step("c"), "g3")]
+
+    assert evaluator.evaluate_many(items) == [True, False, True]
+    assert evaluator.seen == ["g1", "g2", "g3"]
+
+
+def test_file_backed_batch_reads_states_once(tmp_path: Path, monkeypatch) -> None:
+    gate_file = tmp_path / "gates.json"
+    gate_file.write_text(json.dumps({"ci": True, "review": False}), encoding="utf-8")
+    evaluator = FileBackedGateEvaluator(gate_file)
+    loads = []
+    original = evaluator._load_states
+    monkeypatch.setattr(evaluator, "_load_states", lambda: loads.append(1) or original())
+
+    results = evaluator.evaluate_many(
+        [(_step("a"), "ci"), (_step("b"), "review"), (_step("c"), "unknown")]
+    )
+
+    assert results == [True, False, False]
+    assert len(loads) == 1
+
+
+def test_composite_skips_gates_already_closed() -> None:
+    first = RecordingEvaluator(closed={"g1"})
+    second = RecordingEvaluator(closed={"g3"})
+    composite = CompositeGateEvaluator(AlwaysOpenGateEvaluator(), first, second)
+    items = [(_step("a"), "g1"), (_step("b"), "g2"), (_step("c"), "g3")]
+
+    assert composite.evaluate_many(items) == [False, True, False]
+    assert second.seen == ["g2", "g3"]
@@ -41,7 +41,7 @@ def test_step_runner_injects_issue_markdown_env(monkeypatch, tmp_path):
         def poll(self):
             return 0
 
-    def fake_popen(command, cwd, env, stdout, stderr, text):
+    def fake_popen(command, cwd, env, stdout, stderr, **kwargs):
         nonlocal captured_env
         captured_env = env
         return DummyProcess()
@@ -122,3 +122,42 @@ def test_planner_receives_issue_artifact_path(tmp_path):
     assert env["ISSUE_MARKDOWN_FILENAME"] == expected_absolute.name
     assert expected_absolute.is_file()
     assert str(orchestrator._artifacts_dir) in str(expected_absolute)
+
+
+def test_step_runner_keeps_caller_issue_markdown_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("ISSUE_MARKDOWN_PATH", raising=False)
+    monkeypatch.delenv("ISSUE_MARKDOWN_DIR", raising=False)
+    monkeypatch.delenv("ISSUE_MARKDOWN_FILENAME", raising=False)
+
+    runner = StepRunner(
+        execution_template=ExecutionTemplate("echo test"),
+        repo_dir=tmp_path,
+        logs_dir=tmp_path / "logs",
+        default_env={"ISSUE_NUMBER": "5"},
+    )
+    captured_env = {}
+
+    class DummyProcess:
+        def poll(self):
+            return 0
+
+    def fake_popen(command, cwd, env, stdout, stderr, **kwargs):
+        captured_env.update(env)
+        return DummyProcess()
+
+    monkeypatch.setattr("subprocess.Popen", fake_popen)
+
+    runner.launch(
+        step=build_step("fetch_github_issue", "github_issue_fetcher", "prompt.md"),
+        run_id="testrun",
+        report_path=tmp_path / "report.json",
+        prompt_path=tmp_path / "prompt.md",
+        extra_env={
+            "ARTIFACTS_DIR": f"{tmp_path}//artifacts/./",
+            "ISSUE_MARKDOWN_PATH": "/custom.md",
+        },
+    )
+
+    assert captured_env["ISSUE_MARKDOWN_PATH"] == "/custom.md"
+    assert captured_env["ISSUE_MARKDOWN_DIR"] == str(tmp_path / "artifacts")
+    assert captured_env["ISSUE_MARKDOWN_FILENAME"] == "gh_issue_5.md"
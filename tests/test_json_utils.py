@@ -0,0 +1,58 @@
+"""Tests for the JSON parsing helpers."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from agent_orchestrator import json_utils
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def parser(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_utils, "orjson", None)
+    return request.param
+
+
+def test_loads_accepts_bytes_and_str(parser) -> None:
+    assert json_utils.loads(b'{"title": "caf\xc3\xa9"}') == {"title": "café"}
+    assert json_utils.loads('[1, 2]') == [1, 2]
+
+
+def test_invalid_json_raises_stdlib_decode_error(parser) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        json_utils.loads(b'{"status": ')
+
+
+def test_load_path_reads_file(parser, tmp_path: Path) -> None:
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps({"run_id": "r1"}), encoding="utf-8")
+
+    assert json_utils.load_path(path) == {"run_id": "r1"}
+
+
+def test_dumps_is_compact_utf8(parser) -> None:
+    payload = {"type": "output", "line": "café", "counts": [1, 2]}
+
+    data = json_utils.dumps(payload)
+
+    assert data == '{"type":"output","line":"café","counts":[1,2]}'.encode("utf-8")
+
+
+def test_dumps_indented_round_trips(parser) -> None:
+    payload = {"run_id": "r1", "steps": {"plan": {"status": "COMPLETED", "title": "café"}}}
+
+    data = json_utils.dumps_indented(payload)
+
+    assert isinstance(data, bytes)
+    assert json.loads(data) == payload
+    assert b'\n  "run_id": "r1"' in data
+
+
+def test_dumps_indented_rejects_unserializable_values(parser) -> None:
+    with pytest.raises(TypeError):
+        json_utils.dumps_indented({"value": object()})
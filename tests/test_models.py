@@ -1,7 +1,10 @@
+import sys
 from pathlib import Path
 from datetime import datetime, timezone
 
-from agent_orchestrator.models import RunState
+import pytest
+
+from agent_orchestrator.models import RunState, StepRuntime, StepStatus
 
 
 def _parse_utc(timestamp: str) -> datetime:
@@ -26,3 +29,39 @@ def test_run_state_timestamps_are_timezone_aware():
     assert created_at.tzinfo == timezone.utc
     assert updated_at.tzinfo == timezone.utc
     assert updated_at >= created_at
+
+
+def test_step_runtime_reset_restores_defaults_in_place():
+    runtime = StepRuntime(
+        status=StepStatus.FAILED,
+        attempts=2,
+        iteration_count=1,
+        last_error="boom",
+        artifacts=["a.md"],
+        logs=["line"],
+        loop_index=3,
+        loop_items=[1, 2, 3],
+        loop_completed=True,
+    )
+    artifacts = runtime.artifacts
+
+    runtime.reset()
+
+    assert runtime == StepRuntime()
+    assert artifacts == ["a.md"]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+def test_runtime_records_use_slots():
+    state = RunState(
+        run_id="run-123",
+        workflow_name="demo",
+        repo_dir=Path("/tmp/repo"),
+        reports_dir=Path("/tmp/reports"),
+        manual_inputs_dir=Path("/tmp/manual"),
+    )
+
+    for record in (state, StepRuntime()):
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.unexpected = True
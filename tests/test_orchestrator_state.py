@@ -0,0 +1,374 @@
+"""Tests for orchestrator run-state bookkeeping and persistence."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional
+from unittest.mock import Mock, patch
+
+import pytest
+
+from agent_orchestrator import models
+from agent_orchestrator.models import (
+    LoopConfig,
+    RunState,
+    Step,
+    StepRuntime,
+    StepStatus,
+    Workflow,
+)
+from agent_orchestrator.orchestrator import Orchestrator
+from agent_orchestrator.reporting import RunReportReader
+from agent_orchestrator.runner import StepRunner
+from agent_orchestrator.state import RunStatePersister
+
+
+@pytest.fixture
+def temp_repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    (repo / "prompts").mkdir(parents=True)
+    (repo / "prompts" / "step.md").write_text("stub", encoding="utf-8")
+    return repo
+
+
+def _chain_workflow(count: int) -> Workflow:
+    steps = {}
+    previous = None
+    for index in range(count):
+        step_id = f"step_{index}"
+        steps[step_id] = Step(
+            id=step_id,
+            agent="coder",
+            prompt="prompts/step.md",
+            needs=[previous] if previous else [],
+        )
+        previous = step_id
+    return Workflow(name="chain", description="", steps=steps)
+
+
+def _write_report(report_path: Path, run_id: str, step_id: str, status: str = "COMPLETED") -> None:
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(
+        json.dumps(
+            {
+                "schema": "run_report_v1",
+                "run_id": run_id,
+                "step_id": step_id,
+                "agent": "coder",
+                "status": status,
+                "started_at": "2025-01-01T00:00:00Z",
+                "ended_at": "2025-01-01T00:01:00Z",
+                "artifacts": [],
+                "metrics": {},
+                "logs": [],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+
+def _completing_runner(
+    launches: List[str], failing: frozenset = frozenset(), handles: Optional[List[Mock]] = None
+) -> Mock:
+    """Return a runner whose launches finish immediately with a report."""
+
+    def launch(step, **kwargs):
+        launches.append(step.id)
+        status = "FAILED" if step.id in failing else "COMPLETED"
+        _write_report(kwargs["report_path"], kwargs["run_id"], step.id, status)
+        handle = Mock()
+        handle.process = Mock()
+        handle.process.poll = Mock(return_value=0)
+        handle.report_path = kwargs["report_path"]
+        handle.close_log = Mock()
+        if handles is not None:
+            handles.append(handle)
+        return handle
+
+    runner = Mock(spec=StepRunner)
+    runner.launch = Mock(side_effect=launch)
+    return runner
+
+
+def _build_orchestrator(
+    temp_repo: Path, tmp_path: Path, workflow: Workflow, runner, max_attempts: int = 2
+) -> Orchestrator:
+    return Orchestrator(
+        workflow=workflow,
+        workflow_root=temp_repo,
+        repo_dir=temp_repo,
+        report_reader=RunReportReader(),
+        state_persister=RunStatePersister(tmp_path / "state.json"),
+        runner=runner,
+        poll_interval=0.01,
+        max_attempts=max_attempts,
+        logger=logging.getLogger(__name__),
+    )
+
+
+def test_persisted_state_tracks_every_step(temp_repo: Path, tmp_path: Path) -> None:
+    launches: List[str] = []
+    orchestrator = _build_orchestrator(
+        temp_repo, tmp_path, _chain_workflow(5), _completing_runner(launches)
+    )
+
+    orchestrator.run()
+
+    state_file = temp_repo / ".agents" / "runs" / orchestrator.run_id / "run_state.json"
+    data = json.loads(state_file.read_text(encoding="utf-8"))
+    assert list(data["steps"]) == [f"step_{index}" for index in range(5)]
+    assert {entry["status"] for entry in data["steps"].values()} == {"COMPLETED"}
+    assert all(entry["attempts"] == 1 for entry in data["steps"].values())
+
+
+def test_persist_only_reserializes_dirty_steps(temp_repo: Path, tmp_path: Path) -> None:
+    orchestrator = _build_orchestrator(
+        temp_repo, tmp_path, _chain_workflow(10), _completing_runner([])
+    )
+
+    with patch.object(StepRuntime, "to_dict", autospec=True, return_value={}) as to_dict:
+        orchestrator._persist_state()
+        assert to_dict.call_count == 0
+
+        orchestrator._launch_ready_steps()
+        orchestrator._persist_state()
+        assert [call.args[0] for call in to_dict.call_args_list] == [
+            orchestrator._state.steps["step_0"]
+        ]
+
+    assert orchestrator._state.steps["step_0"].status == StepStatus.RUNNING
+
+
+def test_status_counts_follow_transitions(temp_repo: Path, tmp_path: Path) -> None:
+    launches: List[str] = []
+    orchestrator = _build_orchestrator(
+        temp_repo,
+        tmp_path,
+        _chain_workflow(3),
+        _completing_runner(launches, failing=frozenset({"step_1"})),
+        max_attempts=3,
+    )
+
+    orchestrator.run()
+
+    assert launches == ["step_0", "step_1", "step_1", "step_1"]
+    assert not orchestrator.run_succeeded
+    assert orchestrator._has_terminal_failure()
+    assert not orchestrator._all_steps_finished()
+    statuses = [runtime.status for runtime in orchestrator._state.steps.values()]
+    assert orchestrator._status_counts[StepStatus.COMPLETED] == statuses.count(StepStatus.COMPLETED)
+    assert orchestrator._status_counts[StepStatus.FAILED] == statuses.count(StepStatus.FAILED)
+    assert orchestrator._status_counts[StepStatus.PENDING] == statuses.count(StepStatus.PENDING)
+
+
+def test_valid_report_skips_process_poll(temp_repo: Path, tmp_path: Path) -> None:
+    handles: List[Mock] = []
+    orchestrator = _build_orchestrator(
+        temp_repo, tmp_path, _chain_workflow(3), _completing_runner([], handles=handles)
+    )
+
+    orchestrator.run()
+
+    assert len(handles) == 3
+    assert all(handle.process.poll.call_count == 0 for handle in handles)
+
+
+def test_missing_report_after_exit_fails_step(temp_repo: Path, tmp_path: Path) -> None:
+    def launch(step, **kwargs):
+        handle = Mock()
+        handle.process.poll = Mock(return_value=3)
+        handle.process.returncode = 3
+        handle.report_path = kwargs["report_path"]
+        return handle
+
+    runner = Mock(spec=StepRunner)
+    runner.launch = Mock(side_effect=launch)
+    orchestrator = _build_orchestrator(
+        temp_repo, tmp_path, _chain_workflow(1), runner, max_attempts=1
+    )
+
+    orchestrator.run()
+
+    runtime = orchestrator._state.steps["step_0"]
+    assert runtime.status == StepStatus.FAILED
+    assert "exited with code 3" in runtime.last_error
+
+
+def test_idle_ticks_do_not_rewrite_state(temp_repo: Path, tmp_path: Path) -> None:
+    polls = {"count": 0}
+
+    def launch(step, **kwargs):
+        def poll():
+            polls["count"] += 1
+            if polls["count"] == 5:
+                _write_report(kwargs["report_path"], kwargs["run_id"], step.id)
+            return None
+
+        handle = Mock()
+        handle.process.poll = Mock(side_effect=poll)
+        handle.report_path = kwargs["report_path"]
+        return handle
+
+    runner = Mock(spec=StepRunner)
+    runner.launch = Mock(side_effect=launch)
+    orchestrator = _build_orchestrator(temp_repo, tmp_path, _chain_workflow(1), runner)
+
+    with patch.object(RunStatePersister, "save", autospec=True) as save:
+        orchestrator.run()
+
+    # One save for the launch tick, one for the completion tick and the
+    # final flush; the four idle ticks in between write nothing.
+    assert polls["count"] == 5
+    assert save.call_count == 3
+
+
+def test_empty_report_is_not_read_while_agent_runs(temp_repo: Path, tmp_path: Path) -> None:
+    def launch(step, **kwargs):
+        kwargs["report_path"].parent.mkdir(parents=True, exist_ok=True)
+        kwargs["report_path"].write_bytes(b"")
+        handle = Mock()
+        handle.process.poll = Mock(return_value=None)
+        handle.report_path = kwargs["report_path"]
+        return handle
+
+    runner = Mock(spec=StepRunner)
+    runner.launch = Mock(side_effect=launch)
+    reader = Mock(spec=RunReportReader)
+    orchestrator = _build_orchestrator(temp_repo, tmp_path, _chain_workflow(1), runner)
+    orchestrator._report_reader = reader
+
+    orchestrator._launch_ready_steps()
+    assert orchestrator._collect_reports() is False
+
+    reader.read.assert_not_called()
+    assert orchestrator._state.steps["step_0"].status == StepStatus.RUNNING
+
+
+def test_downstream_closure_follows_reverse_dependencies(temp_repo: Path, tmp_path: Path) -> None:
+    def step(step_id: str, *needs: str) -> Step:
+        return Step(id=step_id, agent="coder", prompt="prompts/step.md", needs=list(needs))
+
+    workflow = Workflow(
+        name="diamond",
+        description="",
+        steps={
+            s.id: s
+            for s in (
+                step("plan"),
+                step("code", "plan"),
+                step("docs", "plan"),
+                step("review", "code", "docs"),
+                step("unrelated"),
+            )
+        },
+    )
+    orchestrator = _build_orchestrator(temp_repo, tmp_path, workflow, _completing_runner([]))
+
+    assert orchestrator._downstream_closure("plan") == {"plan", "code", "docs", "review"}
+    assert orchestrator._downstream_closure("docs") == {"docs", "review"}
+    assert orchestrator._downstream_closure("unrelated") == {"unrelated"}
+
+
+def test_loop_iterations_receive_encoded_items(temp_repo: Path, tmp_path: Path) -> None:
+    envs: List[dict] = []
+    runner = _completing_runner([])
+    launch = runner.launch.side_effect
+
+    def record(step, **kwargs):
+        envs.append(dict(kwargs["extra_env"]))
+        return launch(step, **kwargs)
+
+    runner.launch.side_effect = record
+    step = Step(
+        id="each",
+        agent="coder",
+        prompt="prompts/step.md",
+        loop=LoopConfig(items=[{"path": "a.py"}, "b"], item_var="file", index_var="i"),
+    )
+    workflow = Workflow(name="loop", description="", steps={"each": step})
+    orchestrator = _build_orchestrator(temp_repo, tmp_path, workflow, runner)
+
+    orchestrator.run()
+
+    assert envs == [
+        {"LOOP_I": "0", "LOOP_FILE": '{"path": "a.py"}'},
+        {"LOOP_I": "1", "LOOP_FILE": '"b"'},
+    ]
+    assert orchestrator.run_succeeded
+
+
+def test_failed_state_save_keeps_previous_file(tmp_path: Path) -> None:
+    state_path = tmp_path / "run_state.json"
+    persister = RunStatePersister(state_path)
+    good = Mock()
+    good.to_dict.return_value = {"run_id": "abc", "steps": {}}
+    persister.save(good)
+
+    bad = Mock()
+    bad.to_dict.return_value = {"run_id": "abc", "steps": {"a": object()}}
+    with pytest.raises(TypeError):
+        persister.save(bad)
+
+    assert json.loads(state_path.read_text(encoding="utf-8")) == {"run_id": "abc", "steps": {}}
+    assert list(tmp_path.iterdir()) == [state_path]
+
+
+def test_identical_state_saves_skip_the_write(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    state_path = tmp_path / "run_state.json"
+    persister = RunStatePersister(state_path)
+    state = RunState(
+        run_id="abc",
+        workflow_name="chain",
+        repo_dir=tmp_path,
+        reports_dir=tmp_path / "reports",
+        manual_inputs_dir=tmp_path / "manual",
+        steps={"plan": StepRuntime()},
+    )
+    stamps = iter(["2025-01-01T00:00:00.000000Z", "2025-01-01T00:00:01.000000Z"] * 2)
+    monkeypatch.setattr(models, "utc_now_fast", lambda: next(stamps))
+
+    persister.save(state)
+    state_path.write_text("sentinel", encoding="utf-8")
+    persister.save(state)
+    assert state_path.read_text(encoding="utf-8") == "sentinel"
+
+    state.steps["plan"].status = StepStatus.RUNNING
+    persister.save(state)
+    saved = json.loads(state_path.read_text(encoding="utf-8"))
+    assert saved["steps"]["plan"]["status"] == "RUNNING"
+    assert saved["updated_at"] == "2025-01-01T00:00:00.000000Z"
+
+    persister.set_path(state_path)
+    persister.save(state)
+    assert json.loads(state_path.read_text(encoding="utf-8"))["updated_at"] == (
+        "2025-01-01T00:00:01.000000Z"
+    )
+
+
+def test_state_save_recreates_removed_directory(tmp_path: Path) -> None:
+    state_path = tmp_path / "run" / "run_state.json"
+    persister = RunStatePersister(state_path)
+    state_path.parent.rmdir()
+    state = Mock()
+    state.to_dict.return_value = {"run_id": "abc", "steps": {}}
+
+    persister.save(state)
+
+    assert json.loads(state_path.read_text(encoding="utf-8"))["run_id"] == "abc"
+
+
+def test_state_save_completes_short_writes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    state_path = tmp_path / "run_state.json"
+    persister = RunStatePersister(state_path)
+    state = Mock()
+    state.to_dict.return_value = {"run_id": "abc", "steps": {"plan": {"status": "COMPLETED"}}}
+    real_write = os.write
+    monkeypatch.setattr(os, "write", lambda fd, data: real_write(fd, data[:7]))
+
+    persister.save(state)
+
+    assert json.loads(state_path.read_text(encoding="utf-8")) == state.to_dict.return_value
@@ -1,7 +1,10 @@
 """Tests for the polling service module."""
 
+import asyncio
 import json
+import os
 import subprocess
+import time
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -12,14 +15,17 @@ from agent_orchestrator.polling import (
     FilterConfig,
     GitHubIssuePollSource,
     OnMatchConfig,
+    PollCache,
     PollConfig,
     PollConfigError,
+    PollSource,
     PollSourceConfig,
     TriggerEvent,
     TriggerExecutor,
     get_poll_source,
     load_poll_config,
 )
+from agent_orchestrator.polling.sources import github_api, github_issues
 
 
 class TestPollConfig:
@@ -141,6 +147,12 @@ class TestPollSourceRegistry:
 class TestGitHubIssuePollSource:
     """Tests for GitHub issue polling."""
 
+    @pytest.fixture(autouse=True)
+    def _no_api_token(self, monkeypatch) -> None:
+        """Keep the gh CLI path deterministic regardless of the host env."""
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        monkeypatch.delenv("GH_TOKEN", raising=False)
+
     def test_poll_returns_matching_issues(self) -> None:
         """Test that poll returns issues matching the filter criteria."""
         source = GitHubIssuePollSource()
@@ -231,6 +243,74 @@ class TestGitHubIssuePollSource:
 
         assert len(events) == 0
 
+    def test_poll_parses_gh_output_bytes(self) -> None:
+        """Test that gh output is parsed as raw bytes, including non-ASCII titles."""
+        source = GitHubIssuePollSource()
+        config = PollSourceConfig(
+            type="github_issues",
+            repo="owner/repo",
+            filter=FilterConfig(labels=["ready-for-agent"]),
+            processed_label="agent-processing",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+        gh_output = json.dumps([
+            {
+                "number": 5,
+                "title": "Fix caf\u00e9 rendering",
+                "url": "https://github.com/owner/repo/issues/5",
+                "labels": [{"name": "ready-for-agent"}],
+            }
+        ], ensure_ascii=False).encode("utf-8")
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(stdout=gh_output, returncode=0)
+            events = source.poll(config)
+
+        assert "text" not in mock_run.call_args[1]
+        assert events[0].metadata["title"] == "Fix caf\u00e9 rendering"
+
+    def test_poll_gh_reuses_listing_when_fingerprint_unchanged(self) -> None:
+        """Test that an unchanged updatedAt probe skips the full gh listing."""
+        source = GitHubIssuePollSource()
+        config = PollSourceConfig(
+            type="github_issues",
+            repo="owner/repo",
+            filter=FilterConfig(labels=["ready-for-agent"]),
+            processed_label="agent-processing",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+        issue = {
+            "number": 42,
+            "title": "Test issue",
+            "url": "https://github.com/owner/repo/issues/42",
+            "labels": [{"name": "ready-for-agent"}],
+            "updatedAt": "2025-01-01T00:00:00Z",
+        }
+        full = MagicMock(stdout=json.dumps([issue]).encode(), returncode=0)
+        probe = MagicMock(
+            stdout=json.dumps([{"number": 42, "updatedAt": issue["updatedAt"]}]).encode(),
+            returncode=0,
+        )
+        changed = MagicMock(
+            stdout=json.dumps([{"number": 42, "updatedAt": "2025-01-02T00:00:00Z"}]).encode(),
+            returncode=0,
+        )
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.side_effect = [full, probe, changed, full]
+            first = source.poll(config)
+            second = source.poll(config)
+            third = source.poll(config)
+
+        fields = [call[0][0][call[0][0].index("--json") + 1] for call in mock_run.call_args_list]
+        assert fields == [
+            "number,title,url,labels,id,updatedAt",
+            "number,updatedAt",
+            "number,updatedAt",
+            "number,title,url,labels,id,updatedAt",
+        ]
+        assert [e.item_id for e in first] == [e.item_id for e in second] == [e.item_id for e in third] == ["42"]
+
     def test_poll_uses_env_repo(self) -> None:
         """Test that poll uses GITHUB_REPOSITORY env var when repo not specified."""
         source = GitHubIssuePollSource()
@@ -299,6 +379,447 @@ class TestGitHubIssuePollSource:
         assert "agent-processing" in call_args
 
 
+    def test_mark_processed_batch_uses_single_mutation(self) -> None:
+        """Test that batch marking resolves the label once and sends one mutation."""
+        client = MagicMock()
+        client.request.side_effect = [
+            (200, {}, json.dumps({"data": {"repository": {"label": {"id": "LA_1"}}}}).encode()),
+            (200, {}, json.dumps({"data": {"m0": {}, "m1": {}}}).encode()),
+            (200, {}, json.dumps({"data": {"m0": {}}}).encode()),
+        ]
+        source = GitHubIssuePollSource(client=client)
+        config = PollSourceConfig(
+            type="github_issues",
+            repo="owner/repo",
+            filter=FilterConfig(),
+            processed_label="agent-processing",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+        events = [
+            TriggerEvent(
+                source_type="github_issues",
+                item_id=str(number),
+                item_url=f"https://github.com/owner/repo/issues/{number}",
+                metadata={"repo": "owner/repo", "node_id": f"I_{number}"},
+            )
+            for number in (1, 2)
+        ]
+
+        with patch("subprocess.run") as mock_run:
+            source.mark_processed_batch(events, config)
+            source.mark_processed_batch(events[:1], config)
+
+        mock_run.assert_not_called()
+        assert client.request.call_count == 3
+        mutation = client.request.call_args_list[1][1]["body"]["query"]
+        assert mutation.count("addLabelsToLabelable") == 2
+        assert '"I_1"' in mutation and '"I_2"' in mutation and '"LA_1"' in mutation
+
+    def test_mark_processed_batch_falls_back_per_event(self) -> None:
+        """Test that events without node ids are marked one by one via gh."""
+        source = GitHubIssuePollSource()
+        config = PollSourceConfig(
+            type="github_issues",
+            repo="owner/repo",
+            filter=FilterConfig(),
+            processed_label="agent-processing",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+        events = [
+            TriggerEvent(
+                source_type="github_issues",
+                item_id=str(number),
+                item_url=f"https://github.com/owner/repo/issues/{number}",
+                metadata={"repo": "owner/repo"},
+            )
+            for number in (1, 2)
+        ]
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+            source.mark_processed_batch(events, config)
+
+        commands = [call[0][0] for call in mock_run.call_args_list]
+        assert sorted(cmd[3] for cmd in commands) == ["1", "2"]
+        assert all(cmd[:3] == ["gh", "issue", "edit"] for cmd in commands)
+
+    def test_mark_processed_retries_when_rate_limited(self) -> None:
+        """Test that rate-limited label edits back off and retry."""
+        source = GitHubIssuePollSource()
+        config = PollSourceConfig(
+            type="github_issues",
+            repo="owner/repo",
+            filter=FilterConfig(),
+            processed_label="agent-processing",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+        event = TriggerEvent(
+            source_type="github_issues",
+            item_id="42",
+            item_url="https://github.com/owner/repo/issues/42",
+            metadata={"repo": "owner/repo"},
+        )
+        limited = subprocess.CalledProcessError(
+            1, ["gh"], stderr="HTTP 403: API rate limit exceeded"
+        )
+
+        with patch("subprocess.run") as mock_run, patch("time.sleep") as mock_sleep:
+            mock_run.side_effect = [limited, limited, MagicMock(returncode=0)]
+            source.mark_processed(event, config)
+
+        assert mock_run.call_count == 3
+        assert [call[0][0] for call in mock_sleep.call_args_list] == [1.0, 2.0]
+
+    def test_mark_processed_does_not_retry_other_errors(self) -> None:
+        """Test that ordinary gh failures are not retried."""
+        source = GitHubIssuePollSource()
+        config = PollSourceConfig(
+            type="github_issues",
+            repo="owner/repo",
+            filter=FilterConfig(),
+            processed_label="agent-processing",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+        event = TriggerEvent(
+            source_type="github_issues",
+            item_id="42",
+            item_url="https://github.com/owner/repo/issues/42",
+            metadata={"repo": "owner/repo"},
+        )
+
+        with patch("subprocess.run") as mock_run, patch("time.sleep") as mock_sleep:
+            mock_run.side_effect = subprocess.CalledProcessError(1, ["gh"], stderr="not found")
+            source.mark_processed(event, config)
+
+        assert mock_run.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_poll_uses_rest_api_with_token(self) -> None:
+        """Test that poll lists issues over the REST API when a client is set."""
+        client = MagicMock()
+        client.request.return_value = (200, {}, json.dumps([
+            {
+                "number": 7,
+                "title": "API issue",
+                "html_url": "https://github.com/owner/repo/issues/7",
+                "labels": [{"name": "ready-for-agent", "color": "fff"}],
+            },
+            {
+                "number": 8,
+                "title": "A pull request",
+                "html_url": "https://github.com/owner/repo/pull/8",
+                "labels": [{"name": "ready-for-agent"}],
+                "pull_request": {},
+            },
+        ]).encode())
+        source = GitHubIssuePollSource(client=client)
+        config = PollSourceConfig(
+            type="github_issues",
+            repo="owner/repo",
+            filter=FilterConfig(labels=["ready-for-agent", "bug"]),
+            processed_label="agent-processing",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+
+        with patch("subprocess.run") as mock_run:
+            events = source.poll(config)
+
+        mock_run.assert_not_called()
+        method, path = client.request.call_args[0][:2]
+        assert method == "GET"
+        assert path.startswith("/repos/owner/repo/issues?")
+        assert "labels=ready-for-agent%2Cbug" in path
+        assert [event.item_id for event in events] == ["7"]
+        assert events[0].item_url == "https://github.com/owner/repo/issues/7"
+        assert events[0].metadata["labels"] == ["ready-for-agent"]
+
+    def test_poll_rest_api_error_returns_empty(self) -> None:
+        """Test that a non-200 API response yields no events."""
+        client = MagicMock()
+        client.request.return_value = (403, {}, b'{"message": "rate limited"}')
+        source = GitHubIssuePollSource(client=client)
+        config = PollSourceConfig(
+            type="github_issues",
+            repo="owner/repo",
+            filter=FilterConfig(),
+            processed_label="agent-processing",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+
+        assert source.poll(config) == []
+
+    def test_poll_rest_api_reuses_cached_list(self, monkeypatch) -> None:
+        """Test the TTL floor, If-None-Match revalidation and invalidation."""
+        issue = {
+            "number": 7,
+            "title": "API issue",
+            "html_url": "https://github.com/owner/repo/issues/7",
+            "labels": [{"name": "ready-for-agent"}],
+        }
+        client = MagicMock()
+        client.request.return_value = (200, {"etag": 'W/"abc"'}, json.dumps([issue]).encode())
+        source = GitHubIssuePollSource(client=client)
+        config = PollSourceConfig(
+            type="github_issues",
+            repo="owner/repo",
+            filter=FilterConfig(labels=["ready-for-agent"]),
+            processed_label="agent-processing",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+
+        assert len(source.poll(config)) == 1
+        # Within the TTL floor no request is made at all.
+        assert len(source.poll(config)) == 1
+        assert client.request.call_count == 1
+
+        monkeypatch.setattr(github_issues, "ISSUE_LIST_TTL", 0.0)
+        client.request.return_value = (304, {}, b"")
+        assert [event.item_id for event in source.poll(config)] == ["7"]
+        assert client.request.call_args[1]["headers"] == {"If-None-Match": 'W/"abc"'}
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+            source.mark_processed(source.poll(config)[0], config)
+        client.request.return_value = (200, {}, b"[]")
+        assert source.poll(config) == []
+        assert client.request.call_args[1]["headers"] is None
+
+    def test_poll_cache_survives_new_source(self, tmp_path: Path, monkeypatch) -> None:
+        """Test that a fresh source revalidates against the persisted ETag."""
+        monkeypatch.setattr(github_issues, "ISSUE_LIST_TTL", 0.0)
+        issue = {
+            "number": 7,
+            "title": "API issue",
+            "html_url": "https://github.com/owner/repo/issues/7",
+            "labels": [{"name": "ready-for-agent"}],
+        }
+        config = PollSourceConfig(
+            type="github_issues",
+            repo="owner/repo",
+            filter=FilterConfig(labels=["ready-for-agent"]),
+            processed_label="agent-processing",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+        db_path = tmp_path / ".agents" / "poll_cache.db"
+
+        first = MagicMock()
+        first.request.return_value = (200, {"etag": '"v1"'}, json.dumps([issue]).encode())
+        GitHubIssuePollSource(token="t", client=first, cache=PollCache(db_path)).poll(config)
+
+        second = MagicMock()
+        second.request.return_value = (304, {}, b"")
+        source = GitHubIssuePollSource(token="t", client=second, cache=PollCache(db_path))
+        events = source.poll(config)
+
+        assert [event.item_id for event in events] == ["7"]
+        assert second.request.call_args[1]["headers"] == {"If-None-Match": '"v1"'}
+
+        # Another token does not see the entry; marking drops it for this one.
+        other = GitHubIssuePollSource(token="other", client=MagicMock(), cache=PollCache(db_path))
+        assert other._cached_issues(other._issue_list_key("owner/repo", config)) is None
+        with patch("subprocess.run"):
+            source.mark_processed(events[0], config)
+        assert PollCache(db_path).get(source._issue_list_key("owner/repo", config)) is None
+
+    def test_poll_rest_api_follows_next_links(self) -> None:
+        """Test that every page of a large listing is fetched."""
+        def page(first: int) -> bytes:
+            return json.dumps([
+                {
+                    "number": number,
+                    "title": f"Issue {number}",
+                    "html_url": f"https://github.com/owner/repo/issues/{number}",
+                    "labels": [],
+                }
+                for number in range(first, first + 100)
+            ]).encode()
+
+        page_two = "https://api.github.com/repositories/1/issues?state=open&per_page=100&page=2"
+        next_link = f'<{page_two}>; rel="next", <{page_two}>; rel="last"'
+        client = MagicMock()
+        client.request.side_effect = [
+            (200, {"etag": '"p1"', "link": next_link}, page(1)),
+            (200, {"etag": '"p2"'}, page(101)),
+        ]
+        source = GitHubIssuePollSource(client=client)
+        config = PollSourceConfig(
+            type="github_issues",
+            repo="owner/repo",
+            filter=FilterConfig(),
+            processed_label="agent-processing",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+
+        events = source.poll(config)
+
+        assert len(events) == 200
+        assert client.request.call_args_list[1][0][1] == (
+            "/repositories/1/issues?state=open&per_page=100&page=2"
+        )
+        # A multi-page listing is not revalidated with the first page's ETag.
+        assert source._cached_issues(source._issue_list_key("owner/repo", config))[0] is None
+
+    def test_poll_rest_api_stops_at_listing_limit(self, monkeypatch) -> None:
+        """Test that pagination stops once MAX_LISTED_ISSUES are listed."""
+        monkeypatch.setattr(github_issues, "MAX_LISTED_ISSUES", 1)
+        issues = [
+            {"number": n, "title": "t", "html_url": f"u{n}", "labels": []} for n in (1, 2)
+        ]
+        client = MagicMock()
+        client.request.return_value = (
+            200,
+            {"link": '<https://api.github.com/repos/owner/repo/issues?page=2>; rel="next"'},
+            json.dumps(issues).encode(),
+        )
+        source = GitHubIssuePollSource(client=client)
+        config = PollSourceConfig(
+            type="github_issues",
+            repo="owner/repo",
+            filter=FilterConfig(),
+            processed_label="agent-processing",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+
+        assert [event.item_id for event in source.poll(config)] == ["1"]
+        assert client.request.call_count == 1
+
+    def test_poll_cache_disabled_when_db_cannot_be_opened(self, tmp_path: Path) -> None:
+        """Test that an unusable cache path falls back to no caching."""
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("", encoding="utf-8")
+        cache = PollCache(blocker / "poll_cache.db")
+
+        cache.put("key", '"v1"', b"[]", time.time())
+        cache.delete_prefix("key")
+
+        assert cache.get("key") is None
+
+    def test_token_from_env_enables_rest_api(self, tmp_path: Path, monkeypatch) -> None:
+        """Test that GITHUB_TOKEN switches the source to the REST API."""
+        monkeypatch.setenv("GITHUB_TOKEN", "secret")
+        monkeypatch.delenv("GH_HOST", raising=False)
+        monkeypatch.setenv("GH_CONFIG_DIR", str(tmp_path))
+
+        assert GitHubIssuePollSource()._client is not None
+
+    def test_token_with_enterprise_gh_host_uses_gh_cli(self, tmp_path: Path, monkeypatch) -> None:
+        """Test that a token does not move GHES users onto api.github.com."""
+        monkeypatch.setenv("GITHUB_TOKEN", "secret")
+        monkeypatch.setenv("GH_HOST", "github.example.com")
+
+        assert GitHubIssuePollSource()._client is None
+
+        monkeypatch.delenv("GH_HOST")
+        monkeypatch.setenv("GH_CONFIG_DIR", str(tmp_path))
+        (tmp_path / "hosts.yml").write_text(
+            "github.example.com:\n    user: someone\n", encoding="utf-8"
+        )
+
+        assert GitHubIssuePollSource()._client is None
+
+
+class FakeConnection:
+    """HTTPSConnection stand-in that fails each request with a queued error."""
+
+    def __init__(self, errors: list, sent: list) -> None:
+        self._errors = errors
+        self._sent = sent
+
+    def request(self, method, path, body=None, headers=None) -> None:
+        self._sent.append(method)
+
+    def getresponse(self):
+        error = self._errors.pop(0)
+        if error is not None:
+            raise error
+        return MagicMock(status=200, will_close=False, read=lambda: b"{}", getheaders=lambda: [])
+
+    def close(self) -> None:
+        pass
+
+
+class TestGitHubApiClient:
+    """Tests for the keep-alive GitHub API client."""
+
+    def _client(self, monkeypatch, errors: list, sent: list):
+        monkeypatch.setattr(
+            github_api.http.client, "HTTPSConnection", lambda *a, **k: FakeConnection(errors, sent)
+        )
+        return github_api.GitHubApiClient("token")
+
+    def test_retries_once_when_idle_connection_was_dropped(self, monkeypatch) -> None:
+        """Test that a stale keep-alive connection is replaced transparently."""
+        sent: list = []
+        dropped = github_api.http.client.RemoteDisconnected()
+        client = self._client(monkeypatch, [None, dropped, None], sent)
+
+        client.request("GET", "/first")
+        status, _, _ = client.request("POST", "/graphql", body={"query": "q"})
+
+        assert status == 200
+        assert sent == ["GET", "POST", "POST"]
+
+    def test_does_not_resend_after_timeout(self, monkeypatch) -> None:
+        """Test that a request that may have reached the server is not repeated."""
+        sent: list = []
+        client = self._client(monkeypatch, [None, TimeoutError("timed out")], sent)
+
+        client.request("GET", "/first")
+        with pytest.raises(github_api.GitHubApiError):
+            client.request("POST", "/graphql", body={"query": "q"})
+
+        assert sent == ["GET", "POST"]
+
+    def test_fresh_connection_errors_are_not_retried(self, monkeypatch) -> None:
+        """Test that only reused connections are retried."""
+        sent: list = []
+        client = self._client(monkeypatch, [ConnectionResetError()], sent)
+
+        with pytest.raises(github_api.GitHubApiError):
+            client.request("GET", "/first")
+
+        assert sent == ["GET"]
+
+
+class SleepySource(PollSource):
+    """Poll source whose poll blocks for a fixed time."""
+
+    def __init__(self, item_id: str, delay: float) -> None:
+        self.item_id = item_id
+        self.delay = delay
+
+    def poll(self, config: PollSourceConfig) -> list:
+        time.sleep(self.delay)
+        return [TriggerEvent(source_type="test", item_id=self.item_id, item_url="", metadata={})]
+
+    def mark_processed(self, event: TriggerEvent, config: PollSourceConfig) -> None:
+        pass
+
+
+class TestConcurrentPolling:
+    """Tests for polling several sources at once."""
+
+    def test_poll_async_runs_sources_concurrently(self) -> None:
+        """Test that gathered sources overlap and keep their order."""
+        from agent_orchestrator.cli import _poll_sources
+
+        config = PollSourceConfig(
+            type="test",
+            repo=None,
+            filter=FilterConfig(),
+            processed_label="done",
+            on_match=OnMatchConfig(script="./trigger.sh"),
+        )
+        sources = [(SleepySource(str(index), 0.2), config) for index in range(3)]
+
+        started = time.monotonic()
+        results = asyncio.run(_poll_sources(sources))
+        elapsed = time.monotonic() - started
+
+        assert [events[0].item_id for events in results] == ["0", "1", "2"]
+        assert elapsed < 0.5
+
+
 class TestTriggerExecutor:
     """Tests for trigger script execution."""
 
@@ -351,6 +872,28 @@ echo "CUSTOM=$CUSTOM_VAR"
         assert env["POLL_SOURCE_TYPE"] == "github_issues"
         assert env["CUSTOM_VAR"] == "custom_value"
 
+    def test_execute_uses_environment_snapshot(self, tmp_path: Path) -> None:
+        """Test that the parent environment is captured once per executor."""
+        script = tmp_path / "trigger.sh"
+        script.write_text("#!/bin/bash\n")
+        event = TriggerEvent(source_type="jira", item_id="7", item_url="https://example.com")
+        config = OnMatchConfig(script=str(script), env={"POLL_ITEM_ID": "override"})
+
+        with patch.dict(os.environ, {"SNAPSHOT_VAR": "before"}):
+            executor = TriggerExecutor(workdir=tmp_path)
+            os.environ["SNAPSHOT_VAR"] = "after"
+            with patch("subprocess.run") as mock_run:
+                mock_run.return_value = MagicMock(returncode=0)
+                executor.execute(event, config)
+                first_env = mock_run.call_args[1]["env"]
+                TriggerExecutor(workdir=tmp_path).execute(event, config)
+                second_env = mock_run.call_args[1]["env"]
+
+        assert first_env["SNAPSHOT_VAR"] == "before"
+        assert second_env["SNAPSHOT_VAR"] == "after"
+        assert first_env["POLL_ITEM_ID"] == "override"
+        assert "ISSUE_NUMBER" not in first_env
+
     def test_execute_returns_exit_code(self, tmp_path: Path) -> None:
         """Test that execute returns the script's exit code."""
         script = tmp_path / "fail.sh"
@@ -141,6 +141,24 @@ class PromptResolutionTests(unittest.TestCase):
 
         self.assertIn("Prompt file not found", str(ctx.exception))
 
+    def test_cached_prompt_path_resolves_once(self) -> None:
+        orchestrator = Orchestrator(
+            workflow=self.workflow,
+            workflow_root=self.workflow_root,
+            repo_dir=self.repo_dir,
+            report_reader=RunReportReader(),
+            state_persister=RunStatePersister(self.state_file),
+            runner=self.runner,
+            logger=logging.getLogger(__name__),
+        )
+
+        first = orchestrator._cached_prompt_path("test_prompt.md")
+        self.default_prompt.unlink()
+        second = orchestrator._cached_prompt_path("test_prompt.md")
+
+        self.assertEqual(first, self.default_prompt.resolve())
+        self.assertIs(first, second)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,7 @@ import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
+from agent_orchestrator import reporting
 from agent_orchestrator.reporting import RunReportError, RunReportReader
 
 
@@ -46,6 +47,24 @@ class RunReportReaderTests(unittest.TestCase):
         self.assertEqual(self.payload["run_id"], report.run_id)
         self.assertEqual(self.payload["artifacts"], report.artifacts)
 
+    def test_retry_does_not_wait_full_delay_once_file_changes(self) -> None:
+        self.report_path.write_text("{\n  \"schema\":", encoding="utf-8")
+        reader = RunReportReader(retry_attempts=2, retry_delay=5.0)
+
+        def complete_write() -> None:
+            time.sleep(0.05)
+            self.report_path.write_text(json.dumps(self.payload), encoding="utf-8")
+
+        finisher = threading.Thread(target=complete_write)
+        started = time.monotonic()
+        finisher.start()
+        report = reader.read(self.report_path)
+        elapsed = time.monotonic() - started
+        finisher.join()
+
+        self.assertEqual(self.payload["run_id"], report.run_id)
+        self.assertLess(elapsed, 2.0)
+
     def test_raises_error_when_json_stays_invalid(self) -> None:
         self.report_path.write_text("{\n  \"schema\":", encoding="utf-8")
         reader = RunReportReader(retry_attempts=2, retry_delay=0.01)
@@ -55,6 +74,54 @@ class RunReportReaderTests(unittest.TestCase):
 
         self.assertIn("invalid JSON", str(ctx.exception))
 
+    def test_missing_fields_listed_in_schema_order(self) -> None:
+        del self.payload["ended_at"]
+        del self.payload["run_id"]
+        self.report_path.write_text(json.dumps(self.payload), encoding="utf-8")
+
+        with self.assertRaises(RunReportError) as ctx:
+            RunReportReader().read(self.report_path)
+
+        self.assertIn("missing fields: run_id, ended_at", str(ctx.exception))
+
+    def test_fields_are_coerced_and_defaulted(self) -> None:
+        payload = {key: self.payload[key] for key in
+                   ("schema", "step_id", "agent", "started_at", "ended_at")}
+        payload.update({"run_id": 42, "status": "success", "artifacts": ["a.txt"], "gate_failure": 1})
+        self.report_path.write_text(json.dumps(payload), encoding="utf-8")
+
+        report = RunReportReader().read(self.report_path)
+
+        self.assertEqual("42", report.run_id)
+        self.assertEqual("COMPLETED", report.status)
+        self.assertEqual(["a.txt"], report.artifacts)
+        self.assertIs(True, report.gate_failure)
+        self.assertEqual({}, report.metrics)
+        self.assertEqual([], report.logs)
+        self.assertEqual([], report.next_suggested_steps)
+        self.assertEqual(42, report.raw["run_id"])
+
+    def test_missing_schema_file_is_reported(self) -> None:
+        if reporting.Draft202012Validator is None:
+            self.skipTest("jsonschema is not installed")
+        missing = Path(self._tmp.name) / "missing.schema.json"
+
+        with self.assertRaises(RunReportError) as ctx:
+            RunReportReader(schema_path=missing)
+
+        self.assertIn("schema not found", str(ctx.exception))
+
+    def test_validators_are_shared_per_schema_file(self) -> None:
+        if reporting.Draft202012Validator is None:
+            self.skipTest("jsonschema is not installed")
+        schema_path = Path(self._tmp.name) / "report.schema.json"
+        schema_path.write_text(json.dumps({"type": "object"}), encoding="utf-8")
+
+        first = RunReportReader(schema_path=schema_path)
+        second = RunReportReader(schema_path=schema_path)
+
+        self.assertIs(first._validator, second._validator)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,289 @@
+"""Tests for the run archive database and metadata extraction."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import fields
+from pathlib import Path
+from unittest.mock import patch
+
+from agent_orchestrator import run_archive
+from agent_orchestrator.run_archive import ArchivedRun, RunArchive, extract_run_metadata
+from agent_orchestrator.run_cleanup import cleanup_old_runs
+
+
+def _write_daily_stats(stats_dir: Path, day: str, runs: dict) -> Path:
+    stats_dir.mkdir(parents=True, exist_ok=True)
+    path = stats_dir / f"{day}.json"
+    path.write_text(json.dumps({"date": day, "runs": runs}), encoding="utf-8")
+    return path
+
+
+class TestExtractRunMetadata:
+    """Tests for extract_run_metadata."""
+
+    def test_cost_comes_from_newest_daily_stats(self, tmp_path):
+        stats_dir = tmp_path / "daily_stats"
+        _write_daily_stats(stats_dir, "2025-01-01", {"run-a": {"total_cost_usd": 1.0}})
+        _write_daily_stats(
+            stats_dir,
+            "2025-01-02",
+            {"run-a": {"total_cost_usd": 2.5, "steps_completed": 3}},
+        )
+        run_dir = tmp_path / "runs" / "run-a"
+        run_dir.mkdir(parents=True)
+
+        metadata = extract_run_metadata(run_dir, stats_dir)
+
+        assert metadata["total_cost_usd"] == 2.5
+        assert metadata["steps_completed"] == 3
+
+    def test_daily_stats_are_parsed_once_for_many_runs(self, tmp_path):
+        stats_dir = tmp_path / "daily_stats"
+        _write_daily_stats(
+            stats_dir,
+            "2025-01-01",
+            {f"run-{index}": {"total_cost_usd": float(index)} for index in range(5)},
+        )
+        _write_daily_stats(stats_dir, "2025-01-02", {})
+        run_archive._load_stats_index.cache_clear()
+
+        with patch.object(
+            run_archive.json_utils, "load_path", wraps=run_archive.json_utils.load_path
+        ) as load_path:
+            costs = []
+            for index in range(5):
+                run_dir = tmp_path / "runs" / f"run-{index}"
+                run_dir.mkdir(parents=True)
+                costs.append(extract_run_metadata(run_dir, stats_dir)["total_cost_usd"])
+
+        assert costs == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert load_path.call_count == 2
+
+    def test_stats_index_refreshes_when_file_changes(self, tmp_path):
+        stats_dir = tmp_path / "daily_stats"
+        path = _write_daily_stats(stats_dir, "2025-01-01", {})
+        run_dir = tmp_path / "runs" / "run-a"
+        run_dir.mkdir(parents=True)
+        assert extract_run_metadata(run_dir, stats_dir)["total_cost_usd"] == 0
+
+        _write_daily_stats(stats_dir, "2025-01-01", {"run-a": {"total_cost_usd": 0.75}})
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert extract_run_metadata(run_dir, stats_dir)["total_cost_usd"] == 0.75
+
+
+def _record(run_id: str, cost: float = 0.0) -> dict:
+    return {
+        "run_id": run_id,
+        "workflow_name": "wf",
+        "status": "COMPLETED",
+        "created_at": "2025-01-01T00:00:00.000000Z",
+        "total_cost_usd": cost,
+    }
+
+
+class TestRunArchive:
+    """Tests for RunArchive."""
+
+    def test_archive_runs_inserts_batch_and_skips_duplicates(self, tmp_path):
+        archive = RunArchive(tmp_path)
+        assert archive.archive_run(**_record("run-1"))
+
+        inserted = archive.archive_runs([_record("run-1"), _record("run-2", 1.5), _record("run-3")])
+
+        assert inserted == 2
+        assert archive.get_archived_run("run-2").total_cost_usd == 1.5
+        assert archive.get_archived_run("run-3").work_summary == ""
+        assert archive.get_archive_stats()["total_runs"] == 3
+        assert archive.archive_runs([]) == 0
+
+    def test_database_uses_wal_journal(self, tmp_path):
+        RunArchive(tmp_path)
+
+        with sqlite3.connect(tmp_path / ".agents" / "run_archive.db") as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_cleanup_archives_expired_runs_in_one_batch(self, tmp_path):
+        runs_dir = tmp_path / ".agents" / "runs"
+        for run_id in ("old-1", "old-2"):
+            run_dir = runs_dir / run_id
+            run_dir.mkdir(parents=True)
+            (run_dir / "run_state.json").write_text(
+                json.dumps(
+                    {
+                        "workflow_name": "wf",
+                        "created_at": "2020-01-01T00:00:00.000000Z",
+                        "steps": {"s": {"status": "COMPLETED"}},
+                    }
+                ),
+                encoding="utf-8",
+            )
+        archive = RunArchive(tmp_path)
+
+        with patch.object(RunArchive, "archive_runs", wraps=archive.archive_runs) as archive_runs:
+            deleted = cleanup_old_runs(runs_dir, max_age_hours=1, archive=archive)
+
+        assert sorted(deleted) == ["old-1", "old-2"]
+        assert archive_runs.call_count == 1
+        assert archive.is_archived("old-1") and archive.is_archived("old-2")
+
+    def test_shared_connection_is_usable_from_other_threads(self, tmp_path):
+        archive = RunArchive(tmp_path)
+        results = []
+
+        def worker(index: int) -> None:
+            archive.archive_run(**_record(f"run-{index}"))
+            results.append(archive.is_archived(f"run-{index}"))
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        archive.close()
+
+        assert results == [True] * 4
+        assert RunArchive(tmp_path).get_archive_stats()["total_runs"] == 4
+
+    def test_migrates_v1_database_to_composite_index(self, tmp_path):
+        db_path = tmp_path / ".agents" / "run_archive.db"
+        db_path.parent.mkdir(parents=True)
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript(
+                """
+                CREATE TABLE schema_version (version INTEGER PRIMARY KEY);
+                INSERT INTO schema_version VALUES (1);
+                CREATE TABLE archived_runs (
+                    run_id TEXT PRIMARY KEY, workflow_name TEXT NOT NULL,
+                    status TEXT NOT NULL, created_at TEXT NOT NULL, ended_at TEXT,
+                    total_cost_usd REAL DEFAULT 0.0, total_input_tokens INTEGER DEFAULT 0,
+                    total_output_tokens INTEGER DEFAULT 0, steps_completed INTEGER DEFAULT 0,
+                    steps_failed INTEGER DEFAULT 0, work_summary TEXT DEFAULT '',
+                    archived_at TEXT NOT NULL
+                );
+                CREATE INDEX idx_archived_runs_workflow ON archived_runs(workflow_name);
+                INSERT INTO archived_runs (run_id, workflow_name, status, created_at,
+                    total_cost_usd, archived_at)
+                VALUES ('old', 'wf', 'COMPLETED', '2024-01-01', 2.0, '2024-01-02');
+                """
+            )
+
+        archive = RunArchive(tmp_path)
+        stats = archive.get_archive_stats()
+        archive.close()
+        assert (stats["total_runs"], stats["completed_runs"], stats["total_cost_usd"]) == (1, 1, 2.0)
+
+        with sqlite3.connect(db_path) as conn:
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            version = conn.execute("SELECT version FROM schema_version").fetchone()[0]
+            plan = " ".join(
+                str(row[-1])
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM archived_runs "
+                    "WHERE workflow_name = ? ORDER BY created_at DESC LIMIT 10",
+                    ("wf",),
+                )
+            )
+        assert version == run_archive.SCHEMA_VERSION
+        assert "idx_archived_runs_wf_created" in indexes
+        assert "idx_archived_runs_workflow" not in indexes
+        assert "idx_archived_runs_wf_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_keyset_pagination_with_before(self, tmp_path):
+        archive = RunArchive(tmp_path)
+        archive.archive_runs(
+            dict(_record(f"run-{day}"), created_at=f"2025-01-0{day}T00:00:00.000000Z")
+            for day in range(1, 6)
+        )
+
+        first_page = archive.get_all_archived_runs(limit=2, workflow_name="wf")
+        second_page = archive.get_all_archived_runs(
+            limit=2, workflow_name="wf", before=first_page[-1].created_at
+        )
+
+        assert [run.run_id for run in first_page] == ["run-5", "run-4"]
+        assert [run.run_id for run in second_page] == ["run-3", "run-2"]
+
+    def test_stats_totals_follow_inserts_and_deletes(self, tmp_path):
+        archive = RunArchive(tmp_path)
+        archive.archive_runs(
+            [
+                dict(_record("run-1", 1.25), total_input_tokens=10, steps_completed=2),
+                dict(_record("run-2", 0.5), status="FAILED", steps_failed=1),
+                _record("run-1", 99.0),  # duplicate, ignored
+            ]
+        )
+
+        stats = archive.get_archive_stats()
+        assert stats["total_runs"] == 2
+        assert stats["completed_runs"] == 1
+        assert stats["failed_runs"] == 1
+        assert stats["total_cost_usd"] == 1.75
+        assert stats["total_input_tokens"] == 10
+        assert stats["total_steps_completed"] == 2
+        assert stats["total_steps_failed"] == 1
+
+        with archive._transaction() as conn:
+            conn.execute("DELETE FROM archived_runs WHERE run_id = 'run-2'")
+        stats = archive.get_archive_stats()
+        assert stats["total_runs"] == 1
+        assert stats["failed_runs"] == 0
+        assert stats["total_cost_usd"] == 1.25
+
+
+class TestExtractRunState:
+    """Tests for run_state.json aggregation in extract_run_metadata."""
+
+    def test_aggregates_steps_and_metrics(self, tmp_path):
+        run_dir = tmp_path / "runs" / "run-a"
+        run_dir.mkdir(parents=True)
+        steps = {
+            "plan": {"status": "COMPLETED", "metrics": {"input_tokens": 100, "cost_usd": 0.5}},
+            "code": {"status": "COMPLETED", "metrics": {"output_tokens": 40, "cost_usd": 0.25}},
+            "test": {"status": "FAILED", "metrics": {}},
+            "docs": {"status": "PENDING"},
+        }
+        (run_dir / "run_state.json").write_text(
+            json.dumps({"workflow_name": "wf", "steps": steps}), encoding="utf-8"
+        )
+
+        metadata = extract_run_metadata(run_dir)
+
+        assert metadata["steps_completed"] == 2
+        assert metadata["steps_failed"] == 1
+        assert metadata["total_input_tokens"] == 100
+        assert metadata["total_output_tokens"] == 40
+        assert metadata["total_cost_usd"] == 0.75
+        assert metadata["status"] == "FAILED"
+        assert metadata["work_summary"] == "Completed: plan, code; Failed: test"
+
+
+def test_archive_columns_match_archived_run_fields():
+    assert run_archive._ARCHIVE_COLUMNS == tuple(field.name for field in fields(ArchivedRun))
+
+
+def test_iter_archived_runs_streams_in_batches(tmp_path):
+    archive = RunArchive(tmp_path)
+    archive.archive_runs(
+        dict(_record(f"run-{index:02d}"), created_at=f"2025-01-01T00:00:{index:02d}.000000Z")
+        for index in range(7)
+    )
+
+    runs = archive.iter_archived_runs(batch_size=3)
+    first = next(runs)
+    # The archive stays usable while a scan is in progress.
+    assert archive.is_archived("run-00")
+    rest = [run.run_id for run in runs]
+
+    assert first.run_id == "run-06"
+    assert rest == [f"run-{index:02d}" for index in range(5, -1, -1)]
+    assert [run.run_id for run in archive.get_all_archived_runs(limit=2, offset=1)] == [
+        "run-05",
+        "run-04",
+    ]
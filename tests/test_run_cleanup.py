@@ -3,10 +3,15 @@
 from __future__ import annotations
 
 import json
+import subprocess
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
+import pytest
+
+from agent_orchestrator import run_cleanup
+from agent_orchestrator.run_archive import RunArchive
 from agent_orchestrator.run_cleanup import (
     DEFAULT_MAX_AGE_HOURS,
     RunInfo,
@@ -79,11 +84,9 @@ class TestParseRunState:
         created = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
         _create_run_state(run_dir, created, {"step1": {"status": "COMPLETED"}})
 
-        created_at, has_failed = parse_run_state(run_dir)
+        created_at, has_failed, is_active = parse_run_state(run_dir)
 
-        assert created_at.year == 2024
-        assert created_at.month == 1
-        assert created_at.day == 15
+        assert created_at == created.timestamp()
         assert has_failed is False
 
     def test_parse_failed_state(self, tmp_path):
@@ -92,9 +95,25 @@ class TestParseRunState:
         created = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
         _create_run_state(run_dir, created, {"step1": {"status": "FAILED"}})
 
-        created_at, has_failed = parse_run_state(run_dir)
+        created_at, has_failed, is_active = parse_run_state(run_dir)
+
+        assert has_failed is True
+        assert is_active is False
+
+    def test_parse_active_state(self, tmp_path):
+        """Test detection of running steps alongside failed ones."""
+        run_dir = tmp_path / "test-run"
+        created = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+        _create_run_state(
+            run_dir,
+            created,
+            {"step1": {"status": "FAILED"}, "step2": {"status": "WAITING_ON_HUMAN"}},
+        )
+
+        created_at, has_failed, is_active = parse_run_state(run_dir)
 
         assert has_failed is True
+        assert is_active is True
 
     def test_parse_missing_state_file(self, tmp_path):
         """Test fallback to directory mtime when state file missing."""
@@ -102,7 +121,7 @@ class TestParseRunState:
         run_dir.mkdir(parents=True)
         # No run_state.json file
 
-        created_at, has_failed = parse_run_state(run_dir)
+        created_at, has_failed, is_active = parse_run_state(run_dir)
 
         # Should use mtime and assume not failed
         assert created_at is not None
@@ -114,7 +133,7 @@ class TestParseRunState:
         run_dir.mkdir(parents=True)
         (run_dir / "run_state.json").write_text("{ invalid json }")
 
-        created_at, has_failed = parse_run_state(run_dir)
+        created_at, has_failed, is_active = parse_run_state(run_dir)
 
         # Should fall back to mtime
         assert created_at is not None
@@ -174,6 +193,44 @@ class TestEnumerateRuns:
         assert len(runs) == 1
         assert runs[0].run_id == "valid-run"
 
+    def test_enumerates_many_runs_in_parallel(self, tmp_path):
+        """Test that the threaded path returns the same runs as the serial one."""
+        runs_dir = tmp_path / ".agents" / "runs"
+        runs_dir.mkdir(parents=True)
+        count = run_cleanup.PARALLEL_STATE_THRESHOLD * 2
+        for i in range(count):
+            _create_run_dir(runs_dir, f"run-{i}", age_hours=i, failed=(i % 2 == 0))
+
+        runs = enumerate_runs(runs_dir)
+
+        assert len(runs) == count
+        failed = {r.run_id for r in runs if r.has_failed_step}
+        assert failed == {f"run-{i}" for i in range(0, count, 2)}
+
+    def test_skips_symlinked_dirs(self, tmp_path):
+        """Test that symlinks to directories are not treated as runs."""
+        runs_dir = tmp_path / ".agents" / "runs"
+        runs_dir.mkdir(parents=True)
+
+        _create_run_dir(runs_dir, "valid-run", age_hours=1)
+        (runs_dir / "linked-run").symlink_to(tmp_path, target_is_directory=True)
+
+        runs = enumerate_runs(runs_dir)
+
+        assert [r.run_id for r in runs] == ["valid-run"]
+
+    def test_missing_state_uses_directory_mtime(self, tmp_path):
+        """Test that runs without state fall back to the directory mtime."""
+        runs_dir = tmp_path / ".agents" / "runs"
+        run_dir = runs_dir / "bare-run"
+        run_dir.mkdir(parents=True)
+
+        runs = enumerate_runs(runs_dir)
+
+        expected = datetime.fromtimestamp(run_dir.stat().st_mtime, tz=timezone.utc)
+        assert runs[0].created_at == expected
+        assert runs[0].is_active is False
+
 
 class TestCleanupOldRuns:
     """Tests for cleanup_old_runs function."""
@@ -240,6 +297,43 @@ class TestCleanupOldRuns:
 
         assert deleted == []
 
+    def test_failed_removal_is_not_reported_as_deleted(self, tmp_path, monkeypatch, caplog):
+        """Test that a non-zero rm exit is logged and the run kept in the results."""
+        runs_dir = tmp_path / ".agents" / "runs"
+        runs_dir.mkdir(parents=True)
+        _create_run_dir(runs_dir, "old-run", age_hours=60)
+
+        def fake_run(cmd, **kwargs):
+            return subprocess.CompletedProcess(cmd, 1, stderr=b"Permission denied")
+
+        monkeypatch.setattr(run_cleanup.os, "name", "posix")
+        monkeypatch.setattr(run_cleanup.subprocess, "run", fake_run)
+
+        deleted = cleanup_old_runs(runs_dir, max_age_hours=DEFAULT_MAX_AGE_HOURS)
+
+        assert deleted == []
+        assert (runs_dir / "old-run").exists()
+        assert "rm exited with code 1: Permission denied" in caplog.text
+
+    def test_windows_removal_errors_propagate(self, tmp_path, monkeypatch):
+        """Test that rmtree errors on Windows reach the caller's error handling."""
+        import shutil
+
+        run_path = tmp_path / "old-run"
+        run_path.mkdir()
+
+        def fake_rmtree(path, *args, **kwargs):
+            raise PermissionError("file in use")
+
+        monkeypatch.setattr(shutil, "rmtree", fake_rmtree)
+        with monkeypatch.context() as patched:
+            # Path objects are created beforehand; os.name only picks the branch.
+            patched.setattr(run_cleanup.os, "name", "nt")
+            with pytest.raises(PermissionError):
+                run_cleanup._fast_rmtree(run_path)
+
+        assert run_path.exists()
+
 
 class TestEnforceRunLimit:
     """Tests for enforce_run_limit function."""
@@ -309,6 +403,67 @@ class TestEnforceRunLimit:
         assert deleted == ["completed1"]
         assert (runs_dir / "active").exists()
 
+    def test_removes_runs_with_one_rm_invocation(self, tmp_path, monkeypatch):
+        """Test that all doomed runs are passed to a single rm call."""
+        runs_dir = tmp_path / ".agents" / "runs"
+        runs_dir.mkdir(parents=True)
+        for i in range(4):
+            _create_run_dir(runs_dir, f"run-{i}", age_hours=10 - i)
+
+        calls = []
+        real_run = subprocess.run
+
+        def recording_run(cmd, **kwargs):
+            calls.append(cmd)
+            return real_run(cmd, **kwargs)
+
+        monkeypatch.setattr(run_cleanup.os, "name", "posix")
+        monkeypatch.setattr(run_cleanup.subprocess, "run", recording_run)
+
+        deleted = enforce_run_limit(runs_dir, max_runs=1)
+
+        assert deleted == ["run-0", "run-1", "run-2"]
+        assert len(calls) == 1
+        assert calls[0][:3] == ["rm", "-rf", "--"]
+        assert len(calls[0]) == 6
+
+    def test_removes_several_batches(self, tmp_path, monkeypatch):
+        """Test that runs split across several rm batches are all removed."""
+        runs_dir = tmp_path / ".agents" / "runs"
+        runs_dir.mkdir(parents=True)
+        for i in range(7):
+            _create_run_dir(runs_dir, f"run-{i}", age_hours=10 - i)
+
+        monkeypatch.setattr(run_cleanup.os, "name", "posix")
+        monkeypatch.setattr(run_cleanup, "_rm_batch_size", lambda: 2)
+
+        deleted = enforce_run_limit(runs_dir, max_runs=1)
+
+        assert deleted == [f"run-{i}" for i in range(6)]
+        assert [p.name for p in runs_dir.iterdir()] == ["run-6"]
+
+    def test_failed_batch_falls_back_to_per_run_removal(self, tmp_path, monkeypatch):
+        """Test that one undeletable run does not block the rest of its batch."""
+        runs_dir = tmp_path / ".agents" / "runs"
+        runs_dir.mkdir(parents=True)
+        for i in range(3):
+            _create_run_dir(runs_dir, f"run-{i}", age_hours=10 - i)
+        stuck = str(runs_dir / "run-1")
+        real_run = subprocess.run
+
+        def flaky_run(cmd, **kwargs):
+            if stuck in cmd:
+                return subprocess.CompletedProcess(cmd, 1, stderr=b"busy")
+            return real_run(cmd, **kwargs)
+
+        monkeypatch.setattr(run_cleanup.os, "name", "posix")
+        monkeypatch.setattr(run_cleanup.subprocess, "run", flaky_run)
+
+        deleted = enforce_run_limit(runs_dir, max_runs=0)
+
+        assert deleted == ["run-0", "run-2"]
+        assert (runs_dir / "run-1").exists()
+
     def test_exactly_at_limit(self, tmp_path):
         """Test behavior when exactly at the limit."""
         runs_dir = tmp_path / ".agents" / "runs"
@@ -376,6 +531,46 @@ class TestCleanupRuns:
         remaining = list(runs_dir.iterdir())
         assert len(remaining) == 10
 
+    def test_archives_every_deleted_run(self, tmp_path):
+        """Test that a large cleanup archives each run it deletes."""
+        runs_dir = tmp_path / ".agents" / "runs"
+        runs_dir.mkdir(parents=True)
+        count = run_cleanup.PARALLEL_STATE_THRESHOLD + 2
+        for i in range(count):
+            _create_run_dir(runs_dir, f"old-{i}", age_hours=100 + i)
+
+        deleted = cleanup_runs(tmp_path, max_age_hours=48, max_runs=50)
+
+        archive = RunArchive(tmp_path)
+        try:
+            archived = {run.run_id for run in archive.iter_archived_runs()}
+        finally:
+            archive.close()
+        assert archived == set(deleted)
+        assert len(deleted) == count
+
+    def test_scans_runs_dir_once(self, tmp_path, monkeypatch):
+        """Test that both phases share a single directory scan."""
+        runs_dir = tmp_path / ".agents" / "runs"
+        runs_dir.mkdir(parents=True)
+        _create_run_dir(runs_dir, "old", age_hours=100)
+        for i in range(3):
+            _create_run_dir(runs_dir, f"recent-{i}", age_hours=i)
+
+        scans = []
+        real_enumerate = run_cleanup.enumerate_runs
+
+        def counting_enumerate(path):
+            scans.append(path)
+            return real_enumerate(path)
+
+        monkeypatch.setattr(run_cleanup, "enumerate_runs", counting_enumerate)
+
+        deleted = cleanup_runs(tmp_path, max_age_hours=48, max_runs=2, enable_archive=False)
+
+        assert deleted == ["old", "recent-2"]
+        assert scans == [runs_dir]
+
 
 class TestRunInfo:
     """Tests for RunInfo dataclass."""
@@ -386,12 +581,13 @@ class TestRunInfo:
         info = RunInfo(
             run_id="test",
             path=Path("/fake"),
-            created_at=one_hour_ago,
+            created_at_ts=one_hour_ago.timestamp(),
             has_failed_step=False,
         )
 
         # Age should be approximately 1 hour
         assert 0.9 < info.age.total_seconds() / 3600 < 1.1
+        assert info.created_at == one_hour_ago
 
 
 class TestCliIntegration:
@@ -4,6 +4,7 @@ import pytest
 
 from agent_orchestrator.run_report_format import (
     PlaceholderContentError,
+    contains_placeholder_logs,
     normalize_run_report_payload,
 )
 
@@ -60,3 +61,9 @@ def test_normalize_run_report_payload_rejects_placeholder_ended_at():
         normalize_run_report_payload(payload)
 
     assert "placeholder ended_at" in str(exc.value)
+
+
+def test_contains_placeholder_logs_matches_case_insensitively():
+    assert contains_placeholder_logs(["  <REPLACE WITH A CONCISE SUMMARY of the run>  "])
+    assert not contains_placeholder_logs(["Summarised the backlog", "   "])
+    assert not contains_placeholder_logs([])
@@ -0,0 +1,306 @@
+"""Tests for command construction and process launching in the step runner."""
+from __future__ import annotations
+
+import os
+import shlex
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from agent_orchestrator.models import Step
+from agent_orchestrator.runner import ExecutionTemplate, StepRunner
+
+
+def test_template_renders_named_fields() -> None:
+    template = ExecutionTemplate("{python} {wrapper} --step-id {step_id} --attempt {attempt}")
+
+    command = template.build(
+        {"python": "/usr/bin/python3", "wrapper": "wrap.py", "step_id": "plan", "attempt": 2}
+    )
+
+    assert command == ["/usr/bin/python3", "wrap.py", "--step-id", "plan", "--attempt", "2"]
+
+
+def test_template_preserves_escaped_braces_and_quoting() -> None:
+    template = ExecutionTemplate("sh -c 'echo {{literal}} {step_id}'")
+
+    assert template.build({"step_id": "review"}) == ["sh", "-c", "echo {literal} review"]
+
+
+def test_template_keeps_substituted_values_as_single_arguments() -> None:
+    template = ExecutionTemplate("{python} {wrapper} --prompt {prompt}")
+
+    command = template.build(
+        {"python": "python3", "wrapper": "/opt/my tools/wrap.py", "prompt": "it's here.md"}
+    )
+
+    assert command == ["python3", "/opt/my tools/wrap.py", "--prompt", "it's here.md"]
+
+
+def test_template_drops_bare_fields_that_render_empty() -> None:
+    template = ExecutionTemplate("run {manual_input} --step {step_id} ''")
+
+    assert template.build({"manual_input": "", "step_id": "qa"}) == ["run", "--step", "qa", ""]
+
+
+def test_template_keeps_quoted_fields_that_render_empty() -> None:
+    template = ExecutionTemplate('run --m "{manual_input}" x \'{manual_input}{attempt}\' {attempt}')
+
+    command = template.build({"manual_input": "", "attempt": ""})
+
+    assert command == ["run", "--m", "", "x", ""]
+    # Same result as rendering the whole string and splitting it.
+    assert command == shlex.split(template.template.format(manual_input="", attempt=""))
+
+
+def test_template_fills_mixed_arguments_and_is_reusable() -> None:
+    template = ExecutionTemplate("run --log={run_id}-{step_id}.log {manual_input}{attempt} --")
+
+    first = template.build({"run_id": "r1", "step_id": "qa", "manual_input": "", "attempt": ""})
+    second = template.build({"run_id": "r2", "step_id": "qa", "manual_input": "m", "attempt": 1})
+
+    assert first == ["run", "--log=r1-qa.log", "--"]
+    assert second == ["run", "--log=r2-qa.log", "m1", "--"]
+
+
+def test_template_with_format_spec_falls_back_to_str_format() -> None:
+    template = ExecutionTemplate("run {step_id:>6} {agent!r}")
+
+    assert template.build({"step_id": "qa", "agent": "bot"}) == ["run", "qa", "bot"]
+
+
+def test_template_missing_field_raises_key_error() -> None:
+    template = ExecutionTemplate("run {step_id} {missing}")
+
+    with pytest.raises(KeyError):
+        template.build({"step_id": "qa"})
+
+
+def _launch(tmp_path: Path, template: str, attempt: int = 1):
+    runner = StepRunner(
+        execution_template=ExecutionTemplate(template),
+        repo_dir=tmp_path,
+        logs_dir=tmp_path / "logs",
+    )
+    prompt_path = tmp_path / "prompt.md"
+    prompt_path.write_text("prompt", encoding="utf-8")
+    return runner.launch(
+        step=Step(id="build", agent="coder", prompt="prompt.md"),
+        run_id="run-1",
+        report_path=tmp_path / "report.json",
+        prompt_path=prompt_path,
+        attempt=attempt,
+    )
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses sh")
+def test_launch_writes_child_output_directly_to_log(tmp_path: Path) -> None:
+    launch = _launch(tmp_path, "sh -c 'echo out; echo err >&2'")
+    launch.process.wait()
+    launch.close_log()
+
+    assert launch.log_handle is None
+    assert launch.log_path == tmp_path / "logs" / "run-1__build__attempt1.log"
+    assert sorted(launch.log_path.read_text(encoding="utf-8").split()) == ["err", "out"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses sh")
+def test_launch_truncates_existing_log(tmp_path: Path) -> None:
+    log_path = tmp_path / "logs" / "run-1__build__attempt1.log"
+    log_path.parent.mkdir(parents=True)
+    log_path.write_text("stale output from an earlier run\n", encoding="utf-8")
+
+    launch = _launch(tmp_path, "echo fresh")
+    launch.process.wait()
+
+    assert log_path.read_text(encoding="utf-8") == "fresh\n"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX-only")
+def test_terminate_stops_agent_process_group(tmp_path: Path) -> None:
+    marker = tmp_path / "child.pid"
+    launch = _launch(tmp_path, f"sh -c 'sleep 30 & echo $! > {marker}; wait'")
+    deadline = time.monotonic() + 5
+    while not marker.exists() or not marker.read_text().strip():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    child_pid = int(marker.read_text())
+
+    assert os.getpgid(launch.process.pid) == launch.process.pid
+    launch.terminate()
+    launch.process.wait(timeout=5)
+
+    deadline = time.monotonic() + 5
+    while _is_running(child_pid):
+        assert time.monotonic() < deadline, "background child survived terminate()"
+        time.sleep(0.01)
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    stat = Path(f"/proc/{pid}/stat")
+    try:
+        # Killed-but-unreaped children linger as zombies ("Z").
+        return stat.read_text().rsplit(")", 1)[1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return True
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses sh")
+def test_launch_layers_environment(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LAYER_BASE", "process")
+    monkeypatch.setenv("LAYER_DEFAULT", "process")
+    runner = StepRunner(
+        execution_template=ExecutionTemplate(
+            "sh -c 'echo $LAYER_BASE $LAYER_DEFAULT $STEP_ID $RUN_ID'"
+        ),
+        repo_dir=tmp_path,
+        logs_dir=tmp_path / "logs",
+        default_env={"LAYER_DEFAULT": "default", "STEP_ID": "overridden"},
+    )
+    launch = runner.launch(
+        step=Step(id="build", agent="coder", prompt="prompt.md"),
+        run_id="run-1",
+        report_path=tmp_path / "report.json",
+        prompt_path=tmp_path / "prompt.md",
+        extra_env={"RUN_ID": "extra"},
+    )
+    launch.process.wait()
+
+    assert launch.log_path.read_text(encoding="utf-8").split() == [
+        "process",
+        "default",
+        "build",
+        "extra",
+    ]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses sh")
+def test_launch_recreates_logs_dir_removed_after_first_launch(tmp_path: Path) -> None:
+    runner = StepRunner(
+        execution_template=ExecutionTemplate("echo {attempt}"),
+        repo_dir=tmp_path,
+        logs_dir=tmp_path / "logs",
+    )
+    step = Step(id="build", agent="coder", prompt="prompt.md")
+    run_logs = tmp_path / "run-logs"
+
+    first = runner.launch(step, "run-1", tmp_path / "r.json", tmp_path / "p.md", logs_dir=run_logs)
+    first.process.wait()
+    shutil.rmtree(run_logs)
+    second = runner.launch(
+        step, "run-1", tmp_path / "r.json", tmp_path / "p.md", attempt=2, logs_dir=run_logs
+    )
+    second.process.wait()
+
+    assert second.log_path.read_text(encoding="utf-8") == "2\n"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses sh")
+def test_invalidate_env_picks_up_process_environment_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("RUNNER_FLAG", "before")
+    runner = StepRunner(
+        execution_template=ExecutionTemplate("sh -c 'echo $RUNNER_FLAG'"),
+        repo_dir=tmp_path,
+        logs_dir=tmp_path / "logs",
+    )
+    step = Step(id="build", agent="coder", prompt="prompt.md")
+    monkeypatch.setenv("RUNNER_FLAG", "after")
+
+    cached = runner.launch(step, "run-1", tmp_path / "r.json", tmp_path / "p.md")
+    cached.process.wait()
+    runner.invalidate_env()
+    refreshed = runner.launch(step, "run-1", tmp_path / "r.json", tmp_path / "p.md", attempt=2)
+    refreshed.process.wait()
+
+    assert cached.log_path.read_text(encoding="utf-8") == "before\n"
+    assert refreshed.log_path.read_text(encoding="utf-8") == "after\n"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses sh")
+def test_relaunches_reuse_step_template_until_step_changes(tmp_path: Path) -> None:
+    runner = StepRunner(
+        execution_template=ExecutionTemplate("sh -c 'echo $STEP_MODEL $STEP_ATTEMPT' {agent}"),
+        repo_dir=tmp_path,
+        logs_dir=tmp_path / "logs",
+    )
+    step = Step(id="build", agent="coder", prompt="prompt.md", model="sonnet")
+
+    first = runner.launch(step, "run-1", tmp_path / "r.json", tmp_path / "p.md")
+    second = runner.launch(step, "run-1", tmp_path / "r.json", tmp_path / "p.md", attempt=2)
+    step.model = "opus"
+    third = runner.launch(step, "run-1", tmp_path / "r.json", tmp_path / "p.md", attempt=3)
+    for launch in (first, second, third):
+        launch.process.wait()
+
+    assert len(runner._step_templates) == 2
+    assert [launch.log_path.read_text(encoding="utf-8") for launch in (first, second, third)] == [
+        "sonnet 1\n",
+        "sonnet 2\n",
+        "opus 3\n",
+    ]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses PATH lookup")
+def test_bare_command_names_are_resolved_once_per_path(tmp_path: Path) -> None:
+    runner = StepRunner(
+        execution_template=ExecutionTemplate("echo hi"),
+        repo_dir=tmp_path,
+        logs_dir=tmp_path / "logs",
+    )
+    env = {"PATH": os.environ.get("PATH", os.defpath)}
+
+    resolved = runner._resolve_executable("echo", env)
+
+    assert resolved is not None and os.path.isabs(resolved)
+    assert runner._resolve_executable("echo", env) is resolved
+    assert runner._resolve_executable("./echo", env) is None
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses PATH lookup")
+def test_relative_path_entries_are_not_resolved(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    tool = bin_dir / "tool"
+    tool.write_text("#!/bin/sh\n", encoding="utf-8")
+    tool.chmod(0o755)
+    runner = StepRunner(
+        execution_template=ExecutionTemplate("tool"),
+        repo_dir=tmp_path,
+        logs_dir=tmp_path / "logs",
+    )
+
+    monkeypatch.chdir(tmp_path)
+
+    assert runner._resolve_executable("tool", {"PATH": "bin"}) is None
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses PATH lookup")
+def test_launch_recovers_from_stale_resolved_executable(tmp_path: Path) -> None:
+    runner = StepRunner(
+        execution_template=ExecutionTemplate("echo hi"),
+        repo_dir=tmp_path,
+        logs_dir=tmp_path / "logs",
+    )
+    key = ("echo", os.environ.get("PATH", os.defpath))
+    runner._executables[key] = str(tmp_path / "removed" / "echo")
+
+    launch = runner.launch(
+        Step(id="build", agent="coder", prompt="prompt.md"),
+        "run-1",
+        tmp_path / "r.json",
+        tmp_path / "p.md",
+    )
+    launch.process.wait()
+
+    assert launch.log_path.read_text(encoding="utf-8") == "hi\n"
+    assert key not in runner._executables
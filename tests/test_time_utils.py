@@ -1,6 +1,12 @@
 from datetime import datetime, timezone
+from types import SimpleNamespace
 
-from agent_orchestrator.time_utils import utc_now
+from agent_orchestrator.time_utils import (
+    ISO_FORMAT,
+    reset_utc_now_fast,
+    utc_now,
+    utc_now_fast,
+)
 
 
 def test_utc_now_returns_timezone_aware_iso_string():
@@ -10,3 +16,25 @@ def test_utc_now_returns_timezone_aware_iso_string():
 
     parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
     assert parsed.tzinfo == timezone.utc
+
+
+def test_utc_now_matches_iso_format():
+    timestamp = utc_now()
+
+    parsed = datetime.strptime(timestamp, ISO_FORMAT)
+    assert parsed.strftime(ISO_FORMAT) == timestamp
+
+
+def test_utc_now_fast_reuses_value_within_window(monkeypatch):
+    from agent_orchestrator import time_utils
+
+    clock = iter([100.001, 100.004, 100.5])
+    stamps = iter(["2024-01-01T00:00:00.000001Z", "2024-01-01T00:00:00.500001Z"])
+    monkeypatch.setattr(time_utils, "time", SimpleNamespace(monotonic=lambda: next(clock)))
+    monkeypatch.setattr(time_utils, "utc_now", lambda: next(stamps))
+    reset_utc_now_fast()
+
+    first = utc_now_fast()
+    assert utc_now_fast() == first
+    assert utc_now_fast() == "2024-01-01T00:00:00.500001Z"
+    assert first == "2024-01-01T00:00:00.000001Z"